@@ -1,44 +1,57 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import json
 from datetime import datetime
-import matplotlib.pyplot as plt
-import matplotlib as mpl
-import warnings
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.platypus import Table, TableStyle
+import copy
 import os
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
+import queue
+import threading
+import warnings
+from score_engine import ScoreEngine
+from score_store import DEFAULT_STUDENT
+from ui_widgets import IncrementalTable, RedrawScheduler, SubjectPicker
+from export_worker import ExportQueue
+from perf_trace import get_tracer, span, traced
 
 
 class EnhancedScoreAnalyzer:
+    # 趋势分析的固定学期范围；各学年的选项按数据动态追加
+    TREND_SPANS = {'全部学期': None, '最近4个学期': ('last', 4), '最近8个学期': ('last', 8)}
+
     def __init__(self, root):
         self.root = root
         self.root.title("智能成绩分析系统 v2.0.51")
 
-        # 初始化数据存储
-        self.dataset = {}
+        # 初始化分析引擎（数据存储、统计与报告）
+        self.engine = ScoreEngine()
         self.current_semester = ""
-        self.grade_subjects = {
-            '七年级': ['语文', '数学', '英语', '政治', '历史', '地理', '生物', '体育'],
-            '八年级': ['语文', '数学', '英语', '物理', '政治', '历史', '地理', '生物', '体育'],
-            '九年级': ['语文', '数学', '英语', '物理', '化学', '历史', '政治', '体育']
-        }
-        self.grade_standards = {
-            '七年级': {'优秀': 90, '良好': 80, '及格': 60},
-            '八年级': {'优秀': 90, '良好': 80, '及格': 60},
-            '九年级': {'优秀': 75, '良好': 60, '及格': 50}
-        }
-        self.full_marks = {}
-        self.custom_subjects = {}
+        self.current_student = DEFAULT_STUDENT
+
+        # 每种分析模式一个常驻图表与画布，切换时原地更新
+        self.charts = {}
+        self.canvases = {}
+        self.chart_mode = None
 
         # 创建界面组件
         self.create_widgets()
+
+        # 视图刷新统一合并到事件循环空闲时执行，一次操作每个视图只刷新一次
+        self.redraw = RedrawScheduler(self.root)
+        self.redraw.register('semesters', self.refresh_semester_list)
+        self.redraw.register('students', self.refresh_student_list)
+        self.redraw.register('subjects', self.refresh_subject_choices)
+        self.redraw.register('table', self.update_data_table)
+        self.redraw.register('chart', self.refresh_semester_chart)
+
         self.create_semester_menu()
+        self.exports = ExportQueue(self.root, on_change=self.update_export_status, on_done=self.export_finished)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def on_close(self):
+        """关闭窗口时放弃未完成的后台导出，等待快照写完"""
+        self.exports.shutdown()
+        if self.engine.journal is not None:
+            self.engine.journal.close()
+        self.root.destroy()
 
     # === 界面组件 ===
     def create_widgets(self):
@@ -59,7 +72,7 @@ class EnhancedScoreAnalyzer:
         # 年级选择
         ttk.Label(control_frame, text="当前年级：").grid(row=1, column=0)
         self.grade_combo = ttk.Combobox(control_frame,
-                                        values=list(self.grade_subjects.keys()),
+                                        values=list(self.engine.grade_subjects.keys()),
                                         state="readonly")
         self.grade_combo.grid(row=1, column=1, padx=5)
         self.grade_combo.bind("<<ComboboxSelected>>", self.update_grade_subjects)
@@ -71,23 +84,44 @@ class EnhancedScoreAnalyzer:
         ttk.Button(control_frame, text="设置满分", command=self.set_full_marks).grid(row=3, column=1, pady=5)
         ttk.Button(control_frame, text="生成报告", command=self.generate_report).grid(row=4, column=0, columnspan=2,
                                                                                       pady=5)
+        ttk.Button(control_frame, text="批量报告", command=self.generate_all_reports).grid(row=5, column=0, pady=5)
+        self.report_status = tk.StringVar()
+        ttk.Label(control_frame, textvariable=self.report_status).grid(row=5, column=1, pady=5)
+        ttk.Button(control_frame, text="诊断信息", command=self.show_diagnostics).grid(row=6, column=0, pady=5)
+        ttk.Button(control_frame, text="班级排名", command=self.show_ranking).grid(row=6, column=1, pady=5)
 
         # 成绩录入面板
         input_frame = ttk.LabelFrame(main_frame, text="成绩录入")
         input_frame.grid(row=1, column=0, padx=10, pady=5, sticky="nsew")
 
+        # 学生选择（可直接输入新学生姓名）
+        ttk.Label(input_frame, text="当前学生：").grid(row=0, column=0)
+        self.student_combo = ttk.Combobox(input_frame, values=[DEFAULT_STUDENT])
+        self.student_combo.grid(row=0, column=1, padx=5)
+        self.student_combo.set(DEFAULT_STUDENT)
+        self.student_combo.bind("<<ComboboxSelected>>", self.select_student)
+        self.student_combo.bind("<Return>", self.select_student)
+        self.student_combo.bind("<FocusOut>", self.select_student)
+
         # 学科选择
-        ttk.Label(input_frame, text="选择学科：").grid(row=0, column=0)
+        ttk.Label(input_frame, text="选择学科：").grid(row=1, column=0)
         self.subject_combo = ttk.Combobox(input_frame, state="readonly")
-        self.subject_combo.grid(row=0, column=1, padx=5)
+        self.subject_combo.grid(row=1, column=1, padx=5)
 
         # 分数输入
-        ttk.Label(input_frame, text="输入分数：").grid(row=1, column=0)
+        ttk.Label(input_frame, text="输入分数：").grid(row=2, column=0)
         self.score_entry = ttk.Entry(input_frame)
-        self.score_entry.grid(row=1, column=1, padx=5)
+        self.score_entry.grid(row=2, column=1, padx=5)
 
         # 操作按钮
-        ttk.Button(input_frame, text="添加成绩", command=self.add_score).grid(row=2, column=0, columnspan=2, pady=5)
+        ttk.Button(input_frame, text="添加成绩", command=self.add_score).grid(row=3, column=0, columnspan=2, pady=5)
+        ttk.Button(input_frame, text="批量导入", command=self.import_scores).grid(row=4, column=0, pady=5)
+        self.import_status = tk.StringVar()
+        ttk.Label(input_frame, textvariable=self.import_status).grid(row=4, column=1, pady=5)
+
+        # 当前学生在本学期的总分名次
+        self.rank_status = tk.StringVar()
+        ttk.Label(input_frame, textvariable=self.rank_status).grid(row=5, column=0, columnspan=2, pady=5)
 
         # 成绩表格
         self.tree_frame = ttk.Frame(main_frame)
@@ -107,6 +141,7 @@ class EnhancedScoreAnalyzer:
         vsb.grid(row=0, column=1, sticky="ns")
         hsb.grid(row=1, column=0, sticky="ew")
         self.tree.tag_configure('warning', foreground='red')
+        self.table = IncrementalTable(self.tree, vsb)
 
         # 分析面板
         analysis_frame = ttk.LabelFrame(main_frame, text="数据分析")
@@ -121,57 +156,93 @@ class EnhancedScoreAnalyzer:
         self.analysis_mode.current(0)
         self.analysis_mode.bind("<<ComboboxSelected>>", self.toggle_analysis_mode)
 
+        # 趋势分析的学期范围
+        span_frame = ttk.Frame(analysis_frame)
+        span_frame.grid(row=0, column=2, padx=5)
+        ttk.Label(span_frame, text="学期范围：").grid(row=0, column=0)
+        self.trend_span = ttk.Combobox(span_frame, values=list(self.TREND_SPANS), state="readonly", width=12)
+        self.trend_span.grid(row=0, column=1)
+        self.trend_span.current(0)
+        self.trend_span.bind("<<ComboboxSelected>>", self.change_trend_span)
+        self.trend_subjects = []
+
         # 分析结果显示区域
         self.result_frame = ttk.Frame(analysis_frame)
-        self.result_frame.grid(row=1, column=0, columnspan=2, pady=10, sticky="nsew")
-
-        # 图表导出按钮
-        ttk.Button(analysis_frame, text="导出图表", command=self.export_chart).grid(row=2, column=0, columnspan=2)
+        self.result_frame.grid(row=1, column=0, columnspan=3, pady=10, sticky="nsew")
+
+        # 图表导出按钮与后台导出进度
+        ttk.Button(analysis_frame, text="导出图表", command=self.export_chart).grid(row=2, column=0, columnspan=3)
+        export_frame = ttk.Frame(analysis_frame)
+        export_frame.grid(row=3, column=0, columnspan=3, pady=5)
+        self.export_progress = ttk.Progressbar(export_frame, mode="indeterminate", length=120)
+        self.export_progress.grid(row=0, column=0, padx=5)
+        self.export_status = tk.StringVar()
+        ttk.Label(export_frame, textvariable=self.export_status).grid(row=0, column=1, padx=5)
+        ttk.Button(export_frame, text="取消导出", command=lambda: self.exports.cancel()).grid(row=0, column=2, padx=5)
 
     # === 核心功能 ===
     def create_semester_menu(self):
         """初始化学期菜单"""
-        self.semester_combo["values"] = list(self.dataset.keys())
-        if self.semester_combo["values"]:
+        semesters = self.engine.store.ordered_semesters()
+        self.semester_combo["values"] = semesters
+        if semesters:
             self.semester_combo.current(0)
             self.select_semester()
         else:
             self.current_semester = ""
+            self.semester_combo.set("")
+            self.redraw.invalidate('table')
 
     def create_semester(self):
         """创建新学期"""
-        semester_name = f"{datetime.now().year}-{datetime.now().year + 1} 第{len(self.dataset) + 1}学期"
-        self.dataset[semester_name] = {
-            'grade': '七年级',
-            'scores': {},
-            'subjects': []
-        }
-        self.semester_combo["values"] = list(self.dataset.keys())
+        semester_name = f"{datetime.now().year}-{datetime.now().year + 1} 第{len(self.engine.store) + 1}学期"
+        self.engine.add_semester(semester_name, '七年级')
         self.semester_combo.set(semester_name)
         self.current_semester = semester_name
         self.grade_combo.set('七年级')
-        self.update_grade_subjects()
-        self.update_data_table()
+        self.redraw.invalidate('semesters', 'subjects', 'table', 'chart')
 
+    @traced('select_semester', idle=True)
     def select_semester(self, event=None):
         """选择学期"""
         selected_semester = self.semester_combo.get()
-        if selected_semester in self.dataset:
+        if selected_semester in self.engine.store:
             self.current_semester = selected_semester
-            current_data = self.dataset[self.current_semester]
-            self.grade_combo.set(current_data['grade'])
-            self.update_grade_subjects()
-            self.update_data_table()
+            self.grade_combo.set(self.engine.store.get_grade(self.current_semester))
+            self.redraw.invalidate('subjects', 'table', 'chart')
+
+    def select_student(self, event=None):
+        """切换当前学生（输入新姓名时在录入第一条成绩后登记）"""
+        student = self.student_combo.get().strip() or DEFAULT_STUDENT
+        if student != self.current_student:
+            self.current_student = student
+            self.redraw.invalidate('table')
 
     def update_grade_subjects(self, event=None):
-        """更新年级相关设置"""
+        """切换当前学期的年级"""
+        if self.current_semester:
+            self.engine.set_grade(self.current_semester, self.grade_combo.get())
+            self.redraw.invalidate('subjects', 'table', 'chart')
+
+    # === 视图刷新（由 RedrawScheduler 调用） ===
+    def refresh_semester_list(self):
+        """学期下拉列表（按时间线顺序），保留当前选择"""
+        self.semester_combo["values"] = self.engine.store.ordered_semesters()
+        self.semester_combo.set(self.current_semester)
+
+    def refresh_student_list(self):
+        """学生下拉列表，保留当前输入"""
+        self.student_combo["values"] = self.engine.store.students
+        self.student_combo.set(self.current_student)
+
+    def refresh_subject_choices(self):
+        """当前年级的学科下拉列表"""
         if self.current_semester:
-            selected_grade = self.grade_combo.get()
-            self.dataset[self.current_semester]['grade'] = selected_grade
-            subjects = self.grade_subjects[selected_grade] + self.custom_subjects.get(selected_grade, [])
+            subjects = self.engine.subjects_for_grade(self.grade_combo.get())
             self.subject_combo["values"] = subjects
             self.subject_combo.current(0) if subjects else None
 
+    @traced('add_score', idle=True)
     def add_score(self):
         """添加成绩到当前学期"""
         if not self.current_semester:
@@ -189,75 +260,126 @@ class EnhancedScoreAnalyzer:
             messagebox.showwarning("警告", "请输入有效数字分数！")
             return
 
-        score = float(score)
-        full_mark = self.full_marks.get(subject, 100)
+        try:
+            with span('写入成绩'):
+                self.select_student()
+                new_student = self.current_student not in self.engine.store.student_index
+                self.engine.add_score(self.current_semester, subject, float(score), self.current_student)
+        except ValueError as e:
+            messagebox.showerror("错误", str(e))
+            return
+
+        self.score_entry.delete(0, tk.END)
+        self.redraw.invalidate('table', 'chart')
+        if new_student:
+            self.redraw.invalidate('students')
 
-        if score > full_mark:
-            messagebox.showerror("错误", f"分数不能超过该学科满分值{full_mark}")
+    def import_scores(self):
+        """从 CSV/XLSX 文件批量导入成绩（后台读取与校验，界面线程按块提交）"""
+        from score_import import ScoreImporter
+
+        filepath = filedialog.askopenfilename(
+            filetypes=[("CSV文件", "*.csv"), ("Excel工作簿", "*.xlsx")])
+        if not filepath:
             return
 
-        self.dataset[self.current_semester]['scores'][subject] = score
-        if subject not in self.dataset[self.current_semester]['subjects']:
-            self.dataset[self.current_semester]['subjects'].append(subject)
+        importer = ScoreImporter(self.engine)
+        # 有界队列：界面提交跟不上时读取线程等待，内存占用不随文件大小增长
+        chunks = queue.Queue(maxsize=2)
 
-        self.score_entry.delete(0, tk.END)
-        self.update_data_table()
+        def worker():
+            try:
+                for chunk in importer.chunks(filepath):
+                    chunks.put(chunk)
+            except Exception as e:
+                chunks.put(e)
+            chunks.put(None)
+
+        self.import_status.set("正在导入…")
+        threading.Thread(target=worker, daemon=True).start()
+        self.root.after(100, self.poll_import, importer, chunks)
+
+    def poll_import(self, importer, chunks):
+        """在主线程中提交已校验的成绩块，全部完成后统一刷新界面"""
+        from score_import import apply_chunk
+
+        while True:
+            try:
+                item = chunks.get_nowait()
+            except queue.Empty:
+                self.import_status.set(f"已导入 {importer.imported} 条")
+                self.root.after(100, self.poll_import, importer, chunks)
+                return
+            if item is None:
+                break
+            if isinstance(item, Exception):
+                # 出错前的成绩块已写入引擎，同样需要刷新界面
+                self.refresh_after_import(importer)
+                messagebox.showerror("错误", f"导入中断：{item}\n此前已导入 {importer.imported} 条成绩")
+                return
+            apply_chunk(self.engine, item)
+
+        self.refresh_after_import(importer)
+        message = f"成功导入 {importer.imported} 条成绩"
+        if importer.error_count:
+            details = "\n".join(importer.errors[:10])
+            message += f"，{importer.error_count} 行有误已跳过：\n{details}"
+            messagebox.showwarning("导入完成", message)
+        else:
+            messagebox.showinfo("成功", message)
+
+    def refresh_after_import(self, importer):
+        """导入结束（完成或中断）后刷新学生、学期与当前视图"""
+        self.import_status.set(f"已导入 {importer.imported} 条")
+        self.redraw.invalidate('students')
+        if self.current_semester:
+            self.redraw.invalidate('semesters', 'table', 'chart')
+        else:
+            self.create_semester_menu()
 
     # === 数据持久化 ===
+    @traced('save_data', idle=True)
     def save_data(self):
-        """保存全部数据到JSON文件"""
+        """保存全部数据到JSON文件、二进制快照或SQLite数据库"""
         filepath = filedialog.asksaveasfilename(
             defaultextension=".json",
-            filetypes=[("JSON文件", "*.json")])
+            filetypes=[("JSON文件", "*.json"), ("二进制快照", "*.gsnap"), ("SQLite数据库", "*.db")])
         if not filepath:
             return
 
         try:
-            data_to_save = {
-                "dataset": self.dataset,
-                "full_marks": self.full_marks,
-                "custom_subjects": self.custom_subjects
-            }
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data_to_save, f, ensure_ascii=False, indent=2)
+            # 写出快照在后台进行；此后的每次修改都会立即追加到日志中
+            with span('保存', path=filepath):
+                self.engine.save(filepath, background=True)
             messagebox.showinfo("成功", "数据保存成功！")
         except Exception as e:
             messagebox.showerror("错误", f"保存失败：{str(e)}")
 
+    @traced('load_data', idle=True)
     def load_data(self):
-        """从JSON文件加载数据"""
+        """从JSON文件、二进制快照或SQLite数据库加载数据"""
         filepath = filedialog.askopenfilename(
-            filetypes=[("JSON文件", "*.json")])
+            filetypes=[("JSON文件", "*.json"), ("二进制快照", "*.gsnap"), ("SQLite数据库", "*.db")])
         if not filepath:
             return
 
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                loaded_data = json.load(f)
-
-            # 数据验证
-            if not all(key in loaded_data for key in ["dataset", "full_marks", "custom_subjects"]):
-                raise ValueError("文件格式不正确")
-
-            self.dataset = loaded_data["dataset"]
-            self.full_marks = loaded_data["full_marks"]
-            self.custom_subjects = loaded_data["custom_subjects"]
+            with span('加载', path=filepath):
+                self.engine.load(filepath)
 
-            # 更新界面
+            # 更新界面（各视图在空闲时统一刷新一次）
+            if self.current_student not in self.engine.store.student_index:
+                self.current_student = DEFAULT_STUDENT
+            self.redraw.invalidate('students')
             self.create_semester_menu()
-            if self.current_semester:
-                self.update_grade_subjects()
-                self.update_data_table()
             messagebox.showinfo("成功", "数据加载成功！")
         except Exception as e:
             messagebox.showerror("错误", f"加载失败：{str(e)}")
 
     # === 数据分析 ===
+    @traced('toggle_analysis_mode', idle=True)
     def toggle_analysis_mode(self, event=None):
         """切换分析模式"""
-        for widget in self.result_frame.winfo_children():
-            widget.destroy()
-
         if self.analysis_mode.get() == '学期分析':
             self.show_semester_analysis()
         else:
@@ -267,156 +389,84 @@ class EnhancedScoreAnalyzer:
 
     def show_semester_analysis(self):
         """显示学期分析"""
-        if not self.current_semester or not self.dataset[self.current_semester]['scores']:
+        with span('数据准备'):
+            model = self.engine.semester_model(self.current_semester)
+        if model is None:
             messagebox.showwarning("警告", "当前学期无成绩数据！")
             return
 
-        mpl.rcParams['font.sans-serif'] = ['SimHei']
-        mpl.rcParams['axes.unicode_minus'] = False
-
-        # 创建图表
-        fig = plt.figure(figsize=(12, 6))
-        gs = fig.add_gridspec(1, 2, width_ratios=[3, 2])
-        ax1 = fig.add_subplot(gs[0, 0])
-        ax2 = fig.add_subplot(gs[0, 1])
-
-        # 柱状图
-        current_data = self.dataset[self.current_semester]
-        subjects = current_data['subjects']
-        scores = [current_data['scores'][sub] for sub in subjects]
-
-        ax1.bar(subjects, scores, color='#4C72B0', alpha=0.8)
-        ax1.set_title(f'{self.current_semester}成绩分析', pad=20)
-
-        # 自动调整Y轴最大值为最大满分
-        max_mark = max([self.full_marks.get(sub, 100) for sub in subjects])
-        ax1.set_ylim(0, max_mark * 1.15)
-        plt.setp(ax1.get_xticklabels(), rotation=30, ha='right')
-
-        # 统计信息
-        avg_score = sum(scores) / len(scores)
-        stats_text = (
-            f'统计指标：\n'
-            f'平均分：{avg_score:.1f}\n'
-            f'最高分：{max(scores)}\n'
-            f'最低分：{min(scores)}\n'
-            f'学科数量：{len(subjects)}'
-        )
-
-        ax1.text(
-            x=0.98, y=0.95,
-            s=stats_text,
-            transform=ax1.transAxes,
-            va='top',
-            ha='right',
-            bbox=dict(
-                boxstyle='round',
-                facecolor='white',
-                alpha=0.8,
-                edgecolor='gray'
-            )
-        )
-
-        # 饼图
-        levels = self.calculate_levels(scores, subjects)
-        wedges, texts, autotexts = ax2.pie(
-            levels.values(),
-            labels=levels.keys(),
-            autopct='%1.1f%%',
-            colors=['#55A868', '#4C72B0', '#C44E52', '#8172B2'],
-            startangle=90,
-            wedgeprops=dict(width=0.4, edgecolor='w'),
-            pctdistance=0.85
-        )
-
-        plt.setp(autotexts, size=10, weight="bold", color='white')
-        ax2.set_title('成绩等级分布', pad=20)
-
-        plt.subplots_adjust(
-            left=0.08,
-            right=0.95,
-            wspace=0.25, 
-            top=0.85
-        )
-
-        self.display_chart(fig)
+        self.display_chart('学期分析', model)
+
+    def refresh_semester_chart(self):
+        """正在显示学期分析时，随学期切换原地刷新图表"""
+        if getattr(self, 'canvas', None) is not self.canvases.get('学期分析'):
+            return
+        model = self.engine.semester_model(self.current_semester)
+        if model is not None:
+            self.display_chart('学期分析', model)
 
     def show_trend_analysis(self):
         """显示学期分析"""
-        if not self.dataset:
+        if not len(self.engine.store):
             messagebox.showwarning("警告", "无可用历史学期数据！")
             return
 
-        mpl.rcParams['font.sans-serif'] = ['SimHei']
-        mpl.rcParams['axes.unicode_minus'] = False
-
         # 获取所有学科
-        all_subjects = set()
-        for sem in self.dataset.values():
-            all_subjects.update(sem['subjects'])
+        all_subjects = self.engine.store.used_subjects()
         if not all_subjects:
             messagebox.showwarning("警告", "没有可分析的学科数据")
             return
 
         # 学科选择对话框
-        selected_subjects = self.select_subjects_for_trend(list(all_subjects))
+        selected_subjects = self.select_subjects_for_trend(all_subjects)
         if not selected_subjects:
             return
 
-        # 创建图表
-        fig = plt.figure(figsize=(10, 5))
-        ax1 = fig.add_subplot(111)
-
-        # 绘制趋势线
-        semesters = sorted(self.dataset.keys())
-        for subject in selected_subjects:
-            scores = []
-            valid_semesters = []
-            for sem in semesters:
-                if subject in self.dataset[sem]['scores']:
-                    scores.append(self.dataset[sem]['scores'][subject])
-                    valid_semesters.append(sem)
-            if scores:
-                ax1.plot(valid_semesters, scores, marker='o', label=subject)
-
-        ax1.set_title('学科成绩趋势分析')
-        ax1.set_ylabel('分数')
-        ax1.legend()
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-
-        self.display_chart(fig)
+        self.trend_subjects = selected_subjects
+        self.update_trend_spans()
+        with span('数据准备'):
+            model = self.engine.trend_model(selected_subjects, self.selected_trend_span())
+        self.display_chart('趋势分析', model)
+
+    def update_trend_spans(self):
+        """刷新学期范围选项（固定范围 + 数据中出现的学年）"""
+        years = [f"{year}学年" for year in self.engine.store.timeline.academic_years()]
+        self.trend_span["values"] = list(self.TREND_SPANS) + years
+        if self.trend_span.get() not in self.trend_span["values"]:
+            self.trend_span.current(0)
+
+    def selected_trend_span(self):
+        label = self.trend_span.get()
+        if label.endswith("学年"):
+            return 'year', int(label[:-2])
+        return self.TREND_SPANS.get(label)
+
+    def change_trend_span(self, event=None):
+        """正在显示趋势分析时按新范围原地刷新"""
+        if self.chart_mode != '趋势分析' or not self.trend_subjects:
+            return
+        model = self.engine.trend_model(self.trend_subjects, self.selected_trend_span())
+        if not model['semesters']:
+            messagebox.showwarning("警告", "所选范围内没有学期！")
+            return
+        self.display_chart('趋势分析', model)
 
     # === 辅助功能 ===
     def update_data_table(self):
-        """更新成绩表格"""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        if self.current_semester and self.dataset[self.current_semester]['scores']:
-            current_data = self.dataset[self.current_semester]
-            for subject in current_data['subjects']:
-                score = current_data['scores'][subject]
-                full_mark = self.full_marks.get(subject, 100)
-                level = self.get_score_level(score, subject)  # 传入学科名称
+        """更新当前学生的成绩表格（只应用有变化的行）与总分名次"""
+        rows = []
+        rank = None
+        if self.current_semester and self.current_student in self.engine.store.student_index:
+            for subject, score, full_mark, level in self.engine.semester_rows(self.current_semester,
+                                                                               self.current_student):
                 tags = ('warning',) if level == '不及格' else ()
-                self.tree.insert("", "end", values=(subject, score, full_mark, level), tags=tags)
-
-    def get_score_level(self, score, subject):
-        """获取成绩等级（基于学科满分百分比）"""
-        full_mark = self.full_marks.get(subject, 100)
-        excellent = full_mark * 0.9
-        good = full_mark * 0.8
-        passing = full_mark * 0.6
-
-        if score >= excellent:
-            return '优秀'
-        elif score >= good:
-            return '良好'
-        elif score >= passing:
-            return '及格'
+                rows.append((subject, (subject, score, full_mark, level), tags))
+            rank = self.engine.student_rank(self.current_semester, self.current_student)
+        self.table.set_rows(rows)
+        if rank and rank[1] > 1:
+            self.rank_status.set(f"总分名次：{rank[0]}/{rank[1]}（百分位 {rank[2]:.1f}）")
         else:
-            return '不及格'
+            self.rank_status.set("")
 
     def customize_subjects(self):
         """自定义学科"""
@@ -425,7 +475,7 @@ class EnhancedScoreAnalyzer:
         dialog.geometry("300x150")
 
         ttk.Label(dialog, text="年级:").grid(row=0, column=0, padx=5, pady=5)
-        grade_combo = ttk.Combobox(dialog, values=list(self.grade_subjects.keys()), state="readonly")
+        grade_combo = ttk.Combobox(dialog, values=list(self.engine.grade_subjects.keys()), state="readonly")
         grade_combo.grid(row=0, column=1, padx=5, pady=5)
         grade_combo.current(0)
 
@@ -440,13 +490,13 @@ class EnhancedScoreAnalyzer:
                 messagebox.showwarning("警告", "请输入学科名称！")
                 return
 
-            if new_sub in self.grade_subjects[grade]:
-                messagebox.showwarning("警告", "该学科已存在！")
+            try:
+                self.engine.add_custom_subject(grade, new_sub)
+            except ValueError as e:
+                messagebox.showwarning("警告", str(e))
                 return
 
-            self.grade_subjects[grade].append(new_sub)
-            self.custom_subjects.setdefault(grade, []).append(new_sub)
-            self.update_grade_subjects()
+            self.redraw.invalidate('subjects')
             dialog.destroy()
             messagebox.showinfo("成功", f"已为{grade}添加新学科: {new_sub}")
 
@@ -459,7 +509,7 @@ class EnhancedScoreAnalyzer:
         dialog.geometry("300x150")
 
         ttk.Label(dialog, text="学科:").grid(row=0, column=0, padx=5, pady=5)
-        subject_combo = ttk.Combobox(dialog, values=self.get_all_subjects(), state="readonly")
+        subject_combo = ttk.Combobox(dialog, values=self.engine.get_all_subjects(), state="readonly")
         subject_combo.grid(row=0, column=1, padx=5, pady=5)
 
         ttk.Label(dialog, text="满分:").grid(row=1, column=0, padx=5, pady=5)
@@ -478,53 +528,63 @@ class EnhancedScoreAnalyzer:
                 messagebox.showwarning("警告", "请输入有效数字！")
                 return
 
-            self.full_marks[subject] = int(mark)
+            self.engine.set_full_mark(subject, int(mark))
             dialog.destroy()
+            self.redraw.invalidate('table', 'chart')
             messagebox.showinfo("成功", f"{subject}满分已设置为{mark}")
-            self.update_data_table()
 
         ttk.Button(dialog, text="保存", command=save_mark).grid(row=2, columnspan=2, pady=10)
 
-    def get_all_subjects(self):
-        """获取所有学科（包括自定义）"""
-        subjects = set()
-        for grade in self.grade_subjects.values():
-            subjects.update(grade)
-        for custom in self.custom_subjects.values():
-            subjects.update(custom)
-        return sorted(subjects)
-
     def select_subjects_for_trend(self, subjects):
-        """选择趋势分析学科"""
+        """选择趋势分析学科（可按名称或拼音筛选，默认选中上次的学科）"""
         dialog = tk.Toplevel()
         dialog.title("选择分析学科")
-        dialog.geometry("250x300")
+        dialog.geometry("300x380")
 
         selected = []
-        check_vars = {}
-
-        for idx, sub in enumerate(subjects):
-            var = tk.BooleanVar()
-            check = ttk.Checkbutton(dialog, text=sub, variable=var)
-            check.grid(row=idx, column=0, sticky="w", padx=10, pady=2)
-            check_vars[sub] = var
+        picker = SubjectPicker(dialog, subjects, selected=self.trend_subjects)
+        picker.frame.grid(row=0, column=0, columnspan=3, sticky="nsew", padx=10, pady=10)
+        dialog.columnconfigure(0, weight=1)
+        dialog.rowconfigure(0, weight=1)
 
-        def confirm():
+        def confirm(event=None):
             nonlocal selected
-            selected = [sub for sub, var in check_vars.items() if var.get()]
+            selected = picker.chosen()
             dialog.destroy()
 
-        ttk.Button(dialog, text="确定", command=confirm).grid(row=len(subjects) + 1, column=0, pady=10)
+        ttk.Button(dialog, text="全选", command=lambda: picker.select_matches(True)).grid(row=1, column=0, pady=10)
+        ttk.Button(dialog, text="清空", command=lambda: picker.select_matches(False)).grid(row=1, column=1, pady=10)
+        ttk.Button(dialog, text="确定", command=confirm).grid(row=1, column=2, pady=10)
+        dialog.bind("<Return>", confirm)
+        dialog.bind("<Escape>", lambda event: dialog.destroy())
+        picker.entry.focus_set()
         dialog.wait_window()
         return selected
 
-    def display_chart(self, fig):
-        """显示图表"""
-        if hasattr(self, 'canvas'):
-            self.canvas.get_tk_widget().destroy()
-        self.canvas = FigureCanvasTkAgg(fig, self.result_frame)
-        self.canvas.draw()
-        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+    @traced('display_chart')
+    def display_chart(self, mode, model):
+        """显示图表（复用该模式的 Figure 与画布，只更新数据）"""
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from score_charts import SemesterChart, TrendChart
+
+        if mode not in self.charts:
+            with span('创建图表', mode=mode):
+                # 屏幕上的趋势线按绘图区像素宽度降采样，导出与报告仍使用完整数据
+                self.charts[mode] = SemesterChart() if mode == '学期分析' else TrendChart(downsample=True)
+                self.canvases[mode] = FigureCanvasTkAgg(self.charts[mode].figure, self.result_frame)
+                # 启用埋点时单独记录实际绘制（由 draw_idle 在空闲时触发）
+                self.canvases[mode].draw = traced('FigureCanvasTkAgg.draw')(self.canvases[mode].draw)
+        with span('更新图元', mode=mode):
+            self.charts[mode].update(model)
+        self.chart_mode = mode
+
+        canvas = self.canvases[mode]
+        if getattr(self, 'canvas', None) is not canvas:
+            if hasattr(self, 'canvas'):
+                self.canvas.get_tk_widget().pack_forget()
+            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+            self.canvas = canvas
+        canvas.draw_idle()
 
     def export_chart(self):
         """导出图表"""
@@ -535,21 +595,35 @@ class EnhancedScoreAnalyzer:
         filepath = filedialog.asksaveasfilename(
             defaultextension=".png",
             filetypes=[("PNG图片", "*.png"), ("PDF文档", "*.pdf"), ("SVG矢量图", "*.svg")])
-        if filepath:
-            try:
-                self.canvas.figure.savefig(filepath, dpi=300, bbox_inches='tight')
-                messagebox.showinfo("成功", "图表导出成功！")
-            except Exception as e:
-                messagebox.showerror("错误", f"导出失败：{str(e)}")
+        if not filepath:
+            return
+        # 图表成品由引擎缓存并与PDF报告共用，已渲染过的格式直接写出；首次渲染在后台进程进行
+        if self.chart_mode == '学期分析':
+            artifact = self.engine.semester_chart(self.current_semester)
+        else:
+            artifact = self.engine.trend_chart(self.trend_subjects, self.selected_trend_span())
+        if artifact is None:
+            messagebox.showwarning("警告", "当前学期无成绩数据！")
+            return
+        self.exports.submit(artifact, filepath)
+
+    def update_export_status(self, pending):
+        """显示后台导出任务数"""
+        if pending:
+            self.export_status.set(f"导出中（{pending} 个任务）")
+            self.export_progress.start(10)
+        else:
+            self.export_status.set("")
+            self.export_progress.stop()
 
-    def load_chinese_font(self):
-        font_path = os.path.join(os.getcwd(), "simhei.ttf")  # 字体文件路径
-        if not os.path.exists(font_path):
-            raise FileNotFoundError(f"字体文件未找到：{font_path}")
-        pdfmetrics.registerFont(TTFont("SimHei", font_path))
+    def export_finished(self, filepath, error):
+        if error:
+            messagebox.showerror("错误", f"导出失败：{error}")
+        else:
+            self.export_status.set(f"图表已导出：{os.path.basename(filepath)}")
 
+    @traced('generate_report', idle=True)
     def generate_report(self):
-        self.load_chinese_font()
         """生成PDF报告"""
         if not self.current_semester:
             messagebox.showwarning("警告", "请先选择学期！")
@@ -561,76 +635,181 @@ class EnhancedScoreAnalyzer:
         if not filepath:
             return
 
-        try:
+        # 报告嵌入学期分析图，与导出共用同一图表成品（同一格式与分辨率只渲染一次）；
+        # 尚未渲染时先交给导出进程渲染，完成后再在界面线程排版，避免界面卡顿
+        semester = self.current_semester
+        artifact = self.engine.semester_chart(semester)
+        if artifact is not None and artifact.cached('png') is None:
+            self.exports.prerender(artifact, lambda error: self.write_report(filepath, semester, error))
+        else:
+            self.write_report(filepath, semester)
 
-            # 创建PDF文档
-            c = canvas.Canvas(filepath, pagesize=A4)
-            width, height = A4
-
-            # 标题
-            c.setFont('SimHei', 16)
-            c.drawString(50, height - 50, f"{self.current_semester}成绩分析报告")
-
-            # 基本信息
-            c.setFont('SimHei', 12)
-            y = height - 100
-            c.drawString(50, y, f"年级：{self.dataset[self.current_semester]['grade']}")
-            y -= 30
-            c.drawString(50, y, f"生成时间：{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-            y -= 50
-
-            # 数据表格
-            data = [["学科", "分数", "满分", "等级"]]
-            current_data = self.dataset[self.current_semester]
-            for subj in current_data['subjects']:
-                score = current_data['scores'][subj]
-                full = self.full_marks.get(subj, 100)
-                level = self.get_score_level(score, current_data['grade'])
-                data.append([subj, str(score), str(full), level])
-
-            table = Table(data, colWidths=[100, 60, 60, 60])
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4C72B0')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'SimHei'),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#F3F6FA')),
-                ('GRID', (0, 0), (-1, -1), 1, colors.grey)
-            ]))
-
-            table.wrapOn(c, width - 100, height)
-            table.drawOn(c, 50, y - 150)
-
-            # 保存PDF
-            c.showPage()
-            c.save()
-            messagebox.showinfo("成功", "成绩报告已生成！")
+    def write_report(self, filepath, semester, chart_error=None):
+        """排版并写出报告；分析图渲染失败时生成不含图表的报告"""
+        try:
+            self.engine.write_report(filepath, semester, chart=chart_error is None)
         except Exception as e:
             messagebox.showerror("错误", f"报告生成失败：{str(e)}")
+            return
+        if chart_error:
+            messagebox.showwarning("警告", f"成绩报告已生成，但分析图渲染失败：{chart_error}")
+        else:
+            messagebox.showinfo("成功", "成绩报告已生成！")
+
+    def generate_all_reports(self):
+        """为全部学期与学生批量生成PDF报告（后台进程池）"""
+        from report_jobs import bulk_generate_reports
+
+        if not len(self.engine.store):
+            messagebox.showwarning("警告", "无可用学期数据！")
+            return
 
-    def calculate_levels(self, scores, subjects):
-        """计算等级分布（基于各科满分）"""
-        levels = {'优秀': 0, '良好': 0, '及格': 0, '不及格': 0}
-        for subject, score in zip(subjects, scores):
-            full_mark = self.full_marks.get(subject, 100)
-            excellent = full_mark * 0.9
-            good = full_mark * 0.8
-            passing = full_mark * 0.6
-
-            if score >= excellent:
-                levels['优秀'] += 1
-            elif score >= good:
-                levels['良好'] += 1
-            elif score >= passing:
-                levels['及格'] += 1
+        out_dir = filedialog.askdirectory(title="选择报告输出目录")
+        if not out_dir:
+            return
+
+        # 在界面线程复制一份数据，后台任务不受后续录入影响
+        snapshot = ScoreEngine()
+        snapshot.load_dict(copy.deepcopy(self.engine.to_dict()))
+        progress = queue.Queue()
+
+        def worker():
+            try:
+                for done, total, path, error in bulk_generate_reports(snapshot, out_dir):
+                    progress.put((done, total, error))
+            except Exception as e:
+                progress.put((0, 0, str(e)))
+            progress.put(None)
+
+        self.report_status.set("正在生成报告…")
+        threading.Thread(target=worker, daemon=True).start()
+        self.root.after(100, self.poll_report_progress, progress, [])
+
+    def poll_report_progress(self, progress, errors):
+        """在主线程中读取批量报告进度"""
+        while True:
+            try:
+                item = progress.get_nowait()
+            except queue.Empty:
+                self.root.after(100, self.poll_report_progress, progress, errors)
+                return
+            if item is None:
+                break
+            done, total, error = item
+            if error:
+                errors.append(error)
+            self.report_status.set(f"报告 {done}/{total}")
+
+        if errors:
+            messagebox.showerror("错误", f"{len(errors)} 份报告生成失败：{errors[0]}")
+        else:
+            messagebox.showinfo("成功", "批量报告已生成！")
+
+    def show_ranking(self):
+        """当前学期的班级排名（总分或单科），行数多时表格只渲染可见部分"""
+        if not self.current_semester:
+            messagebox.showwarning("警告", "请先选择学期！")
+            return
+
+        dialog = tk.Toplevel()
+        dialog.title(f"{self.current_semester} 班级排名")
+        dialog.geometry("420x460")
+        semester = self.current_semester
+
+        ttk.Label(dialog, text="排名依据：").grid(row=0, column=0, padx=5, pady=5)
+        subjects = self.engine.store.semester_subject_names(semester)
+        basis = ttk.Combobox(dialog, values=["总分"] + subjects, state="readonly")
+        basis.grid(row=0, column=1, padx=5, pady=5, sticky="w")
+        basis.current(0)
+
+        columns = ("名次", "学生", "分数", "百分位")
+        tree = ttk.Treeview(dialog, columns=columns, show="headings", height=18)
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=90, anchor="center")
+        vsb = ttk.Scrollbar(dialog, orient="vertical", command=tree.yview)
+        tree.configure(yscrollcommand=vsb.set)
+        tree.grid(row=1, column=0, columnspan=2, padx=(10, 0), pady=5, sticky="nsew")
+        vsb.grid(row=1, column=2, sticky="ns", pady=5)
+        table = IncrementalTable(tree, vsb, window_threshold=200)
+        dialog.columnconfigure(1, weight=1)
+        dialog.rowconfigure(1, weight=1)
+
+        def refresh(event=None):
+            subject = None if basis.get() == "总分" else basis.get()
+            with span('班级排名', subject=subject):
+                result = self.engine.ranking(semester, subject)
+            rows = [(student, (rank, student, f"{score:g}", f"{pct:.1f}"), ())
+                    for student, score, rank, pct in zip(result['students'], result['scores'].tolist(),
+                                                         result['ranks'].tolist(), result['percentiles'].tolist())]
+            table.set_rows(rows)
+
+        basis.bind("<<ComboboxSelected>>", refresh)
+        ttk.Button(dialog, text="刷新", command=refresh).grid(row=2, column=0, columnspan=2, pady=5)
+        refresh()
+
+    def show_diagnostics(self):
+        """诊断窗口：分析缓存命中情况、数据规模与计时埋点汇总"""
+        dialog = tk.Toplevel()
+        dialog.title("诊断信息")
+        dialog.geometry("520x420")
+
+        text = tk.Text(dialog, width=66, height=22)
+        text.grid(row=0, column=0, columnspan=3, padx=10, pady=5)
+        tracer = get_tracer()
+
+        def refresh():
+            stats = self.engine.cache.stats()
+            charts = self.engine.charts.stats()
+            store = self.engine.store
+            lines = [
+                "分析缓存",
+                f"  条目：{stats['size']}/{stats['maxsize']}",
+                f"  命中：{stats['hits']}  未命中：{stats['misses']}  命中率：{stats['hit_rate']:.1%}",
+                f"  淘汰：{stats['evictions']}",
+                "  按类型：" + "，".join(f"{kind} {count}" for kind, count in stats['kinds'].items()),
+                f"  版本分区：{len(self.engine.versions.counts)}（第 {self.engine.versions.epoch} 次加载）",
+                f"图表成品：{charts['size']}/{charts['maxsize']}  命中率：{charts['hit_rate']:.1%}",
+                f"界面刷新：{self.redraw.passes} 轮  " +
+                "，".join(f"{name} {count}" for name, count in self.redraw.counts.items()),
+                "数据规模",
+                f"  学期：{len(store.semesters)}  学科：{len(store.subjects)}  学生：{len(store.students)}",
+                "计时埋点"
+            ]
+            if not tracer.enabled:
+                lines.append("  未启用（设置环境变量 GRADE_TRACE=1 后启动）")
             else:
-                levels['不及格'] += 1
-        return levels
+                lines.append(f"  {'名称':<24}{'次数':>6}{'总计ms':>10}{'平均ms':>9}{'最大ms':>9}")
+                for name, count, total, mean, longest in tracer.summary():
+                    lines.append(f"  {name:<24}{count:>6}{total:>10.1f}{mean:>9.2f}{longest:>9.1f}")
+            text.delete("1.0", tk.END)
+            text.insert(tk.END, "\n".join(lines))
+
+        def export_trace():
+            filepath = filedialog.asksaveasfilename(
+                parent=dialog,
+                defaultextension=".json",
+                filetypes=[("Chrome Trace", "*.json")]
+            )
+            if filepath:
+                count = tracer.export_chrome(filepath)
+                messagebox.showinfo("成功", f"已导出 {count} 个事件，可在 chrome://tracing 中打开", parent=dialog)
+
+        def clear_trace():
+            tracer.clear()
+            refresh()
+
+        state = "normal" if tracer.enabled else "disabled"
+        ttk.Button(dialog, text="刷新", command=refresh).grid(row=1, column=0, pady=5)
+        ttk.Button(dialog, text="导出 Chrome Trace", command=export_trace, state=state).grid(row=1, column=1, pady=5)
+        ttk.Button(dialog, text="清空", command=clear_trace, state=state).grid(row=1, column=2, pady=5)
+        refresh()
 
 
 if __name__ == "__main__":
     root = tk.Tk()
     app = EnhancedScoreAnalyzer(root)
-    root.mainloop()
\ No newline at end of file
+    if os.environ.get("GRADE_STARTUP_PROBE"):
+        # 启动基准：首个窗口完成绘制后输出标记并退出
+        root.after_idle(lambda: (print("FIRST_WINDOW", flush=True), root.destroy()))
+    root.mainloop()
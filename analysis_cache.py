@@ -0,0 +1,71 @@
+"""分析结果缓存：按分区版本号精确失效的 LRU 缓存"""
+from collections import OrderedDict
+
+
+class VersionCounters:
+    """数据分区版本号
+
+    分区如 ('semester', 学期名)、('subject', 学科)、('full_marks',)；每次变更递增对应分区，
+    缓存键中带上所依赖分区的版本号，数据变化后旧结果自然不再命中。
+    epoch 在整体替换数据（加载存档）时递增，使全部旧版本失效。
+    """
+
+    def __init__(self):
+        self.epoch = 0
+        self.counts = {}
+
+    def bump(self, *partitions):
+        for partition in partitions:
+            self.counts[partition] = self.counts.get(partition, 0) + 1
+
+    def reset(self):
+        self.epoch += 1
+        self.counts = {}
+
+    def key(self, *partitions):
+        """所依赖分区的版本元组（含 epoch）"""
+        return (self.epoch,) + tuple(self.counts.get(partition, 0) for partition in partitions)
+
+
+class AnalysisCache:
+    """容量有限的 LRU 缓存，记录命中、未命中与淘汰次数"""
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, compute):
+        """命中时返回缓存结果，否则调用 compute() 计算并缓存"""
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+        self.misses += 1
+        value = compute()
+        self.entries[key] = value
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return value
+
+    def clear(self):
+        self.entries.clear()
+
+    def stats(self):
+        """诊断信息：按分析类型统计的条目数与总体命中率"""
+        kinds = {}
+        for key in self.entries:
+            kinds[key[0]] = kinds.get(key[0], 0) + 1
+        total = self.hits + self.misses
+        return {
+            'size': len(self.entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / total if total else 0.0,
+            'kinds': kinds
+        }
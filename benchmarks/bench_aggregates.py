@@ -0,0 +1,62 @@
+"""流式聚合基准：每次查询重新扫描全体成绩 vs 增量维护的 Welford 统计与分位数草图"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from synthetic import make_engine, semester_names, student_names  # noqa: E402
+
+
+SEMESTER = semester_names(1)[0]
+
+
+def rescan(store):
+    n = len(store.students)
+    j, t = store.subject_index['数学'], store.semester_index[SEMESTER]
+    values = store.scores[:n, j, t][store.mask[:n, j, t]].astype(np.float64)
+    return values.mean(), values.std(), np.median(values), np.quantile(values, 0.9)
+
+
+def main(sizes=(1000, 10000, 100000, 1000000), edits=1000, seed=1):
+    rng = np.random.default_rng(seed)
+    print(f"{'学生数':>8} {'重新扫描':>10} {'首次构建':>10} {'改分+查询(扫描)':>16} {'改分+查询(聚合)':>16}")
+    for n_students in sizes:
+        # 一个学期的全体学生，只对数学一门学科做统计
+        store = make_engine(n_students, n_semesters=1).store
+        names = student_names(n_students)
+        students = rng.integers(0, n_students, edits)
+        values = rng.integers(0, 201, edits) / 2
+
+        start = time.perf_counter()
+        rescan(store)
+        scan = time.perf_counter() - start
+
+        start = time.perf_counter()
+        store.aggregates.get('数学', SEMESTER)
+        build = time.perf_counter() - start
+
+        scan_edits = min(edits, 50)
+        start = time.perf_counter()
+        for s, value in zip(students[:scan_edits], values[:scan_edits]):
+            store.set_score(SEMESTER, '数学', value, student=names[s])
+            rescan(store)
+        scan_edit = (time.perf_counter() - start) / scan_edits
+
+        start = time.perf_counter()
+        for s, value in zip(students, values):
+            store.set_score(SEMESTER, '数学', value, student=names[s])
+            stats = store.aggregates.get('数学', SEMESTER)
+            stats.mean, stats.std, stats.median, stats.quantile(0.9)
+        agg_edit = (time.perf_counter() - start) / edits
+
+        mean, std, median, p90 = rescan(store)
+        assert np.isclose(stats.mean, mean) and np.isclose(stats.std, std)
+        assert stats.median == median and np.isclose(stats.quantile(0.9), p90)
+        print(f"{n_students:>8} {scan * 1000:>8.2f}ms {build * 1000:>8.2f}ms "
+              f"{scan_edit * 1000:>14.3f}ms {agg_edit * 1000:>14.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""分析缓存基准：来回切换学期与分析模式时，无缓存 vs 版本化 LRU 缓存"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from analysis_cache import AnalysisCache  # noqa: E402
+from synthetic import GRADE, make_engine  # noqa: E402
+
+
+def switch(engine, semesters, subjects, rounds):
+    """模拟界面操作：切换学期（表格 + 学期图）与趋势图，每 10 轮录入一次成绩"""
+    start = time.perf_counter()
+    for k in range(rounds):
+        semester = semesters[k % len(semesters)]
+        engine.semester_rows(semester)
+        engine.semester_model(semester)
+        engine.trend_model(subjects)
+        if k % 10 == 9:
+            engine.add_score(semester, subjects[0], float(k % 100))
+    return (time.perf_counter() - start) / rounds
+
+
+def main(sizes=(100, 1000, 10000), rounds=500):
+    print(f"{'学期数':>8} {'无缓存(每轮)':>12} {'缓存(每轮)':>12} {'命中率':>8}")
+    for n_semesters in sizes:
+        engine = make_engine(n_semesters=n_semesters)
+        subjects = engine.grade_subjects[GRADE]
+        semesters = engine.store.ordered_semesters()[-4:]
+
+        engine.cache = AnalysisCache(maxsize=0)
+        uncached = switch(engine, semesters, subjects, rounds)
+        engine.cache = AnalysisCache()
+        cached = switch(engine, semesters, subjects, rounds)
+        print(f"{n_semesters:>8} {uncached * 1000:>10.3f}ms {cached * 1000:>10.3f}ms "
+              f"{engine.cache.stats()['hit_rate']:>8.1%}")
+
+
+if __name__ == "__main__":
+    main()
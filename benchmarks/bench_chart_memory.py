@@ -0,0 +1,65 @@
+"""图表内存基准：1000 次学期切换后内存应保持平稳，且不产生新的 Figure
+
+python benchmarks/bench_chart_memory.py [切换次数]
+"""
+import gc
+import os
+import sys
+import tracemalloc
+
+import matplotlib
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from score_engine import ScoreEngine  # noqa: E402
+from score_charts import SemesterChart  # noqa: E402
+
+# 允许增长的上限（字节），用于吸收缓存预热等一次性开销
+GROWTH_LIMIT = 1024 * 1024
+
+
+def live_figures():
+    gc.collect()
+    return sum(isinstance(obj, Figure) for obj in gc.get_objects())
+
+
+def main(switches=1000):
+    engine = ScoreEngine()
+    engine.store.add_semester("2024-2025 第1学期", '七年级')
+    engine.store.add_semester("2024-2025 第2学期", '八年级')
+    for score, subject in zip(range(60, 100, 5), engine.grade_subjects['七年级']):
+        engine.add_score("2024-2025 第1学期", subject, float(score))
+    for score, subject in zip(range(95, 40, -6), engine.grade_subjects['八年级']):
+        engine.add_score("2024-2025 第2学期", subject, float(score))
+    models = [engine.semester_model(sem) for sem in engine.store.semesters]
+
+    chart = SemesterChart()
+    canvas = FigureCanvasAgg(chart.figure)
+    # 预热：字体缓存、文本布局缓存等
+    for i in range(50):
+        chart.update(models[i % 2])
+        canvas.draw()
+
+    figures_before = live_figures()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    for i in range(switches):
+        chart.update(models[i % 2])
+        canvas.draw()
+    gc.collect()
+    growth = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    figures_after = live_figures()
+
+    print(f"matplotlib {matplotlib.__version__}，学期切换 {switches} 次")
+    print(f"内存增长：{growth / 1024:.1f} KiB（上限 {GROWTH_LIMIT // 1024} KiB）")
+    print(f"Figure 数量：{figures_before} -> {figures_after}")
+    if growth > GROWTH_LIMIT or figures_after != figures_before:
+        print("检测到内存或 Figure 泄漏！")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000))
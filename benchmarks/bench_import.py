@@ -0,0 +1,87 @@
+"""批量导入基准：CSV 流式导入 vs 逐条 add_score，随行数变化的耗时与峰值内存
+
+两种方式都绑定变更日志（与界面保存过存档后的状态一致）。
+
+python benchmarks/bench_import.py
+（每个规模在独立子进程中运行，峰值内存取自 ru_maxrss，仅支持类 Unix 系统）
+"""
+import csv
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from score_engine import ScoreEngine  # noqa: E402
+from score_import import import_file  # noqa: E402
+from synthetic import GRADE, semester_names  # noqa: E402
+
+
+def write_csv(filepath, n_rows, seed=0):
+    """12 个学期 × 八年级学科，分数随机（同学期同学科重复出现时后者覆盖前者）"""
+    rng = np.random.default_rng(seed)
+    subjects = ScoreEngine().grade_subjects[GRADE]
+    semesters = semester_names(12)
+    with open(filepath, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['学期', '学科', '分数', '年级'])
+        for start in range(0, n_rows, 100000):
+            n = min(100000, n_rows - start)
+            sem = rng.integers(0, len(semesters), n)
+            sub = rng.integers(0, len(subjects), n)
+            score = rng.integers(0, 101, n)
+            writer.writerows((semesters[t], subjects[j], int(v), GRADE) for t, j, v in zip(sem, sub, score))
+
+
+def child(filepath, mode):
+    engine = ScoreEngine()
+    engine.attach_journal(filepath + f".{mode}.json")
+    start = time.perf_counter()
+    if mode == 'bulk':
+        importer = import_file(engine, filepath)
+        rows = importer.imported
+    else:
+        rows = 0
+        with open(filepath, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            next(reader)
+            for semester, subject, score, grade in reader:
+                if semester not in engine.store:
+                    engine.add_semester(semester, grade)
+                engine.add_score(semester, subject, float(score))
+                rows += 1
+    elapsed = time.perf_counter() - start
+    engine.journal.close()
+    print(json.dumps({'rows': rows, 'seconds': elapsed,
+                      'peak_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}))
+
+
+def run(filepath, mode):
+    out = subprocess.run([sys.executable, __file__, '--child', filepath, mode],
+                         capture_output=True, text=True, check=True, cwd=ROOT)
+    return json.loads(out.stdout)
+
+
+def main(sizes=(10000, 100000, 1000000, 3000000), loop_limit=10000):
+    print(f"{'行数':>10} {'逐条(行/秒)':>12} {'批量(行/秒)':>12} {'批量峰值内存':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in sizes:
+            filepath = os.path.join(tmp, f"{n_rows}.csv")
+            write_csv(filepath, n_rows)
+            bulk = run(filepath, 'bulk')
+            loop = run(filepath, 'loop')['seconds'] if n_rows <= loop_limit else None
+            loop_text = f"{n_rows / loop:>12.0f}" if loop else f"{'-':>12}"
+            print(f"{n_rows:>10} {loop_text} {bulk['rows'] / bulk['seconds']:>12.0f} {bulk['peak_mb']:>10.1f}MB")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        child(sys.argv[2], sys.argv[3])
+    else:
+        main()
@@ -0,0 +1,66 @@
+"""等级判定基准：逐条 if/elif 循环 vs 批量阈值表（默认 100 万条成绩）"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from score_levels import LevelClassifier  # noqa: E402
+
+
+SUBJECTS = ['语文', '数学', '英语', '物理', '化学', '历史', '政治', '体育']
+GRADE_STANDARDS = {
+    '七年级': {'优秀': 90, '良好': 80, '及格': 60},
+    '八年级': {'优秀': 90, '良好': 80, '及格': 60},
+    '九年级': {'优秀': 75, '良好': 60, '及格': 50}
+}
+
+
+def legacy_calculate_levels(full_marks, scores, subjects):
+    """2.0.52 版 calculate_levels 的原始实现"""
+    levels = {'优秀': 0, '良好': 0, '及格': 0, '不及格': 0}
+    for subject, score in zip(subjects, scores):
+        full_mark = full_marks.get(subject, 100)
+        excellent = full_mark * 0.9
+        good = full_mark * 0.8
+        passing = full_mark * 0.6
+
+        if score >= excellent:
+            levels['优秀'] += 1
+        elif score >= good:
+            levels['良好'] += 1
+        elif score >= passing:
+            levels['及格'] += 1
+        else:
+            levels['不及格'] += 1
+    return levels
+
+
+def main(n=1_000_000, seed=0):
+    rng = np.random.default_rng(seed)
+    full_marks = {'语文': 120, '数学': 120, '英语': 120}
+    subject_ids = rng.integers(0, len(SUBJECTS), n)
+    marks = np.array([full_marks.get(sub, 100) for sub in SUBJECTS])
+    scores = (rng.random(n) * marks[subject_ids]).astype(np.float32)
+
+    names = [SUBJECTS[j] for j in subject_ids]
+    values = scores.tolist()
+    start = time.perf_counter()
+    expected = legacy_calculate_levels(full_marks, values, names)
+    loop_time = time.perf_counter() - start
+
+    classifier = LevelClassifier(full_marks, GRADE_STANDARDS, SUBJECTS)
+    classifier.thresholds('七年级')
+    start = time.perf_counter()
+    counts = classifier.count(scores, subject_ids, '七年级')
+    batch_time = time.perf_counter() - start
+
+    assert counts == expected, (counts, expected)
+    print(f"成绩条数：{n}")
+    print(f"逐条循环：{loop_time:.3f}s")
+    print(f"批量判定：{batch_time:.3f}s（{loop_time / batch_time:.1f} 倍）")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,68 @@
+"""报告内存基准：附全体名单的学期报告，峰值内存随学生数（页数）的变化
+
+python benchmarks/bench_report_memory.py [学生数 ...]
+（每个规模在独立子进程中运行，峰值内存取自 ru_maxrss，仅支持类 Unix 系统；需要中文字体，见 font_manager）
+
+reportlab 在保存时才写出整个 PDF，已排好的页面都留在内存中，因此“报告增量”一列随页数增长，
+而不是保持不变；这一列用于跟踪该问题，而非证明内存平稳。
+"""
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from synthetic import make_engine, semester_names  # noqa: E402
+from font_manager import get_font_manager  # noqa: E402
+
+
+def peak_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def child(n_students, filepath):
+    engine = make_engine(n_students, n_semesters=1)
+    from score_engine import load_chinese_font
+
+    load_chinese_font()
+    import score_report  # noqa: F401  预先导入 reportlab，基线只包含数据与依赖库
+    baseline = peak_mb()
+    start = time.perf_counter()
+    engine.write_report(filepath, semester_names(1)[0], roster=True)
+    elapsed = time.perf_counter() - start
+    with open(filepath, 'rb') as f:
+        pages = f.read().count(b'/Type /Page\n')
+    print(json.dumps({'seconds': elapsed, 'baseline_mb': baseline, 'peak_mb': peak_mb(), 'pages': pages,
+                      'size_mb': os.path.getsize(filepath) / 1e6}))
+
+
+def run(n_students, filepath):
+    out = subprocess.run([sys.executable, __file__, '--child', str(n_students), filepath],
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+def main(sizes=(10, 100, 1000, 10000)):
+    try:
+        get_font_manager().font_path()
+    except FileNotFoundError as e:
+        print(f"{e}，无法生成报告")
+        return 1
+    print(f"{'学生数':>8} {'页数':>6} {'耗时':>8} {'基线内存':>10} {'峰值内存':>10} {'报告增量':>10} {'文件大小':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_students in sizes:
+            result = run(n_students, os.path.join(tmp, f"{n_students}.pdf"))
+            growth = result['peak_mb'] - result['baseline_mb']
+            print(f"{n_students:>8} {result['pages']:>6} {result['seconds']:>7.2f}s {result['baseline_mb']:>8.1f}MB "
+                  f"{result['peak_mb']:>8.1f}MB {growth:>8.1f}MB {result['size_mb']:>8.2f}MB")
+    return 0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        child(int(sys.argv[2]), sys.argv[3])
+    else:
+        sys.exit(main([int(arg) for arg in sys.argv[1:]] or (10, 100, 1000, 10000)))
@@ -0,0 +1,44 @@
+"""批量报告吞吐基准：不同进程数下每秒生成的报告份数
+
+max_workers=1 时 bulk_generate_reports 在当前进程中串行生成（不启动进程池），该行标为“串行”，
+作为多进程的基线；其余各行的耗时包含进程池启动与数据传递的开销。
+
+python benchmarks/bench_reports.py [报告份数]
+
+需要中文字体：GRADE_FONT 环境变量、当前目录或系统字体目录中的 simhei.ttf（见 font_manager）。
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from synthetic import make_engine  # noqa: E402
+from font_manager import get_font_manager  # noqa: E402
+from report_jobs import bulk_generate_reports  # noqa: E402
+
+
+def main(n_reports=200):
+    try:
+        get_font_manager().font_path()
+    except FileNotFoundError as e:
+        print(f"{e}，无法生成报告")
+        return 1
+
+    engine = make_engine(n_semesters=n_reports)
+    cores = os.cpu_count() or 1
+    workers = sorted({1, 2, 4, 8, cores} & set(range(1, cores + 1)))
+    print(f"报告份数：{n_reports}，CPU 核数：{cores}")
+    for n in workers:
+        with tempfile.TemporaryDirectory() as out_dir:
+            start = time.perf_counter()
+            errors = [error for *_, error in bulk_generate_reports(engine, out_dir, max_workers=n) if error]
+            elapsed = time.perf_counter() - start
+        assert not errors, errors[0]
+        label = "串行（当前进程）" if n == 1 else f"{n:>2} 个进程"
+        print(f"{label}：{elapsed:.2f}s，{n_reports / elapsed:.1f} 份/秒")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200))
@@ -0,0 +1,48 @@
+"""保存延迟基准：整文件 JSON 重写 vs 追加日志，随数据规模变化
+
+python benchmarks/bench_save.py
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from synthetic import make_engine  # noqa: E402
+
+
+def main(sizes=(10, 100, 1000, 10000), edits=200):
+    print(f"{'学期数':>8} {'整文件重写':>12} {'追加一条':>10} {'压缩(界面线程)':>14} {'压缩(总计)':>12}")
+    for n in sizes:
+        engine = make_engine(n_semesters=n)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "data.json")
+
+            # 旧版 save_data：每次保存都完整重写带缩进的 JSON
+            start = time.perf_counter()
+            with open(path + ".full", 'w', encoding='utf-8') as f:
+                json.dump(engine.to_dict(), f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            full = time.perf_counter() - start
+
+            engine.save_json(path)
+            semester = engine.store.semesters[-1]
+            start = time.perf_counter()
+            for i in range(edits):
+                engine.add_score(semester, '语文', float(i % 100))
+            append = (time.perf_counter() - start) / edits
+
+            start = time.perf_counter()
+            worker = engine.save_json(path, background=True)
+            foreground = time.perf_counter() - start
+            worker.join()
+            total = time.perf_counter() - start
+            engine.journal.close()
+        print(f"{n:>8} {full * 1000:>10.2f}ms {append * 1000:>8.3f}ms {foreground * 1000:>12.2f}ms "
+              f"{total * 1000:>10.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""加载延迟基准：JSON 存档 vs 二进制内存映射快照，随成绩条数变化
+
+python benchmarks/bench_snapshot.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from synthetic import make_engine  # noqa: E402
+from score_engine import ScoreEngine  # noqa: E402
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main(sizes=(100, 1000, 10000, 100000)):
+    print(f"{'成绩条数':>10} {'JSON加载':>10} {'快照加载':>10} {'首次查询':>10} {'快照大小':>10}")
+    for n_students in sizes:
+        engine = make_engine(n_students)
+        n_rows = int(engine.store.mask.sum())
+        with tempfile.TemporaryDirectory() as tmp:
+            json_path = os.path.join(tmp, "data.json")
+            snap_path = os.path.join(tmp, "data.gsnap")
+            # JSON 存档只含默认学生，按相同条数另建单学生数据集
+            single = make_engine(1, n_semesters=n_rows // 9)
+            single.save_json(json_path)
+            single.journal.close()
+            engine.save_snapshot(snap_path)
+            engine.journal.close()
+
+            json_load = timed(ScoreEngine().load_json, json_path)
+            loaded = ScoreEngine()
+            snap_load = timed(loaded.load_snapshot, snap_path)
+            first_query = timed(loaded.semester_rows, loaded.store.semesters[-1], loaded.store.students[-1])
+            del loaded
+            print(f"{n_rows:>10} {json_load * 1000:>8.1f}ms {snap_load * 1000:>8.1f}ms "
+                  f"{first_query * 1000:>8.2f}ms {os.path.getsize(snap_path) / 1e6:>8.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""SQLite 后端与 JSON 存档对比基准（默认 10^6 条成绩）
+
+python benchmarks/bench_sqlite.py [成绩条数]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from synthetic import GRADE, make_engine  # noqa: E402
+from score_engine import ScoreEngine  # noqa: E402
+from score_sqlite import SqliteBackend  # noqa: E402
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main(n_rows=1_000_000):
+    # 单个学生，每学期 9 门学科
+    engine = make_engine(n_semesters=n_rows // len(ScoreEngine().grade_subjects[GRADE]))
+    n_rows = int(engine.store.mask.sum())
+    print(f"成绩条数：{n_rows}")
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "data.json")
+        db_path = os.path.join(tmp, "data.db")
+
+        save_json, _ = timed(engine.save_json, json_path)
+        engine.journal.close()
+        load_json, loaded = timed(lambda: json.load(open(json_path, encoding='utf-8')))
+        dataset = loaded["dataset"]
+
+        backend = SqliteBackend(db_path)
+        save_db, _ = timed(backend.save_engine, engine)
+        load_db, _ = timed(backend.load_store)
+
+        # 趋势查询：旧版按学期逐个扫描字典 vs 按 (subject, semester) 索引查询
+        def dict_trend():
+            return [(sem, dataset[sem]['scores']['数学']) for sem in sorted(dataset)
+                    if '数学' in dataset[sem]['scores']]
+
+        trend_json, _ = timed(dict_trend)
+        trend_db, _ = timed(backend.subject_series, '数学')
+        backend.close()
+
+        print(f"{'':>10} {'JSON':>10} {'SQLite':>10}")
+        print(f"{'保存':>10} {save_json:>9.2f}s {save_db:>9.2f}s")
+        print(f"{'加载':>10} {load_json:>9.2f}s {load_db:>9.2f}s")
+        print(f"{'趋势查询':>10} {trend_json * 1000:>8.1f}ms {trend_db * 1000:>8.1f}ms")
+        print(f"文件大小：JSON {os.path.getsize(json_path) / 1e6:.1f} MB，"
+              f"SQLite {os.path.getsize(db_path) / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
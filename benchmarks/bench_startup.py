@@ -0,0 +1,77 @@
+"""冷启动基准：模块导入耗时（python -X importtime）与首个窗口出现耗时
+
+超出预算时以非零状态码退出，可直接用于回归检查：
+python benchmarks/bench_startup.py [--import-budget 毫秒] [--window-budget 毫秒]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "2.0.52.py")
+
+
+def measure_imports():
+    """返回 (总导入耗时毫秒, 最慢的顶层模块列表)"""
+    code = f"import runpy; runpy.run_path({APP!r}, run_name='startup_probe')"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    top_level = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # 只统计顶层导入（名称前无缩进），避免重复计入子模块
+        if not name.startswith("  "):
+            top_level.append((int(cumulative) / 1000, name.strip()))
+    top_level.sort(reverse=True)
+    return sum(ms for ms, _ in top_level), top_level[:8]
+
+
+def measure_first_window(timeout=30):
+    """启动程序直到首个窗口绘制完成，返回耗时毫秒；无显示环境时返回 None"""
+    if sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+        return None
+    env = dict(os.environ, GRADE_STARTUP_PROBE="1")
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, APP], cwd=ROOT, env=env,
+                            stdout=subprocess.PIPE, text=True)
+    try:
+        for line in proc.stdout:
+            if line.strip() == "FIRST_WINDOW":
+                return (time.perf_counter() - start) * 1000
+    finally:
+        proc.wait(timeout=timeout)
+    raise RuntimeError("程序未能打开窗口")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="冷启动基准")
+    parser.add_argument("--import-budget", type=float, default=250, help="导入耗时预算（毫秒，默认 250）")
+    parser.add_argument("--window-budget", type=float, default=1500, help="首个窗口耗时预算（毫秒，默认 1500）")
+    args = parser.parse_args(argv)
+
+    failed = False
+    total, heaviest = measure_imports()
+    print(f"导入耗时：{total:.1f} ms（预算 {args.import_budget:.0f} ms）")
+    for ms, name in heaviest:
+        print(f"  {ms:8.1f} ms  {name}")
+    if total > args.import_budget:
+        print("导入耗时超出预算！")
+        failed = True
+
+    window = measure_first_window()
+    if window is None:
+        print("首个窗口：无显示环境，跳过")
+    else:
+        print(f"首个窗口：{window:.1f} ms（预算 {args.window_budget:.0f} ms）")
+        if window > args.window_budget:
+            print("首个窗口耗时超出预算！")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+"""趋势查询基准：每次渲染扫描全部学期 vs 增量维护的学科时间序列索引"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from synthetic import make_engine  # noqa: E402
+from score_store import DEFAULT_STUDENT  # noqa: E402
+
+
+def legacy_trend_model(store, subjects):
+    """按学期名排序后逐学期取值的原始实现"""
+    semesters = sorted(store.semesters)
+    s = store.student_index[DEFAULT_STUDENT]
+    t = np.array([store.semester_index[sem] for sem in semesters], dtype=np.intp)
+    series = {}
+    for subject in subjects:
+        j = store.subject_index[subject]
+        present = store.mask[s, j, t]
+        if present.any():
+            series[subject] = ([sem for sem, ok in zip(semesters, present) if ok], store.scores[s, j, t[present]])
+    return {'semesters': semesters, 'series': series}
+
+
+def main(sizes=(100, 1000, 10000, 100000), renders=20):
+    print(f"{'学期数':>8} {'扫描(每次)':>12} {'索引首次':>10} {'索引(每次)':>12} {'录入+查询':>10}")
+    for n_semesters in sizes:
+        engine = make_engine(n_semesters=n_semesters)
+        subjects = engine.store.used_subjects()
+
+        start = time.perf_counter()
+        for _ in range(renders):
+            expected = legacy_trend_model(engine.store, subjects)
+        legacy = (time.perf_counter() - start) / renders
+
+        start = time.perf_counter()
+        model = engine.trend_model(subjects)
+        first = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(renders):
+            model = engine.trend_model(subjects)
+        indexed = (time.perf_counter() - start) / renders
+        # 旧实现按名称排序，时间线按 (学年, 学期序号) 排序，这里只比较内容
+        assert sorted(model['semesters']) == expected['semesters']
+        assert all(dict(zip(*model['series'][sub])) == dict(zip(*expected['series'][sub])) for sub in subjects)
+
+        # 录入一条成绩后立即刷新趋势图
+        semester = engine.store.semesters[n_semesters // 2]
+        start = time.perf_counter()
+        for k in range(renders):
+            engine.add_score(semester, subjects[0], float(k))
+            engine.trend_model(subjects)
+        edit = (time.perf_counter() - start) / renders
+        print(f"{n_semesters:>8} {legacy * 1000:>10.2f}ms {first * 1000:>8.2f}ms "
+              f"{indexed * 1000:>10.2f}ms {edit * 1000:>8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
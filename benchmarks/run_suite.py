@@ -0,0 +1,354 @@
+"""热点路径基准套件：按规模档位计时全部热点操作，输出 JSON 结果并可与旧结果对比
+
+python benchmarks/run_suite.py [--tiers 1,1000,100000] [--repeat 5] [-o 结果.json]
+                               [--compare 基线.json] [--threshold 0.2]
+
+每个档位用固定种子生成 学生数 × 12 个学期 × 9 门学科 的数据（见 synthetic.py），
+图表用 Agg 渲染；报告需要中文字体（GRADE_FONT 环境变量、当前目录或系统字体目录中的 simhei.ttf），
+表格刷新需要可用的 Tk 显示，条件不满足的项目记为 skipped。
+对比时中位数变慢超过阈值的项目视为回归，退出码为 1。
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, BENCH_DIR)
+from synthetic import make_engine, score_stream  # noqa: E402
+from score_engine import ScoreEngine  # noqa: E402
+
+
+CASES = []
+ROSTER_LIMIT = 10000  # 全体名单报告只在不超过该学生数的档位上计时
+
+
+def case(name):
+    """登记一个基准项目：setup(engine, tmp) 返回被计时的无参函数与每次调用的操作数"""
+    def register(setup):
+        CASES.append((name, setup))
+        return setup
+    return register
+
+
+class Skip(Exception):
+    pass
+
+
+# === 基准项目 ===
+@case('add_score')
+def bench_add_score(engine, tmp):
+    stream = score_stream(1000)
+
+    def run():
+        for semester, subject, score in stream:
+            engine.add_score(semester, subject, score)
+    return run, len(stream)
+
+
+@case('add_score_journal')
+def bench_add_score_journal(engine, tmp):
+    stream = score_stream(200)
+    engine.attach_journal(os.path.join(tmp, 'journal.json'))
+
+    def run():
+        for semester, subject, score in stream:
+            engine.add_score(semester, subject, score)
+    return run, len(stream)
+
+
+@case('update_data_table')
+def bench_update_data_table(engine, tmp):
+    try:
+        import tkinter as tk
+        from tkinter import ttk
+        root = tk.Tk()
+    except Exception as e:
+        raise Skip(f"Tk 不可用：{e}")
+    from ui_widgets import IncrementalTable
+
+    root.withdraw()
+    tree = ttk.Treeview(root, columns=("学科", "分数", "满分", "等级"), show="headings")
+    table = IncrementalTable(tree, ttk.Scrollbar(root))
+    semesters = engine.store.ordered_semesters()
+
+    def run():
+        # 与界面的 update_data_table 相同：取表格行后按差异刷新
+        for semester in semesters:
+            rows = [(subject, (subject, score, full, level), ('warning',) if level == '不及格' else ())
+                    for subject, score, full, level in engine.semester_rows(semester)]
+            table.set_rows(rows)
+            root.update_idletasks()
+    return run, len(semesters)
+
+
+@case('calculate_levels')
+def bench_calculate_levels(engine, tmp):
+    store = engine.store
+    semester = store.ordered_semesters()[-1]
+    t = store.semester_index[semester]
+    ids = np.array(store.semester_subjects[t], dtype=np.intp)
+    n_stu = len(store.students)
+    scores = store.scores[:n_stu, ids, t].ravel()
+    subject_ids = np.tile(ids, n_stu)
+    grade = store.get_grade(semester)
+
+    def run():
+        engine.classifier.count(scores, subject_ids, grade)
+    return run, len(scores)
+
+
+@case('class_ranking')
+def bench_class_ranking(engine, tmp):
+    semester = engine.store.ordered_semesters()[-1]
+
+    def run():
+        engine.store.ranks.reset()
+        engine.ranking(semester)
+    return run, len(engine.store.students)
+
+
+@case('rank_update')
+def bench_rank_update(engine, tmp):
+    semester = engine.store.ordered_semesters()[-1]
+    students = engine.store.students
+    engine.ranking(semester)
+    engine.ranking(semester, '数学')
+    rng = np.random.default_rng(2)
+    updates = [(students[k], float(v)) for k, v in zip(rng.integers(0, len(students), 100), rng.integers(0, 101, 100))]
+
+    def run():
+        for student, score in updates:
+            engine.add_score(semester, '数学', score, student)
+    return run, len(updates)
+
+
+@case('semester_chart')
+def bench_semester_chart(engine, tmp):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from score_charts import SemesterChart
+
+    chart = SemesterChart()
+    canvas = FigureCanvasAgg(chart.figure)
+    semesters = engine.store.ordered_semesters()[:2]
+
+    def run():
+        for semester in semesters:
+            chart.update(engine._semester_model(semester))
+            canvas.draw()
+    return run, len(semesters)
+
+
+@case('trend_chart')
+def bench_trend_chart(engine, tmp):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from score_charts import TrendChart
+
+    chart = TrendChart()
+    canvas = FigureCanvasAgg(chart.figure)
+    subjects = engine.store.used_subjects()
+
+    def run():
+        chart.update(engine._trend_model(tuple(subjects), None))
+        canvas.draw()
+    return run, 1
+
+
+@case('generate_report')
+def bench_generate_report(engine, tmp):
+    from font_manager import get_font_manager
+
+    try:
+        get_font_manager().font_path()
+    except Exception as e:
+        raise Skip(f"缺少中文字体：{e}")
+    semester = engine.store.ordered_semesters()[-1]
+    filepath = os.path.join(tmp, 'report.pdf')
+
+    def run():
+        engine.write_report(filepath, semester, roster=False)
+    return run, 1
+
+
+@case('generate_roster_report')
+def bench_generate_roster_report(engine, tmp):
+    from font_manager import get_font_manager
+
+    try:
+        get_font_manager().font_path()
+    except Exception as e:
+        raise Skip(f"缺少中文字体：{e}")
+    if len(engine.store.students) > ROSTER_LIMIT:
+        raise Skip(f"名单超过 {ROSTER_LIMIT} 名学生，跳过以控制运行时间")
+    semester = engine.store.ordered_semesters()[-1]
+    filepath = os.path.join(tmp, 'roster.pdf')
+
+    def run():
+        engine.write_report(filepath, semester, roster=True)
+    return run, len(engine.store.students)
+
+
+@case('save_json')
+def bench_save_json(engine, tmp):
+    # JSON 存档只包含默认学生，全体学生的保存/加载见 save_snapshot/load_snapshot
+    filepath = os.path.join(tmp, 'data.json')
+
+    def run():
+        engine.save_json(filepath)
+    return run, 1
+
+
+@case('load_json')
+def bench_load_json(engine, tmp):
+    filepath = os.path.join(tmp, 'load.json')
+    engine.save_json(filepath)
+    engine.journal.close()
+    engine.journal = None
+
+    def run():
+        ScoreEngine().load_json(filepath)
+    return run, 1
+
+
+@case('save_snapshot')
+def bench_save_snapshot(engine, tmp):
+    filepath = os.path.join(tmp, 'data.gsnap')
+
+    def run():
+        engine.save_snapshot(filepath)
+    return run, 1
+
+
+@case('load_snapshot')
+def bench_load_snapshot(engine, tmp):
+    filepath = os.path.join(tmp, 'load.gsnap')
+    engine.save_snapshot(filepath)
+    engine.journal.close()
+    engine.journal = None
+
+    def run():
+        loaded = ScoreEngine()
+        loaded.load_snapshot(filepath)
+        # 读取一个学期，计入首次访问映射页的开销
+        loaded.semester_rows(loaded.store.semesters[-1])
+    return run, 1
+
+
+# === 运行与对比 ===
+def time_case(run, repeat):
+    run()  # 预热
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def run_suite(tiers, repeat, only=None):
+    results = {}
+    for n_students in tiers:
+        for name, setup in CASES:
+            if only and name not in only:
+                continue
+            key = f"{name}[{n_students}]"
+            engine = make_engine(n_students)
+            with tempfile.TemporaryDirectory() as tmp:
+                try:
+                    run, ops = setup(engine, tmp)
+                except Skip as e:
+                    results[key] = {'skipped': str(e)}
+                    print(f"{key:<32} 跳过：{e}")
+                    continue
+                samples = time_case(run, repeat)
+                if engine.journal is not None:
+                    engine.journal.close()
+            results[key] = {
+                'median_ms': statistics.median(samples),
+                'min_ms': min(samples),
+                'runs': repeat,
+                'ops': ops
+            }
+            print(f"{key:<32} {results[key]['median_ms']:>10.2f}ms  (最小 {results[key]['min_ms']:.2f}ms，{ops} 次操作)")
+    return results
+
+
+def metadata(tiers, repeat):
+    import matplotlib
+
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                                text=True, timeout=30).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'matplotlib': matplotlib.__version__,
+        'platform': platform.platform(),
+        'tiers': tiers,
+        'repeat': repeat,
+        'semesters': 12,
+        'seed': 0
+    }
+
+
+def compare(baseline, results, threshold):
+    """打印与基线的对比，返回回归项目列表"""
+    regressions = []
+    print(f"\n{'项目':<32} {'基线':>10} {'本次':>10} {'比值':>8}")
+    for key, current in results.items():
+        base = baseline.get('results', {}).get(key)
+        if not base or 'median_ms' not in base or 'median_ms' not in current:
+            continue
+        ratio = current['median_ms'] / base['median_ms'] if base['median_ms'] else float('inf')
+        flag = ''
+        if ratio > 1 + threshold:
+            flag = '  回归'
+            regressions.append(key)
+        print(f"{key:<32} {base['median_ms']:>8.2f}ms {current['median_ms']:>8.2f}ms {ratio:>7.2f}x{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="热点路径基准套件")
+    parser.add_argument("--tiers", default="1,1000,100000", help="学生数档位，逗号分隔（默认 1,1000,100000）")
+    parser.add_argument("--repeat", type=int, default=5, help="每个项目的计时次数（默认 5）")
+    parser.add_argument("--only", help="只运行指定项目，逗号分隔")
+    parser.add_argument("-o", "--output", help="结果 JSON 的输出路径")
+    parser.add_argument("--compare", help="与之对比的基线结果 JSON")
+    parser.add_argument("--threshold", type=float, default=0.2, help="判定回归的变慢比例（默认 0.2）")
+    args = parser.parse_args(argv)
+
+    tiers = [int(n) for n in args.tiers.split(",")]
+    only = set(args.only.split(",")) if args.only else None
+    results = run_suite(tiers, args.repeat, only)
+    report = {'meta': metadata(tiers, args.repeat), 'results': results}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n结果已写入 {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            regressions = compare(json.load(f), results, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} 个项目回归：{'、'.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+"""可复现的合成数据：固定随机种子生成 学生 × 学期 × 学科 的成绩
+
+学生从 1 名（只有默认学生，相当于单人使用的界面）到 10 万名，学期默认 12 个（六个学年），
+学科取八年级的九门；分数为整数或 .5，服从截断正态分布。
+"""
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from score_engine import ScoreEngine  # noqa: E402
+from score_store import ScoreStore, DEFAULT_STUDENT  # noqa: E402
+
+
+GRADE = '八年级'
+
+
+def semester_names(n_semesters, first_year=2020):
+    return [f"{first_year + t // 2}-{first_year + 1 + t // 2} 第{t % 2 + 1}学期" for t in range(n_semesters)]
+
+
+def student_names(n_students):
+    """第一名为默认学生，其余按编号命名"""
+    return [DEFAULT_STUDENT] + [f"学生{s:06d}" for s in range(1, n_students)]
+
+
+def make_engine(n_students=1, n_semesters=12, seed=0):
+    """生成一个已填满成绩的引擎（不绑定日志）"""
+    rng = np.random.default_rng(seed)
+    engine = ScoreEngine()
+    subjects = engine.grade_subjects[GRADE]
+    semesters = semester_names(n_semesters)
+    s, j, t = np.meshgrid(np.arange(n_students), np.arange(len(subjects)), np.arange(n_semesters), indexing='ij')
+    scores = np.clip(np.rint(rng.normal(75, 12, s.size) * 2) / 2, 0, 100).astype(np.float32)
+    engine.store = ScoreStore.from_columns(semesters, [GRADE] * n_semesters, subjects, student_names(n_students),
+                                           t.ravel(), j.ravel(), s.ravel(), scores)
+    engine.classifier.bind(engine.store.subjects)
+    engine.versions.reset()
+    engine.cache.clear()
+    return engine
+
+
+def score_stream(n, n_semesters=12, seed=1):
+    """add_score 基准使用的 (学期, 学科, 分数) 序列"""
+    rng = np.random.default_rng(seed)
+    subjects = ScoreEngine().grade_subjects[GRADE]
+    semesters = semester_names(n_semesters)
+    return [(semesters[t], subjects[j], float(v)) for t, j, v in
+            zip(rng.integers(0, n_semesters, n), rng.integers(0, len(subjects), n), rng.integers(0, 101, n))]
@@ -0,0 +1,112 @@
+"""图表成品：同一份分析数据只做一次 matplotlib 布局，导出、PDF报告与批量输出共用
+
+ChartArtifact 记录图表种类与分析数据，在首次需要时绘制 Figure，各格式（png/pdf/svg）的字节在首次请求时生成并缓存；
+种类与数据可以序列化，界面的导出由工作进程按同样的数据重新绘制（见 export_worker），渲染结果再存回成品。
+报告默认嵌入 PNG 图片；vector=True 时把 SVG 转成 reportlab 矢量图形（需要安装 svglib，未安装时仍用 PNG）。
+"""
+import io
+import os
+
+
+FORMATS = {'.png': 'png', '.pdf': 'pdf', '.svg': 'svg'}
+CHART_DPI = 300  # 导出、报告与批量输出共用的位图分辨率：同一张图的 PNG 只渲染一次
+
+
+def chart_format(filepath):
+    """按扩展名取图表格式，不支持时抛出 ValueError"""
+    fmt = FORMATS.get(os.path.splitext(filepath)[1].lower())
+    if fmt is None:
+        raise ValueError(f"不支持的图表格式：{filepath}")
+    return fmt
+
+
+def render_chart(kind, model):
+    """按种类（'semester' 或 'trend'）新建图表并绘制，返回 Figure"""
+    from score_charts import SemesterChart, TrendChart
+
+    chart = SemesterChart() if kind == 'semester' else TrendChart()
+    return chart.update(model)
+
+
+def figure_bytes(figure, fmt, dpi=CHART_DPI):
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format=fmt, dpi=dpi, bbox_inches='tight')
+    return buffer.getvalue()
+
+
+def _key(fmt, dpi):
+    return fmt, dpi if fmt == 'png' else None  # 矢量格式与 dpi 无关
+
+
+class ChartArtifact:
+    """一张分析图及其各格式输出（只在创建它的线程中使用）"""
+
+    def __init__(self, kind, model):
+        self.kind = kind
+        self.model = model
+        self._figure = None
+        self._data = {}
+        self._drawing = None
+
+    @property
+    def figure(self):
+        if self._figure is None:
+            self._figure = render_chart(self.kind, self.model)
+        return self._figure
+
+    def data(self, fmt, dpi=CHART_DPI):
+        """某格式的文件内容（bytes）"""
+        key = _key(fmt, dpi)
+        if key not in self._data:
+            self._data[key] = figure_bytes(self.figure, fmt, dpi)
+        return self._data[key]
+
+    def cached(self, fmt, dpi=CHART_DPI):
+        """已生成的字节，尚未生成时返回 None"""
+        return self._data.get(_key(fmt, dpi))
+
+    def store(self, fmt, dpi, data):
+        """存入在别处（如导出进程）按同样数据渲染出的字节"""
+        self._data.setdefault(_key(fmt, dpi), data)
+
+    def save(self, filepath, dpi=CHART_DPI):
+        """按扩展名写出 PNG/PDF/SVG 文件"""
+        data = self.data(chart_format(filepath), dpi)
+        with open(filepath, 'wb') as f:
+            f.write(data)
+        return filepath
+
+    def flowable(self, width, vector=False):
+        """报告用的 reportlab flowable，按 width 等比缩放
+
+        SVG 转矢量图形比直接嵌入 PNG 慢一到两个数量级，只在 vector=True 时使用。
+        """
+        drawing = None
+        if vector:
+            if self._drawing is None:
+                self._drawing = self._vector()
+            drawing = self._drawing
+        if drawing is not None:
+            from reportlab.graphics.shapes import Drawing, Group
+
+            scale = width / drawing.width
+            group = Group(*drawing.contents)
+            group.scale(scale, scale)
+            scaled = Drawing(width, drawing.height * scale)
+            scaled.add(group)
+            return scaled
+
+        from reportlab.lib.utils import ImageReader
+        from reportlab.platypus import Image
+
+        data = self.data('png')
+        pixel_width, pixel_height = ImageReader(io.BytesIO(data)).getSize()
+        return Image(io.BytesIO(data), width=width, height=width * pixel_height / pixel_width)
+
+    def _vector(self):
+        """SVG 转 reportlab Drawing，未安装 svglib 时返回 None"""
+        try:
+            from svglib.svglib import svg2rlg
+        except ImportError:
+            return None
+        return svg2rlg(io.BytesIO(self.data('svg')))
@@ -0,0 +1,42 @@
+"""折线降采样：Largest-Triangle-Three-Buckets（LTTB）
+
+把 n 个点降到 threshold 个，保留首尾点；中间按 x 顺序均分为 threshold - 2 个桶，
+每个桶取与“上一个选中点、下一个桶的均值点”构成三角形面积最大的点，折线的峰谷形状基本不变。
+"""
+import numpy as np
+
+
+def lttb_indices(x, y, threshold):
+    """返回保留点的下标（升序）；点数不超过 threshold 时返回全部下标"""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # 桶边界：第 1 个到第 n-2 个点均分为 threshold - 2 个桶
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.intp)
+    # 每个桶的均值点，最后再补上末点作为最后一个桶的“下一个桶”
+    sums_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    counts = np.diff(edges)
+    avg_x = np.append(sums_x / counts, x[-1])
+    avg_y = np.append(sums_y / counts, y[-1])
+
+    selected = np.empty(threshold, dtype=np.intp)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        bx, by = x[start:end], y[start:end]
+        # 三角形面积的两倍（省去常数因子不影响比较）
+        area = np.abs((x[a] - avg_x[i + 1]) * (by - y[a]) - (x[a] - bx) * (avg_y[i + 1] - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def lttb(x, y, threshold):
+    """降采样后的 (x, y)，类型与输入一致（numpy 数组）"""
+    keep = lttb_indices(x, y, threshold)
+    return np.asarray(x)[keep], np.asarray(y)[keep]
@@ -0,0 +1,118 @@
+"""后台图表导出：在独立进程中渲染并保存，完成后通过 root.after 回到界面线程
+
+图表成品（见 chart_artifacts）由引擎缓存并与PDF报告共用。已渲染过的格式把字节交给工作进程直接写盘；
+否则把图表种类与分析数据交给工作进程重新绘制，渲染出的字节在完成后存回成品，之后的导出与报告不再渲染。
+报告需要的位图也可以先交给工作进程渲染（prerender），界面线程只负责排版。
+"""
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from chart_artifacts import CHART_DPI, chart_format, figure_bytes, render_chart
+
+
+def render_export(kind, model, fmt, dpi=CHART_DPI):
+    """在工作进程中按数据重新绘制图表，返回指定格式的字节"""
+    return figure_bytes(render_chart(kind, model), fmt, dpi)
+
+
+def write_export(kind, model, data, filepath, dpi=CHART_DPI):
+    """在工作进程中写出图表：data 为已渲染的字节，为 None 时按数据重新绘制；返回新渲染的字节"""
+    rendered = None
+    if data is None:
+        data = rendered = render_export(kind, model, chart_format(filepath), dpi)
+    with open(filepath, 'wb') as f:
+        f.write(data)
+    return rendered
+
+
+class ExportQueue:
+    """导出任务队列：依次在后台执行，可排队多个、可取消"""
+
+    def __init__(self, root, on_change=None, on_done=None, poll_ms=100):
+        self.root = root
+        self.on_change = on_change  # on_change(排队与执行中的任务数)
+        self.on_done = on_done  # on_done(文件路径, 错误信息或 None)
+        self.poll_ms = poll_ms
+        self.executor = None
+        self.jobs = {}  # 任务编号 -> (future, 文件路径或 None, 图表成品, 格式, dpi, 完成回调)
+        self.cancelled = set()
+        self._ids = itertools.count(1)
+        self._polling = False
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def submit(self, artifact, filepath, dpi=CHART_DPI):
+        """提交导出任务（ChartArtifact 与目标路径），返回任务编号"""
+        try:
+            fmt = chart_format(filepath)
+        except ValueError:
+            fmt = None  # 不支持的格式由工作进程报错
+        data = artifact.cached(fmt, dpi) if fmt else None
+        return self._start(write_export, (artifact.kind, artifact.model, data, filepath, dpi),
+                           (filepath, artifact, fmt, dpi, None))
+
+    def prerender(self, artifact, on_ready, fmt='png', dpi=CHART_DPI):
+        """在工作进程中渲染图表成品的某格式并存回成品，完成后在界面线程调用 on_ready(错误信息或 None)"""
+        return self._start(render_export, (artifact.kind, artifact.model, fmt, dpi),
+                           (None, artifact, fmt, dpi, on_ready))
+
+    def _start(self, func, args, job):
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=1)
+        job_id = next(self._ids)
+        self.jobs[job_id] = (self.executor.submit(func, *args),) + job
+        self._notify()
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_ms, self._poll)
+        return job_id
+
+    def cancel(self, job_id=None):
+        """取消指定任务（默认全部）；执行中的任务完成后删除其输出文件"""
+        for jid in ([job_id] if job_id is not None else list(self.jobs)):
+            if jid not in self.jobs:
+                continue
+            future = self.jobs[jid][0]
+            if future.cancel():
+                del self.jobs[jid]
+            else:
+                self.cancelled.add(jid)
+        self._notify()
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    def _notify(self):
+        if self.on_change:
+            self.on_change(len(self.jobs))
+
+    def _poll(self):
+        """在界面线程中收集已完成的任务"""
+        for jid, (future, filepath, artifact, fmt, dpi, on_ready) in list(self.jobs.items()):
+            if not future.done():
+                continue
+            del self.jobs[jid]
+            error = None if future.cancelled() else future.exception()
+            if error is None and not future.cancelled() and future.result() is not None:
+                artifact.store(fmt, dpi, future.result())
+            message = None if error is None else str(error)
+            if jid in self.cancelled:
+                self.cancelled.discard(jid)
+                if error is None and filepath is not None and os.path.exists(filepath):
+                    os.remove(filepath)
+            elif on_ready is not None:
+                on_ready(message)
+            elif self.on_done:
+                self.on_done(filepath, message)
+            # 每移除一个任务都刷新状态，包括被取消的任务
+            self._notify()
+
+        if self.jobs:
+            self.root.after(self.poll_ms, self._poll)
+        else:
+            self._polling = False
+            self._notify()
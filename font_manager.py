@@ -0,0 +1,95 @@
+"""中文字体管理：只查找、解析、注册一次，供 reportlab 与 matplotlib 共用"""
+import os
+
+
+FONT_NAME = 'SimHei'
+FONT_FILES = ('simhei.ttf', 'SimHei.ttf')
+SYSTEM_FONT_DIRS = (
+    'C:/Windows/Fonts',
+    '/System/Library/Fonts',
+    '/Library/Fonts',
+    os.path.expanduser('~/.fonts'),
+    os.path.expanduser('~/.local/share/fonts'),
+    '/usr/share/fonts/truetype',
+    '/usr/share/fonts',
+)
+
+
+class FontManager:
+    """中文字体资源（首次使用时初始化，之后直接复用缓存）"""
+
+    def __init__(self, search_dirs=None):
+        if search_dirs is None:
+            search_dirs = [os.getcwd(), os.path.dirname(os.path.abspath(__file__))]
+            search_dirs += list(SYSTEM_FONT_DIRS)
+        self.search_dirs = search_dirs
+        self._path = None
+        self._ttfont = None
+        self._font_properties = None
+        self._matplotlib_ready = False
+
+    def font_path(self):
+        """定位字体文件，可用环境变量 GRADE_FONT 指定路径"""
+        if self._path is None:
+            candidates = [os.environ.get('GRADE_FONT', '')]
+            candidates += [os.path.join(d, name) for d in self.search_dirs for name in FONT_FILES]
+            for path in candidates:
+                if path and os.path.isfile(path):
+                    self._path = path
+                    break
+            else:
+                raise FileNotFoundError(f"字体文件未找到：{os.path.join(os.getcwd(), FONT_FILES[0])}")
+        return self._path
+
+    def reportlab_font(self):
+        """注册 reportlab 字体并返回字体名
+
+        reportlab 的 TTFont 在保存时只嵌入文档实际用到的字形子集，
+        因此这里只需保证字体文件只解析一次。
+        """
+        if self._ttfont is None:
+            from reportlab.pdfbase import pdfmetrics
+            from reportlab.pdfbase.ttfonts import TTFont
+
+            self._ttfont = TTFont(FONT_NAME, self.font_path())
+            pdfmetrics.registerFont(self._ttfont)
+        return FONT_NAME
+
+    def matplotlib_font(self):
+        """返回缓存的 FontProperties，找不到字体文件时返回 None"""
+        self.apply_matplotlib()
+        return self._font_properties
+
+    def apply_matplotlib(self):
+        """一次性设置 matplotlib 中文字体（PDF 导出嵌入 TrueType 子集）"""
+        if self._matplotlib_ready:
+            return
+        import matplotlib as mpl
+        from matplotlib import font_manager
+
+        families = [FONT_NAME]
+        try:
+            path = self.font_path()
+        except FileNotFoundError:
+            path = None
+        if path:
+            font_manager.fontManager.addfont(path)
+            self._font_properties = font_manager.FontProperties(fname=path)
+            families = [self._font_properties.get_name()]
+
+        mpl.rcParams['font.sans-serif'] = families + [
+            name for name in mpl.rcParams['font.sans-serif'] if name not in families]
+        mpl.rcParams['axes.unicode_minus'] = False
+        mpl.rcParams['pdf.fonttype'] = 42
+        self._matplotlib_ready = True
+
+
+_manager = None
+
+
+def get_font_manager():
+    """进程内共享的字体管理器"""
+    global _manager
+    if _manager is None:
+        _manager = FontManager()
+    return _manager
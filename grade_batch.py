@@ -0,0 +1,109 @@
+"""批量分析命令行：读取存档目录中的全部 JSON 存档、二进制快照与 SQLite 数据库，输出图表、报告与统计汇总（无需图形界面）
+
+用法：python grade_batch.py 存档目录 [-o 输出目录] [--no-report] [--no-chart] [--last N] [-j 进程数] [--report-chart] [--trace 文件]
+"""
+import argparse
+import json
+import os
+import sys
+
+import perf_trace
+from score_engine import ScoreEngine, is_database, is_snapshot
+from report_jobs import bulk_generate_reports, report_tasks, safe_filename
+
+
+def analyze_file(filepath, out_dir, charts=True, reports=True, jobs=1, last=None, report_chart=False):
+    """分析单个存档文件，返回统计汇总与错误列表；last 为只分析最近的学期数，report_chart 为报告中嵌入的分析图"""
+    engine = ScoreEngine()
+    if is_database(filepath):
+        engine.load_sqlite(filepath)
+    elif is_snapshot(filepath):
+        engine.load_snapshot(filepath)
+    else:
+        engine.load_json(filepath)
+    os.makedirs(out_dir, exist_ok=True)
+
+    span = ('last', last) if last else None
+    summary = {'semesters': {}, 'errors': []}
+    for semester in engine.store.timeline.select(span):
+        model = engine.semester_model(semester)
+        if model is None:
+            continue
+        stem = os.path.join(out_dir, safe_filename(semester))
+        summary['semesters'][semester] = {
+            'grade': model['grade'],
+            'mean': round(model['stats']['mean'], 2),
+            'max': float(model['stats']['max']),
+            'min': float(model['stats']['min']),
+            'count': model['stats']['count'],
+            'levels': model['levels'],
+            'subjects': {subject: {key: round(value, 2) for key, value in stats.items()}
+                         for subject, stats in engine.cohort_model(semester).items()},
+            'rows': [list(row) for row in engine.semester_rows(semester)]
+        }
+        if charts:
+            # 与报告中嵌入的分析图共用同一图表成品，只布局一次
+            engine.semester_chart(semester).save(stem + ".png")
+
+    if reports:
+        # 单进程与多进程使用同一任务列表，-j 只影响速度，不影响输出哪些报告
+        tasks = report_tasks(engine, out_dir, span)
+        for done, total, path, error in bulk_generate_reports(engine, out_dir, max_workers=jobs, tasks=tasks,
+                                                              chart=report_chart):
+            if error:
+                summary['errors'].append(f"{os.path.basename(path)}报告生成失败：{error}")
+            print(f"  报告 {done}/{total}", end="\r" if done < total else "\n", flush=True)
+
+    subjects = engine.store.used_subjects()
+    if charts and subjects:
+        engine.trend_chart(subjects, span).save(os.path.join(out_dir, "趋势分析.png"))
+
+    with open(os.path.join(out_dir, "summary.json"), 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="成绩存档批量分析")
+    parser.add_argument("data_dir", help="存放 JSON 存档、.gsnap 快照或 .db 数据库的目录")
+    parser.add_argument("-o", "--output", default="batch_output", help="输出目录（默认 batch_output）")
+    parser.add_argument("--no-report", action="store_true", help="不生成PDF报告")
+    parser.add_argument("--no-chart", action="store_true", help="不生成图表")
+    parser.add_argument("--last", type=int, help="只分析最近的 N 个学期（按学年与学期序号排序）")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="并行生成报告的进程数（默认 1，即不并行）")
+    parser.add_argument("--report-chart", action="store_const", const="vector", default=False,
+                        help="在默认学生的报告中嵌入矢量学期分析图（需要 svglib，较慢）")
+    parser.add_argument("--trace", metavar="FILE", help="记录各阶段耗时并导出为 Chrome trace JSON")
+    args = parser.parse_args(argv)
+    if args.trace:
+        perf_trace.enable()
+
+    files = sorted(name for name in os.listdir(args.data_dir)
+                   if name.lower().endswith(".json") or is_database(name) or is_snapshot(name))
+    if not files:
+        print(f"目录中没有存档文件：{args.data_dir}", file=sys.stderr)
+        return 1
+
+    failed = 0
+    for name in files:
+        out_dir = os.path.join(args.output, safe_filename(os.path.splitext(name)[0]))
+        try:
+            with perf_trace.span('analyze_file', file=name):
+                summary = analyze_file(os.path.join(args.data_dir, name), out_dir,
+                                       charts=not args.no_chart, reports=not args.no_report, jobs=args.jobs,
+                                       last=args.last, report_chart=args.report_chart)
+        except Exception as e:
+            failed += 1
+            print(f"[失败] {name}：{e}", file=sys.stderr)
+            continue
+        for error in summary['errors']:
+            print(f"[警告] {name}：{error}", file=sys.stderr)
+        print(f"[完成] {name}：{len(summary['semesters'])} 个学期 -> {out_dir}")
+    if args.trace:
+        count = perf_trace.get_tracer().export_chrome(args.trace)
+        print(f"已导出 {count} 个计时事件 -> {args.trace}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""轻量计时埋点：设置环境变量 GRADE_TRACE=1 启用，可汇总显示或导出为 Chrome trace-event JSON
+
+未启用时 span() 返回共享的空上下文，traced() 直接返回原函数，几乎没有开销。
+导出的文件可在 chrome://tracing 或 https://ui.perfetto.dev 中打开。
+"""
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+
+MAX_EVENTS = 100000  # 只保留最近的事件，长时间运行时内存有上限
+
+
+class Tracer:
+    """记录已完成的计时区间（Chrome trace 的 'X' 事件）"""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.events = deque(maxlen=MAX_EVENTS)
+        self.origin = time.perf_counter_ns()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _span(self, name, args):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            event = {
+                'name': name,
+                'ph': 'X',
+                'ts': (start - self.origin) / 1000,
+                'dur': (end - start) / 1000,
+                'pid': os.getpid(),
+                'tid': threading.get_ident()
+            }
+            if args:
+                event['args'] = {key: str(value) for key, value in args.items()}
+            with self._lock:
+                self.events.append(event)
+
+    def span(self, name, **args):
+        """计时区间（with 语句），未启用时为空操作"""
+        if not self.enabled:
+            return nullcontext()
+        return self._span(name, args)
+
+    def clear(self):
+        with self._lock:
+            self.events.clear()
+
+    def summary(self):
+        """按名称汇总：[(名称, 次数, 总耗时ms, 平均ms, 最大ms)]，按总耗时降序"""
+        totals = {}
+        with self._lock:
+            events = list(self.events)
+        for event in events:
+            count, total, longest = totals.get(event['name'], (0, 0.0, 0.0))
+            duration = event['dur'] / 1000
+            totals[event['name']] = (count + 1, total + duration, max(longest, duration))
+        rows = [(name, count, total, total / count, longest) for name, (count, total, longest) in totals.items()]
+        return sorted(rows, key=lambda row: row[2], reverse=True)
+
+    def export_chrome(self, filepath):
+        """写出 Chrome trace-event JSON"""
+        with self._lock:
+            events = list(self.events)
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f, ensure_ascii=False)
+        return len(events)
+
+
+_tracer = Tracer(enabled=bool(os.environ.get('GRADE_TRACE')))
+
+
+def get_tracer():
+    return _tracer
+
+
+def enable():
+    """在运行时启用（命令行工具使用；已按未启用方式装饰的函数不受影响）"""
+    _tracer.enabled = True
+
+
+def span(name, **args):
+    return _tracer.span(name, **args)
+
+
+def traced(name=None, idle=False):
+    """为函数加计时区间的装饰器，未启用时返回原函数
+
+    idle=True 用于界面回调：回调结束后在同一区间内执行 self.root.update_idletasks()，
+    把 Tk 布局计算与挂起的重绘也计入该回调。
+    """
+    def decorate(func):
+        if not _tracer.enabled:
+            return func
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _tracer.span(label):
+                result = func(*args, **kwargs)
+                if idle:
+                    with _tracer.span('Tk 布局与重绘'):
+                        args[0].root.update_idletasks()
+                return result
+        return wrapper
+    return decorate
@@ -0,0 +1,78 @@
+"""批量报告：为每个学期、每名学生生成PDF报告（多进程时用进程池）"""
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from score_engine import ScoreEngine, load_chinese_font
+
+
+# 工作进程内的引擎，由 _init_worker 初始化一次
+_worker_engine = None
+
+
+_worker_chart = False
+
+
+def _init_worker(data, chart):
+    """工作进程初始化：注册字体并还原数据，每个进程只执行一次"""
+    global _worker_engine, _worker_chart
+    load_chinese_font()
+    _worker_engine = ScoreEngine()
+    _worker_engine.load_dict(data)
+    _worker_chart = chart
+
+
+def safe_filename(name):
+    """去掉文件名中的非法字符"""
+    return "".join("_" if ch in '\\/:*?"<>|' else ch for ch in name).strip()
+
+
+def _write_report(task):
+    semester, student, filepath = task
+    _worker_engine.write_report(filepath, semester, student, chart=_worker_chart)
+    return filepath
+
+
+def report_tasks(engine, out_dir, span=None):
+    """按时间线顺序列出 (学期, 学生, 输出路径) 报告任务，span 为学期范围（默认全部）"""
+    store = engine.store
+    tasks = []
+    for semester in store.timeline.select(span):
+        for student in store.students:
+            if not store.has_scores(semester, student):
+                continue
+            name = f"{semester}_{student}.pdf" if len(store.students) > 1 else f"{semester}.pdf"
+            tasks.append((semester, student, os.path.join(out_dir, safe_filename(name))))
+    return tasks
+
+
+def bulk_generate_reports(engine, out_dir, max_workers=None, tasks=None, chart=False):
+    """生成报告，逐个产出进度 (已完成数, 总数, 输出路径, 错误信息)
+
+    max_workers 为 1 时在当前进程中按顺序生成，输出的报告与并行时相同；chart 见 score_report.write_report。
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    if tasks is None:
+        tasks = report_tasks(engine, out_dir)
+    total = len(tasks)
+    if not total:
+        return
+
+    if max_workers == 1:
+        for done, (semester, student, filepath) in enumerate(tasks, 1):
+            try:
+                engine.write_report(filepath, semester, student, chart=chart)
+                yield done, total, filepath, None
+            except Exception as e:
+                yield done, total, filepath, str(e)
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                             initargs=(engine.to_dict(), chart)) as pool:
+        futures = {pool.submit(_write_report, task): task for task in tasks}
+        for done, future in enumerate(as_completed(futures), 1):
+            filepath = futures[future][2]
+            try:
+                future.result()
+                yield done, total, filepath, None
+            except Exception as e:
+                yield done, total, filepath, str(e)
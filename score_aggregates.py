@@ -0,0 +1,190 @@
+"""流式聚合：每个 学科 × 学期（所属年级）分区维护 Welford 统计量与可合并的分位数草图"""
+import math
+
+import numpy as np
+
+
+class RunningStats:
+    """计数/均值/方差（Welford）、最值，以及以半分为桶的稀疏直方图（分位数草图）
+
+    add/remove 为 O(1)；remove 掉当前最值时才按直方图重新确定最值。
+    直方图按 round(分数 × 2) 分桶，分数为整数或 .5 时分位数是精确的，否则误差不超过 0.25 分。
+    两个分区的统计量可以用 merge 无损合并。
+    """
+
+    __slots__ = ('count', 'mean', 'm2', 'min', 'max', 'bins')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.bins = {}
+
+    @classmethod
+    def from_values(cls, values):
+        """由一批分数直接构建（向量化）"""
+        stats = cls()
+        values = np.asarray(values, dtype=np.float64)
+        if not len(values):
+            return stats
+        stats.count = len(values)
+        stats.mean = float(values.mean())
+        stats.m2 = float(((values - stats.mean) ** 2).sum())
+        stats.min = float(values.min())
+        stats.max = float(values.max())
+        keys, counts = np.unique(np.rint(values * 2).astype(np.int64), return_counts=True)
+        stats.bins = dict(zip(keys.tolist(), counts.tolist()))
+        return stats
+
+    # === 增量更新 ===
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        key = round(value * 2)
+        self.bins[key] = self.bins.get(key, 0) + 1
+
+    def remove(self, value):
+        if self.count <= 1:
+            self.__init__()
+            return
+        delta = value - self.mean
+        self.count -= 1
+        self.mean -= delta / self.count
+        self.m2 = max(0.0, self.m2 - delta * (value - self.mean))
+        key = round(value * 2)
+        self.bins[key] -= 1
+        if not self.bins[key]:
+            del self.bins[key]
+            if value <= self.min:
+                self.min = min(self.bins) / 2
+            if value >= self.max:
+                self.max = max(self.bins) / 2
+
+    def merge(self, other):
+        """合并另一分区的统计量（Chan 并行公式），返回新对象"""
+        merged = RunningStats()
+        merged.count = self.count + other.count
+        if not merged.count:
+            return merged
+        delta = other.mean - self.mean
+        merged.mean = self.mean + delta * other.count / merged.count
+        merged.m2 = self.m2 + other.m2 + delta * delta * self.count * other.count / merged.count
+        merged.min = min(self.min, other.min)
+        merged.max = max(self.max, other.max)
+        merged.bins = dict(self.bins)
+        for key, count in other.bins.items():
+            merged.bins[key] = merged.bins.get(key, 0) + count
+        return merged
+
+    # === 查询 ===
+    @property
+    def variance(self):
+        """总体方差"""
+        return self.m2 / self.count if self.count else math.nan
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance) if self.count else math.nan
+
+    def quantile(self, q):
+        """分位数（与 numpy 默认的线性插值一致）"""
+        if not self.count:
+            return math.nan
+        keys = np.array(sorted(self.bins), dtype=np.float64)
+        cumulative = np.cumsum([self.bins[k] for k in sorted(self.bins)])
+        position = q * (self.count - 1)
+        lo, hi = math.floor(position), math.ceil(position)
+        below, above = keys[np.searchsorted(cumulative, [lo, hi], side='right')] / 2
+        return float(below + (above - below) * (position - lo))
+
+    @property
+    def median(self):
+        return self.quantile(0.5)
+
+    def summary(self):
+        """报告与汇总使用的常用指标"""
+        return {
+            'count': self.count,
+            'mean': self.mean if self.count else math.nan,
+            'std': self.std,
+            'min': self.min if self.count else math.nan,
+            'max': self.max if self.count else math.nan,
+            'median': self.median,
+            'p90': self.quantile(0.9)
+        }
+
+
+class AggregateIndex:
+    """ScoreStore 的附属聚合：每个 (学科, 学期) 分区一份 RunningStats，覆盖该学期全部学生
+
+    分区在首次查询时由分数矩阵构建，之后每次写入成绩 O(1) 更新；年级取自学期，
+    按年级或跨学期的查询把对应分区合并即可。
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._parts = {}  # (学科下标, 学期下标) -> RunningStats
+
+    def reset(self):
+        self._parts = {}
+
+    # === 增量维护 ===
+    def set(self, j, t, old, new):
+        """一条成绩写入后更新（old 为被覆盖的旧分数，新录入时为 None）"""
+        stats = self._parts.get((j, t))
+        if stats is None:
+            return
+        if old is not None:
+            stats.remove(old)
+        stats.add(new)
+
+    def set_many(self, j, t, old_present, old, new):
+        """批量写入后更新已构建的分区"""
+        if not self._parts:
+            return
+        for jj, tt, present, old_value, value in zip(j.tolist(), t.tolist(), old_present.tolist(),
+                                                    old.tolist(), new.tolist()):
+            self.set(jj, tt, old_value if present else None, value)
+
+    # === 查询 ===
+    def get(self, subject, semester):
+        """某学科某学期全部学生的统计量"""
+        store = self.store
+        if subject not in store.subject_index or semester not in store.semester_index:
+            return RunningStats()
+        return self._part(store.subject_index[subject], store.semester_index[semester])
+
+    def combine(self, subject, semesters=None, grade=None):
+        """合并某学科在多个学期（默认全部，可按年级筛选）上的分区"""
+        store = self.store
+        merged = RunningStats()
+        if subject not in store.subject_index:
+            return merged
+        j = store.subject_index[subject]
+        names = store.semesters if semesters is None else semesters
+        for name in names:
+            t = store.semester_index[name]
+            if grade is None or store.grades[t] == grade:
+                merged = merged.merge(self._part(j, t))
+        return merged
+
+    def semester_summary(self, semester):
+        """某学期各学科（按录入顺序）的统计指标"""
+        store = self.store
+        t = store.semester_index[semester]
+        return {store.subjects[j]: self._part(j, t).summary() for j in store.semester_subjects[t]}
+
+    def _part(self, j, t):
+        stats = self._parts.get((j, t))
+        if stats is None:
+            store = self.store
+            n_stu = len(store.students)
+            present = store.mask[:n_stu, j, t]
+            stats = self._parts[(j, t)] = RunningStats.from_values(store.scores[:n_stu, j, t][present])
+        return stats
@@ -0,0 +1,171 @@
+"""可复用图表：每种分析模式只创建一个 Figure，切换数据时原地更新图元"""
+import math
+
+import numpy as np
+from matplotlib.artist import setp
+from matplotlib.figure import Figure
+
+from downsample import lttb
+from font_manager import get_font_manager
+
+
+LEVEL_COLORS = ['#55A868', '#4C72B0', '#C44E52', '#8172B2']
+MARKER_LIMIT = 60  # 每条趋势线点数不超过该值时才画圆点标记
+TICK_SPACING = 20  # 趋势图学期刻度标签之间的最小像素间距
+
+
+class SemesterChart:
+    """学期分析图（柱状图 + 等级饼图）"""
+
+    def __init__(self):
+        get_font_manager().apply_matplotlib()
+        self.figure = Figure(figsize=(12, 6))
+        gs = self.figure.add_gridspec(1, 2, width_ratios=[3, 2])
+        self.ax1 = self.figure.add_subplot(gs[0, 0])
+        self.ax2 = self.figure.add_subplot(gs[0, 1])
+        self.figure.subplots_adjust(
+            left=0.08,
+            right=0.95,
+            wspace=0.25,
+            top=0.85
+        )
+        self.bars = None
+        self.subjects = None
+        self.wedges = None
+        self.title = self.ax1.set_title('', pad=20)
+        self.ax2.set_title('成绩等级分布', pad=20)
+
+        # 统计信息
+        self.stats_text = self.ax1.text(
+            x=0.98, y=0.95,
+            s='',
+            transform=self.ax1.transAxes,
+            va='top',
+            ha='right',
+            bbox=dict(
+                boxstyle='round',
+                facecolor='white',
+                alpha=0.8,
+                edgecolor='gray'
+            )
+        )
+
+    def update(self, model):
+        """用新数据原地更新图表，返回 Figure"""
+        self._update_bars(model)
+        self._update_pie(model['levels'])
+        return self.figure
+
+    def _update_bars(self, model):
+        subjects, scores = model['subjects'], model['scores']
+        if subjects == self.subjects:
+            for bar, score in zip(self.bars, scores):
+                bar.set_height(score)
+        else:
+            # 学科变化时只替换柱子与刻度，坐标轴与 Figure 保持不变
+            if self.bars is not None:
+                self.bars.remove()
+            x = np.arange(len(subjects))
+            self.bars = self.ax1.bar(x, scores, color='#4C72B0', alpha=0.8)
+            self.ax1.set_xticks(x, subjects)
+            setp(self.ax1.get_xticklabels(), rotation=30, ha='right')
+            self.ax1.set_xlim(-0.6, len(subjects) - 0.4)
+            self.subjects = list(subjects)
+
+        self.title.set_text(f"{model['semester']}成绩分析")
+        # 自动调整Y轴最大值为最大满分
+        self.ax1.set_ylim(0, model['max_mark'] * 1.15)
+
+        stats = model['stats']
+        self.stats_text.set_text(
+            f'统计指标：\n'
+            f"平均分：{stats['mean']:.1f}\n"
+            f"最高分：{stats['max']}\n"
+            f"最低分：{stats['min']}\n"
+            f"学科数量：{stats['count']}"
+        )
+
+    def _update_pie(self, levels):
+        if self.wedges is None:
+            self.wedges, self.texts, self.autotexts = self.ax2.pie(
+                levels.values(),
+                labels=levels.keys(),
+                autopct='%1.1f%%',
+                colors=LEVEL_COLORS,
+                startangle=90,
+                wedgeprops=dict(width=0.4, edgecolor='w'),
+                pctdistance=0.85
+            )
+            setp(self.autotexts, size=10, weight="bold", color='white')
+            return
+
+        # 与 Axes.pie 相同的几何计算：起始角 90°，逆时针
+        counts = list(levels.values())
+        total = sum(counts)
+        theta1 = 90.0
+        for wedge, label, pct, count in zip(self.wedges, self.texts, self.autotexts, counts):
+            frac = count / total if total else 0.0
+            theta2 = theta1 + 360.0 * frac
+            wedge.set_theta1(theta1)
+            wedge.set_theta2(theta2)
+            mid = math.radians((theta1 + theta2) / 2)
+            x, y = math.cos(mid), math.sin(mid)
+            label.set_position((1.1 * x, 1.1 * y))
+            label.set_horizontalalignment('left' if x > 0 else 'right')
+            pct.set_position((0.85 * x, 0.85 * y))
+            pct.set_text(f'{100 * frac:1.1f}%')
+            theta1 = theta2
+
+
+class TrendChart:
+    """学科成绩趋势图
+
+    downsample=True 用于屏幕显示：每条线点数超过绘图区像素宽度时先用 LTTB 降采样；
+    导出与报告使用默认的完整分辨率。
+    """
+
+    def __init__(self, downsample=False):
+        get_font_manager().apply_matplotlib()
+        self.figure = Figure(figsize=(10, 5))
+        self.ax1 = self.figure.add_subplot(111)
+        self.ax1.set_title('学科成绩趋势分析')
+        self.ax1.set_ylabel('分数')
+        self.lines = {}
+        self.semesters = None
+        self.downsample = downsample
+
+    def max_points(self):
+        """屏幕上每条线保留的点数：绘图区的像素宽度"""
+        return max(3, int(self.ax1.get_window_extent().width))
+
+    def update(self, model):
+        """用新数据原地更新趋势线，返回 Figure"""
+        semesters = model['semesters']
+        position = {sem: i for i, sem in enumerate(semesters)}
+        limit = self.max_points() if self.downsample else None
+
+        for subject in list(self.lines):
+            if subject not in model['series']:
+                self.lines.pop(subject).remove()
+        for subject, (valid_semesters, scores) in model['series'].items():
+            x = np.array([position[sem] for sem in valid_semesters])
+            if limit is not None and len(x) > limit:
+                x, scores = lttb(x, scores, limit)
+            marker = 'o' if len(x) <= MARKER_LIMIT else ''
+            if subject in self.lines:
+                self.lines[subject].set_data(x, scores)
+                self.lines[subject].set_marker(marker)
+            else:
+                self.lines[subject], = self.ax1.plot(x, scores, marker=marker, label=subject)
+
+        self.ax1.relim()
+        self.ax1.autoscale_view()
+        self.ax1.legend()
+        if semesters != self.semesters:
+            # 学期很多时按间隔抽取刻度标签，避免为每个学期排版一个文本
+            step = max(1, math.ceil(len(semesters) / (self.max_points() / TICK_SPACING)))
+            self.ax1.set_xticks(range(0, len(semesters), step), semesters[::step])
+            setp(self.ax1.get_xticklabels(), rotation=45)
+            self.figure.tight_layout()
+            self.semesters = list(semesters)
+        return self.figure
@@ -0,0 +1,339 @@
+import itertools
+import json
+
+import numpy as np
+
+from score_store import ScoreStore, DEFAULT_STUDENT
+from score_levels import LevelClassifier
+from font_manager import get_font_manager
+from score_journal import ScoreJournal, read_entries, replay
+from score_sqlite import SqliteBackend
+from score_snapshot import is_snapshot, snapshot_data, write_snapshot, read_snapshot
+from analysis_cache import AnalysisCache, VersionCounters
+from chart_artifacts import ChartArtifact, render_chart
+from perf_trace import span
+
+
+class ScoreEngine:
+    """成绩分析引擎（统计、等级判定、图表与报告），不依赖 tkinter"""
+
+    def __init__(self):
+        self.grade_subjects = {
+            '七年级': ['语文', '数学', '英语', '政治', '历史', '地理', '生物', '体育'],
+            '八年级': ['语文', '数学', '英语', '物理', '政治', '历史', '地理', '生物', '体育'],
+            '九年级': ['语文', '数学', '英语', '物理', '化学', '历史', '政治', '体育']
+        }
+        self.grade_standards = {
+            '七年级': {'优秀': 90, '良好': 80, '及格': 60},
+            '八年级': {'优秀': 90, '良好': 80, '及格': 60},
+            '九年级': {'优秀': 75, '良好': 60, '及格': 50}
+        }
+        self.store = ScoreStore()
+        self.full_marks = {}
+        self.custom_subjects = {}
+        self.classifier = LevelClassifier(self.full_marks, self.grade_standards, self.store.subjects)
+        # 变更记录目标：ScoreJournal（JSON 存档）或 SqliteBackend（数据库）
+        self.journal = None
+        # 分析结果缓存：每次变更递增相关分区的版本号
+        self.versions = VersionCounters()
+        self.cache = AnalysisCache()
+        # 已布局的图表成品（导出、报告共用），Figure 占用较大，单独限制条目数
+        self.charts = AnalysisCache(maxsize=16)
+
+    # === 数据维护 ===
+    def subjects_for_grade(self, grade):
+        """年级学科（含自定义）"""
+        return self.grade_subjects[grade] + self.custom_subjects.get(grade, [])
+
+    def add_semester(self, semester, grade):
+        self.store.add_semester(semester, grade)
+        self.versions.bump(('semesters',), ('semester', semester))
+        self._record('semester', semester=semester, grade=grade)
+
+    def set_grade(self, semester, grade):
+        if self.store.get_grade(semester) != grade:
+            self.store.set_grade(semester, grade)
+            self.versions.bump(('semester', semester))
+            self._record('grade', semester=semester, grade=grade)
+
+    def add_score(self, semester, subject, score, student=DEFAULT_STUDENT):
+        """写入成绩，超过满分时抛出 ValueError"""
+        full_mark = self.full_marks.get(subject, 100)
+        if score > full_mark:
+            raise ValueError(f"分数不能超过该学科满分值{full_mark}")
+        self.store.set_score(semester, subject, score, student)
+        self.versions.bump(('semester', semester), ('subject', subject))
+        # 默认学生不写 student 字段，与旧版日志格式一致
+        fields = {} if student == DEFAULT_STUDENT else {'student': student}
+        self._record('score', semester=semester, subject=subject, score=score, **fields)
+
+    def add_scores(self, semesters, subjects, scores, student=DEFAULT_STUDENT):
+        """批量写入已校验的成绩（见 score_import），整块一次写入存储与日志
+
+        student 为单个学生名，或与成绩等长的学生名数组。
+        """
+        self.store.set_scores(semesters, subjects, scores, student)
+        self.versions.bump(*[('semester', name) for name in np.unique(semesters).tolist()],
+                           *[('subject', name) for name in np.unique(subjects).tolist()])
+        students = itertools.repeat(student) if isinstance(student, str) else np.asarray(student).tolist()
+        self._record_many('score', ({'semester': semester, 'subject': subject, 'score': score,
+                                     **({} if name == DEFAULT_STUDENT else {'student': name})}
+                                    for semester, subject, score, name in
+                                    zip(np.asarray(semesters).tolist(), np.asarray(subjects).tolist(),
+                                        np.asarray(scores).tolist(), students)))
+
+    def set_full_mark(self, subject, mark):
+        self.full_marks[subject] = mark
+        self.classifier.invalidate(subject)
+        self.versions.bump(('full_marks',))
+        self._record('full_mark', subject=subject, mark=mark)
+
+    def add_custom_subject(self, grade, subject):
+        """为年级添加自定义学科，已存在时抛出 ValueError"""
+        if subject in self.grade_subjects[grade]:
+            raise ValueError("该学科已存在！")
+        self.grade_subjects[grade].append(subject)
+        self.custom_subjects.setdefault(grade, []).append(subject)
+        self.versions.bump(('subjects',))
+        self._record('subject', grade=grade, subject=subject)
+
+    def get_all_subjects(self):
+        """获取所有学科（包括自定义）"""
+        subjects = set()
+        for grade in self.grade_subjects.values():
+            subjects.update(grade)
+        for custom in self.custom_subjects.values():
+            subjects.update(custom)
+        return sorted(subjects)
+
+    # === 数据持久化 ===
+    def to_dict(self):
+        return {
+            "dataset": self.store.to_dict(),
+            "full_marks": self.full_marks,
+            "custom_subjects": self.custom_subjects
+        }
+
+    def load_dict(self, loaded_data):
+        """从存档字典恢复全部状态"""
+        if not all(key in loaded_data for key in ["dataset", "full_marks", "custom_subjects"]):
+            raise ValueError("文件格式不正确")
+
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+        self.store = ScoreStore.from_dict(loaded_data["dataset"])
+        self.full_marks = loaded_data["full_marks"]
+        self.custom_subjects = loaded_data["custom_subjects"]
+        self.classifier = LevelClassifier(self.full_marks, self.grade_standards, self.store.subjects)
+        self.versions.reset()
+        self.cache.clear()
+        self.charts.clear()
+
+    def attach_journal(self, filepath):
+        """绑定存档文件，此后每次变更都追加写入 <存档>.journal"""
+        if self.journal is not None:
+            self.journal.close()
+        self.journal = ScoreJournal(filepath, dump=write_snapshot if is_snapshot(filepath) else None)
+
+    def _record(self, op, **fields):
+        if self.journal is not None:
+            self.journal.append(op, **fields)
+
+    def _record_many(self, op, entries):
+        if self.journal is not None:
+            self.journal.append_many(op, entries)
+
+    def save_json(self, filepath, background=False):
+        """保存存档：写出新快照并清空日志，background=True 时在后台线程写快照"""
+        if self.journal is None or self.journal.path != filepath:
+            self.attach_journal(filepath)
+        data = self.to_dict()
+        # 快照可能在后台线程序列化，这里复制会被界面继续修改的字典
+        data['full_marks'] = dict(self.full_marks)
+        data['custom_subjects'] = {grade: list(subjects) for grade, subjects in self.custom_subjects.items()}
+        with span('写出快照', background=background):
+            return self.journal.compact(data, background=background)
+
+    def load_json(self, filepath):
+        """加载快照并回放其后的日志"""
+        with span('解析 JSON'):
+            with open(filepath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        with span('构建索引'):
+            self.load_dict(data)
+        with span('回放日志'):
+            replay(self, read_entries(filepath))
+
+    def save_snapshot(self, filepath, background=False):
+        """保存为二进制快照并清空日志，background=True 时在后台线程写快照"""
+        if self.journal is None or self.journal.path != filepath:
+            self.attach_journal(filepath)
+        # 覆盖当前映射的快照文件前先把分数矩阵读入内存
+        self.store.detach()
+        return self.journal.compact(snapshot_data(self), background=background)
+
+    def load_snapshot(self, filepath):
+        """以内存映射方式打开二进制快照并回放其后的日志"""
+        with span('映射快照'):
+            store, full_marks, custom_subjects = read_snapshot(filepath)
+        self.load_dict({"dataset": {}, "full_marks": full_marks, "custom_subjects": custom_subjects})
+        self.store = store
+        self.classifier.bind(self.store.subjects)
+        with span('回放日志'):
+            replay(self, read_entries(filepath))
+
+    def save_sqlite(self, filepath):
+        """把完整状态写入 SQLite 数据库，此后的变更直接写入该库"""
+        if not isinstance(self.journal, SqliteBackend) or self.journal.path != filepath:
+            if self.journal is not None:
+                self.journal.close()
+            self.journal = SqliteBackend(filepath)
+        self.journal.save_engine(self)
+
+    def load_sqlite(self, filepath):
+        """从 SQLite 数据库加载，并把后续变更写回该库"""
+        backend = SqliteBackend(filepath)
+        self.load_dict({
+            "dataset": {},
+            "full_marks": backend.full_marks(),
+            "custom_subjects": backend.custom_subjects()
+        })
+        self.store = backend.load_store()
+        self.classifier.bind(self.store.subjects)
+        self.journal = backend
+
+    def save(self, filepath, background=False):
+        """按扩展名保存为 JSON 存档、二进制快照或 SQLite 数据库"""
+        if is_database(filepath):
+            return self.save_sqlite(filepath)
+        if is_snapshot(filepath):
+            return self.save_snapshot(filepath, background=background)
+        return self.save_json(filepath, background=background)
+
+    def load(self, filepath):
+        """按扩展名加载 JSON 存档、二进制快照或 SQLite 数据库；存档与快照加载后绑定日志"""
+        if is_database(filepath):
+            self.load_sqlite(filepath)
+        elif is_snapshot(filepath):
+            self.load_snapshot(filepath)
+            self.attach_journal(filepath)
+        else:
+            self.load_json(filepath)
+            self.attach_journal(filepath)
+
+    # === 统计分析 ===
+    def semester_rows(self, semester, student=DEFAULT_STUDENT):
+        """成绩表格行：(学科, 分数, 满分, 等级)"""
+        key = ('rows', semester, student, self.versions.key(('semester', semester), ('full_marks',)))
+        return self.cache.get(key, lambda: self._semester_rows(semester, student))
+
+    def _semester_rows(self, semester, student):
+        if not self.store.has_scores(semester, student):
+            return []
+        subject_ids, scores = self.store.semester_columns(semester, student)
+        levels = self.classifier.level_names(scores, subject_ids, self.store.get_grade(semester))
+        return [(subject, score, self.full_marks.get(subject, 100), level)
+                for (subject, score), level in zip(self.store.semester_items(semester, student), levels)]
+
+    def semester_model(self, semester):
+        """学期分析所需的全部数据，无成绩时返回 None"""
+        key = ('semester', semester, self.versions.key(('semester', semester), ('full_marks',)))
+        return self.cache.get(key, lambda: self._semester_model(semester))
+
+    def _semester_model(self, semester):
+        if not semester or not self.store.has_scores(semester):
+            return None
+        subject_ids, scores = self.store.semester_columns(semester)
+        subjects = [self.store.subjects[j] for j in subject_ids]
+        grade = self.store.get_grade(semester)
+        return {
+            'semester': semester,
+            'grade': grade,
+            'subjects': subjects,
+            'scores': scores,
+            'max_mark': max(self.full_marks.get(sub, 100) for sub in subjects),
+            'stats': {
+                'mean': float(scores.mean()),
+                'max': scores.max(),
+                'min': scores.min(),
+                'count': len(subjects)
+            },
+            'levels': self.classifier.count(scores, subject_ids, grade)
+        }
+
+    def cohort_model(self, semester):
+        """学期各学科全体学生的统计指标：{学科: {count, mean, std, min, max, median, p90}}"""
+        return self.store.aggregates.semester_summary(semester)
+
+    def ranking(self, semester, subject=None, students=None):
+        """学期排名表（subject 为 None 时按总分；students 为班级名单时只在名单内排名），见 RankIndex.ranking"""
+        return self.store.ranks.ranking(semester, subject, students)
+
+    def student_rank(self, semester, student, subject=None):
+        """某学生的 (名次, 参与排名人数, 百分位)，无成绩时返回 None"""
+        return self.store.ranks.rank_of(semester, student, subject)
+
+    def trend_model(self, subjects, span=None):
+        """趋势分析数据：学期序列与各学科 (有成绩学期, 分数) 序列
+
+        span 为学期范围（见 SemesterTimeline.select），默认全部学期。
+        """
+        subjects = tuple(subjects)
+        key = ('trend', subjects, span,
+               self.versions.key(('semesters',), *[('subject', subject) for subject in subjects]))
+        return self.cache.get(key, lambda: self._trend_model(subjects, span))
+
+    def _trend_model(self, subjects, span):
+        semesters = self.store.timeline.select(span)
+        if not semesters:
+            return {'semesters': [], 'series': {}}
+        first, last = (None, None) if span is None else (semesters[0], semesters[-1])
+        series = {}
+        for subject in subjects:
+            valid_semesters, scores = self.store.subject_series(subject, first=first, last=last)
+            if len(scores):
+                series[subject] = (valid_semesters, scores)
+        return {'semesters': semesters, 'series': series}
+
+    # === 图表 ===
+    def semester_chart(self, semester):
+        """学期分析图成品（数据不变时只布局一次），无成绩时返回 None"""
+        key = ('semester', semester, self.versions.key(('semester', semester), ('full_marks',)))
+        return self.charts.get(key, lambda: self._chart_artifact('semester', self.semester_model(semester)))
+
+    def trend_chart(self, subjects, span=None):
+        """趋势分析图成品（数据不变时只布局一次）"""
+        subjects = tuple(subjects)
+        key = ('trend', subjects, span,
+               self.versions.key(('semesters',), *[('subject', subject) for subject in subjects]))
+        return self.charts.get(key, lambda: self._chart_artifact('trend', self.trend_model(subjects, span)))
+
+    def _chart_artifact(self, kind, model):
+        if model is None:
+            return None
+        return ChartArtifact(kind, model)
+
+    def render_semester_chart(self, model):
+        """绘制学期分析图（柱状图 + 等级饼图），返回新的 Figure"""
+        return render_chart('semester', model)
+
+    def render_trend_chart(self, model):
+        """绘制学科成绩趋势图，返回新的 Figure"""
+        return render_chart('trend', model)
+
+    # === 报告 ===
+    def write_report(self, filepath, semester, student=DEFAULT_STUDENT, roster=None, chart=False):
+        """生成学期PDF报告（自动分页；roster、chart 为是否附全体名单与分析图，见 score_report.write_report）"""
+        from score_report import write_report
+
+        write_report(self, filepath, semester, student, roster, chart)
+
+
+def is_database(filepath):
+    return filepath.lower().endswith(('.db', '.sqlite'))
+
+
+def load_chinese_font():
+    """注册报告使用的中文字体（每个进程只解析一次）"""
+    return get_font_manager().reportlab_font()
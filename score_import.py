@@ -0,0 +1,180 @@
+"""批量导入成绩：分块流式读取 CSV/XLSX，按块向量化校验，整块提交
+
+表头需包含 学期、学科、分数 三列，可选 年级 列（用于新建学期）与 学生 列（为空时记为默认学生）。
+"""
+import csv
+import itertools
+
+import numpy as np
+
+from score_store import DEFAULT_STUDENT
+
+
+COLUMNS = {
+    '学期': 'semester', 'semester': 'semester',
+    '学科': 'subject', 'subject': 'subject',
+    '分数': 'score', 'score': 'score',
+    '年级': 'grade', 'grade': 'grade',
+    '学生': 'student', '姓名': 'student', 'student': 'student'
+}
+REQUIRED = {'semester': '学期', 'subject': '学科', 'score': '分数'}
+DEFAULT_GRADE = '七年级'
+CHUNK_SIZE = 50000
+MAX_ERRORS = 200  # 保留的错误明细条数，其余只计数
+
+
+def iter_rows(filepath):
+    """逐行读取 CSV 或 XLSX（只读模式），第一行为表头"""
+    if filepath.lower().endswith(('.xlsx', '.xlsm')):
+        try:
+            from openpyxl import load_workbook
+        except ImportError:
+            raise ValueError("读取 XLSX 文件需要安装 openpyxl")
+        workbook = load_workbook(filepath, read_only=True, data_only=True)
+        try:
+            for row in workbook.active.iter_rows(values_only=True):
+                yield ['' if value is None else str(value) for value in row]
+        finally:
+            workbook.close()
+    else:
+        with open(filepath, 'r', encoding='utf-8-sig', newline='') as f:
+            yield from csv.reader(f)
+
+
+class ScoreImporter:
+    """成绩导入器：持有开始导入时的学科、满分与学期年级副本，可在后台线程中运行"""
+
+    def __init__(self, engine, chunk_size=CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.full_marks = dict(engine.full_marks)
+        self.grade_subjects = {grade: set(engine.subjects_for_grade(grade)) for grade in engine.grade_subjects}
+        self.semester_grades = dict(zip(engine.store.semesters, engine.store.grades))
+        self.imported = 0
+        self.error_count = 0
+        self.errors = []
+
+    def chunks(self, filepath):
+        """按块生成校验后的成绩（见 validate），同时累计错误"""
+        rows = iter_rows(filepath)
+        header = next(rows, None)
+        if header is None:
+            raise ValueError("文件为空")
+        fields = {}
+        for k, name in enumerate(header):
+            key = COLUMNS.get(str(name).strip().lower() if name is not None else '')
+            if key is not None and key not in fields:
+                fields[key] = k
+        missing = [name for key, name in REQUIRED.items() if key not in fields]
+        if missing:
+            raise ValueError(f"缺少列：{'、'.join(missing)}")
+
+        line = 2
+        while True:
+            block = list(itertools.islice(rows, self.chunk_size))
+            if not block:
+                return
+            chunk = self.validate(block, fields, line)
+            line += len(block)
+            if len(chunk['score']):
+                yield chunk
+
+    def validate(self, block, fields, first_line):
+        """向量化校验一块原始行，返回 {'semesters': [(新学期, 年级)], 'semester', 'subject', 'score', 'student'}"""
+        # 按列转置为定长 Unicode 数组，后续比较、去重都在 numpy 中完成
+        transposed = list(itertools.zip_longest(*block, fillvalue=''))
+
+        def column(key):
+            k = fields.get(key)
+            if k is None or k >= len(transposed):
+                return np.full(len(block), '', dtype=str)
+            return np.char.strip(np.array(transposed[k], dtype=str))
+
+        semesters, subjects, grades = column('semester'), column('subject'), column('grade')
+        scores = _numbers(column('score'))
+
+        # 每个学期的年级：已有学期取其年级，新学期取本块中首次给出的年级
+        sem_names, sem_inv = np.unique(semesters, return_inverse=True)
+        given = grades != ''
+        given_names, given_first = np.unique(semesters[given], return_index=True)
+        given_grades = dict(zip(given_names, grades[given][given_first]))
+        sem_grades = []
+        for name in sem_names:
+            grade = self.semester_grades.get(name)
+            if grade is None:
+                grade = given_grades.get(name, DEFAULT_GRADE)
+                if grade not in self.grade_subjects:
+                    grade = None
+            sem_grades.append(str(grade or ''))
+        row_grades = np.array(sem_grades, dtype=str)[sem_inv]
+
+        # 学科是否属于学期所在年级、是否超过满分：按 (年级, 学科) 去重后查表
+        sub_names, sub_inv = np.unique(subjects, return_inverse=True)
+        full = np.array([self.full_marks.get(name, 100) for name in sub_names], dtype=np.float64)[sub_inv]
+        grade_names, grade_inv = np.unique(row_grades, return_inverse=True)
+        allowed = np.array([[name in self.grade_subjects.get(grade, ()) for name in sub_names]
+                            for grade in grade_names], dtype=bool).reshape(len(grade_names), len(sub_names))
+
+        checks = [
+            ((semesters == '') | (subjects == ''), "学期或学科为空"),
+            (row_grades == '', "年级无效"),
+            ((grades != '') & (grades != row_grades), "年级与学期不符"),
+            (np.isnan(scores) | (scores < 0), "分数无效"),
+            (scores > full, "分数超过该学科满分值"),
+            (~allowed[grade_inv, sub_inv], "学科不属于该年级")
+        ]
+        # 每行只记录第一条未通过的检查
+        reason = np.full(len(block), -1)
+        for code, (failed, _) in enumerate(checks):
+            reason[failed & (reason < 0)] = code
+        bad = np.flatnonzero(reason >= 0)
+        self.error_count += len(bad)
+        for k in bad[:max(0, MAX_ERRORS - len(self.errors))]:
+            self.errors.append(f"第{first_line + k}行：{checks[reason[k]][1]}")
+
+        good = reason < 0
+        new_semesters = []
+        used = set(np.unique(semesters[good]).tolist())
+        for name, grade in zip(sem_names.tolist(), sem_grades):
+            if name in used and name not in self.semester_grades:
+                self.semester_grades[name] = grade
+                new_semesters.append((name, grade))
+        self.imported += int(good.sum())
+        students = column('student')[good]
+        return {
+            'semesters': new_semesters,
+            'semester': semesters[good],
+            'subject': subjects[good],
+            'score': scores[good],
+            'student': np.where(students == '', DEFAULT_STUDENT, students)
+        }
+
+
+def apply_chunk(engine, chunk):
+    """把一块校验后的成绩整体写入引擎（在界面线程中调用）"""
+    for name, grade in chunk['semesters']:
+        if name not in engine.store:
+            engine.add_semester(name, grade)
+    engine.add_scores(chunk['semester'], chunk['subject'], chunk['score'], chunk['student'])
+
+
+def import_file(engine, filepath, chunk_size=CHUNK_SIZE):
+    """同步导入整个文件，返回导入器（含导入条数与错误）"""
+    importer = ScoreImporter(engine, chunk_size)
+    for chunk in importer.chunks(filepath):
+        apply_chunk(engine, chunk)
+    return importer
+
+
+def _numbers(values):
+    """字符串数组转分数，无法解析的记为 NaN"""
+    try:
+        return values.astype(np.float64)
+    except ValueError:
+        return np.array([_number(value) for value in values.tolist()], dtype=np.float64)
+
+
+def _number(value):
+    try:
+        return float(value)
+    except ValueError:
+        return np.nan
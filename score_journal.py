@@ -0,0 +1,132 @@
+"""追加式变更日志：快照文件 + 日志回放，保存时在后台压缩为新快照"""
+import json
+import os
+import threading
+
+from score_store import DEFAULT_STUDENT
+
+
+class ScoreJournal:
+    """绑定到一个存档文件的预写日志
+
+    <存档>.journal      快照之后的全部变更，每行一条紧凑 JSON
+    <存档>.journal.old  压缩进行中被轮换出的日志，压缩完成后删除
+
+    dump(data, 路径) 负责写出快照文件，默认写 JSON。
+    """
+
+    def __init__(self, path, fsync=True, dump=None):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.old_path = path + ".journal.old"
+        self.fsync = fsync
+        self.dump = dump or dump_json
+        self._file = open(self.journal_path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+        self._compactor = None
+
+    def append(self, op, **fields):
+        """追加一条变更记录"""
+        fields['op'] = op
+        line = json.dumps(fields, ensure_ascii=False, separators=(',', ':'))
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+
+    def append_many(self, op, entries):
+        """批量追加同一类变更，只写入并同步一次"""
+        lines = "".join(json.dumps(dict(fields, op=op), ensure_ascii=False, separators=(',', ':')) + "\n"
+                        for fields in entries)
+        with self._lock:
+            self._file.write(lines)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+
+    @property
+    def compacting(self):
+        return self._compactor is not None and self._compactor.is_alive()
+
+    def compact(self, data, background=True):
+        """把当前状态写成新快照并清空日志
+
+        data 为调用线程中生成的完整存档数据，调用方之后不得再修改它；
+        先轮换日志，之后的变更写入新日志，后台线程只负责序列化与替换文件。
+        """
+        if self.compacting:
+            return self._compactor
+        with self._lock:
+            self._file.close()
+            if os.path.exists(self.old_path):
+                # 上次压缩未完成：把当前日志接到旧日志之后，一并由新快照取代
+                with open(self.old_path, 'a', encoding='utf-8') as old, \
+                        open(self.journal_path, 'r', encoding='utf-8') as current:
+                    old.write(current.read())
+                os.remove(self.journal_path)
+            else:
+                os.replace(self.journal_path, self.old_path)
+            self._file = open(self.journal_path, 'a', encoding='utf-8')
+        def write_snapshot():
+            tmp_path = self.path + ".tmp"
+            self.dump(data, tmp_path)
+            os.replace(tmp_path, self.path)
+            os.remove(self.old_path)
+
+        if not background:
+            write_snapshot()
+            return None
+        self._compactor = threading.Thread(target=write_snapshot)
+        self._compactor.start()
+        return self._compactor
+
+    def close(self):
+        if self._compactor is not None:
+            self._compactor.join()
+        with self._lock:
+            self._file.close()
+
+
+def dump_json(data, filepath):
+    """写出 JSON 快照"""
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def read_entries(path):
+    """按顺序读取快照之后的全部日志记录（末尾写了一半的行会被忽略）"""
+    entries = []
+    for journal_path in (path + ".journal.old", path + ".journal"):
+        if not os.path.exists(journal_path):
+            continue
+        with open(journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break
+    return entries
+
+
+def replay(engine, entries):
+    """把日志记录依次应用到引擎（不再次写日志）"""
+    store = engine.store
+    for entry in entries:
+        op = entry['op']
+        if op == 'semester':
+            store.add_semester(entry['semester'], entry['grade'])
+        elif op == 'grade':
+            store.set_grade(entry['semester'], entry['grade'])
+        elif op == 'score':
+            store.set_score(entry['semester'], entry['subject'], entry['score'],
+                            entry.get('student', DEFAULT_STUDENT))
+        elif op == 'full_mark':
+            engine.full_marks[entry['subject']] = entry['mark']
+            engine.classifier.invalidate(entry['subject'])
+        elif op == 'subject':
+            if entry['subject'] not in engine.grade_subjects[entry['grade']]:
+                engine.grade_subjects[entry['grade']].append(entry['subject'])
+                engine.custom_subjects.setdefault(entry['grade'], []).append(entry['subject'])
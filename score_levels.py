@@ -0,0 +1,67 @@
+import numpy as np
+
+
+LEVELS = ('优秀', '良好', '及格', '不及格')
+DEFAULT_STANDARD = {'优秀': 90, '良好': 80, '及格': 60}
+# 成绩在 ScoreStore 中以 float32 保存，阈值与分数统一按 float32 比较：
+# 否则满分 99 时 79.2 分（恰为 80%）的 float32 值略小于 float64 阈值 79.2，会被判低一级
+DTYPE = np.float32
+
+
+class LevelClassifier:
+    """批量等级判定（按年级标准与学科满分预计算阈值表）"""
+
+    def __init__(self, full_marks, grade_standards, subjects):
+        self.full_marks = full_marks
+        self.grade_standards = grade_standards
+        self.subjects = subjects
+        # 年级 -> (学科数, 3) 阈值表，列依次为优秀/良好/及格分数线
+        self._tables = {}
+
+    def bind(self, subjects):
+        """切换到新的学科名称字典（加载数据后调用）"""
+        self.subjects = subjects
+        self._tables.clear()
+
+    def invalidate(self, subject):
+        """某学科满分变化后，仅重算该学科在各年级阈值表中的一行"""
+        if subject not in self.subjects:
+            return
+        j = self.subjects.index(subject)
+        for grade, table in self._tables.items():
+            if j < len(table):
+                table[j] = self._row(subject, grade)
+
+    def _row(self, subject, grade):
+        standard = self.grade_standards.get(grade, DEFAULT_STANDARD)
+        full_mark = self.full_marks.get(subject, 100)
+        return [full_mark * standard[level] / 100 for level in LEVELS[:3]]
+
+    def thresholds(self, grade):
+        """返回覆盖当前全部学科的阈值表，新学科按需追加"""
+        table = self._tables.get(grade)
+        n = len(self.subjects)
+        if table is None or len(table) < n:
+            old = 0 if table is None else len(table)
+            rows = [self._row(subject, grade) for subject in self.subjects[old:n]]
+            new_rows = np.array(rows, dtype=DTYPE).reshape(-1, 3)
+            table = new_rows if table is None else np.vstack([table, new_rows])
+            self._tables[grade] = table
+        return table
+
+    def classify(self, scores, subject_ids, grade):
+        """一次判定整批成绩，返回 LEVELS 下标数组（0=优秀 … 3=不及格）"""
+        scores = np.asarray(scores, dtype=DTYPE)
+        subject_ids = np.asarray(subject_ids, dtype=np.intp)
+        passed = scores[:, None] >= self.thresholds(grade)[subject_ids]
+        return (3 - passed.sum(axis=1)).astype(np.int8)
+
+    def count(self, scores, subject_ids, grade):
+        """统计整批成绩的等级分布"""
+        codes = self.classify(scores, subject_ids, grade)
+        counts = np.bincount(codes, minlength=len(LEVELS))
+        return dict(zip(LEVELS, counts.tolist()))
+
+    def level_names(self, scores, subject_ids, grade):
+        """判定整批成绩并返回等级名称列表"""
+        return [LEVELS[code] for code in self.classify(scores, subject_ids, grade)]
@@ -0,0 +1,161 @@
+"""班级排名：每个学期（即该年级的全体学生）按学科与总分的名次和百分位
+
+名次为竞赛排名（同分同名次，下一名次跳过，如 1、2、2、4），百分位为
+（低于本人的人数 + 0.5 × 同分人数）/ 总人数 × 100。
+"""
+import numpy as np
+
+
+TOTAL = None  # 分区中表示总分的学科下标
+
+
+class RankPart:
+    """一个 (学科或总分, 学期) 分区：按学生下标排列的分数与名次，以及升序排列的分数"""
+
+    __slots__ = ('values', 'ranks', 'sorted')
+
+    def __init__(self, values):
+        """由按学生下标排列的分数构建（缺失为 nan），argsort 一次得到全部名次"""
+        self.values = np.asarray(values, dtype=np.float64)
+        self.ranks = np.zeros(len(self.values), dtype=np.int64)
+        present = np.flatnonzero(~np.isnan(self.values))
+        scores = self.values[present]
+        order = np.argsort(-scores, kind='stable')
+        ordered = scores[order]
+        # 降序排列后，每个位置的名次为其分数首次出现的位置 + 1
+        first = np.ones(len(ordered), dtype=bool)
+        first[1:] = ordered[1:] != ordered[:-1]
+        positions = np.where(first, np.arange(len(ordered)), 0)
+        self.ranks[present[order]] = np.maximum.accumulate(positions) + 1
+        self.sorted = ordered[::-1].copy()
+
+    def __len__(self):
+        return len(self.sorted)
+
+    def update(self, s, old, new):
+        """学生 s 的分数由 old 变为 new（nan 表示无成绩），O(n) 向量化调整其他学生的名次，无需重新排序"""
+        present = ~np.isnan(self.values)
+        present[s] = False
+        others = self.values[present]
+        # 名次 = 1 + 分数高于本人的人数；只有 old 或 new 跨过某人的分数时其名次才变化
+        delta = np.zeros(len(others), dtype=np.int64)
+        if not np.isnan(new):
+            delta += new > others
+        if not np.isnan(old):
+            delta -= old > others
+        self.ranks[present] += delta
+
+        if not np.isnan(old):
+            self.sorted = np.delete(self.sorted, np.searchsorted(self.sorted, old))
+        if not np.isnan(new):
+            self.sorted = np.insert(self.sorted, np.searchsorted(self.sorted, new), new)
+            self.ranks[s] = self.rank(new)
+        else:
+            self.ranks[s] = 0
+        self.values[s] = new
+
+    def rank(self, value):
+        return len(self.sorted) - np.searchsorted(self.sorted, value, side='right') + 1
+
+    def percentiles(self, values):
+        """一组分数在本分区中的百分位（向量化）"""
+        below = np.searchsorted(self.sorted, values, side='left')
+        equal = np.searchsorted(self.sorted, values, side='right') - below
+        return (below + 0.5 * equal) / max(len(self.sorted), 1) * 100
+
+
+class RankIndex:
+    """ScoreStore 的附属排名索引
+
+    分区在首次查询时构建，之后单条成绩写入只调整受影响的学科分区与总分分区；
+    批量写入或新增学生时丢弃相关分区，下次查询重建。
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._parts = {}  # (学科下标或 TOTAL, 学期下标) -> RankPart
+
+    def reset(self):
+        self._parts = {}
+
+    # === 增量维护 ===
+    def set(self, s, j, t, old, new):
+        """一条成绩写入后更新（old 为被覆盖的旧分数，新录入时为 None）"""
+        old = np.nan if old is None else old
+        part = self._fresh(j, t)
+        if part is not None:
+            part.update(s, old, new)
+        total = self._fresh(TOTAL, t)
+        if total is not None:
+            old_total = total.values[s]
+            base = 0.0 if np.isnan(old_total) else old_total - (0.0 if np.isnan(old) else old)
+            total.update(s, old_total, base + new)
+
+    def set_many(self, t):
+        """批量写入后丢弃涉及学期的分区"""
+        stale = set(np.asarray(t).tolist())
+        self._parts = {key: part for key, part in self._parts.items() if key[1] not in stale}
+
+    def _fresh(self, j, t):
+        """已构建且学生数未变化的分区（学生数变化时丢弃）"""
+        part = self._parts.get((j, t))
+        if part is not None and len(part.values) != len(self.store.students):
+            del self._parts[(j, t)]
+            return None
+        return part
+
+    # === 查询 ===
+    def ranking(self, semester, subject=None, students=None):
+        """某学期按名次排列的排名表：{'students', 'scores', 'ranks', 'percentiles'}
+
+        subject 为 None 时按该学期各学科总分排名；students 为学生名单（如一个班）时只在名单内排名。
+        """
+        store = self.store
+        t = store.semester_index[semester]
+        j = TOTAL if subject is None else store.subject_index.get(subject)
+        if j is None and subject is not None:
+            return {'students': [], 'scores': np.empty(0), 'ranks': np.empty(0, dtype=np.int64),
+                    'percentiles': np.empty(0)}
+        part = self._part(j, t)
+        if students is not None:
+            rows = np.array([store.student_index[name] for name in students if name in store.student_index],
+                            dtype=np.intp)
+            part = RankPart(part.values[rows])
+        else:
+            rows = np.arange(len(part.values))
+        present = np.flatnonzero(part.ranks)
+        order = present[np.lexsort((present, part.ranks[present]))]
+        scores = part.values[order]
+        return {
+            'students': [store.students[rows[i]] for i in order],
+            'scores': scores,
+            'ranks': part.ranks[order],
+            'percentiles': part.percentiles(scores)
+        }
+
+    def rank_of(self, semester, student, subject=None):
+        """某学生在学期中的 (名次, 参与排名人数, 百分位)，无成绩时返回 None"""
+        store = self.store
+        if student not in store.student_index or (subject is not None and subject not in store.subject_index):
+            return None
+        j = TOTAL if subject is None else store.subject_index[subject]
+        part = self._part(j, store.semester_index[semester])
+        s = store.student_index[student]
+        if not part.ranks[s]:
+            return None
+        return int(part.ranks[s]), len(part), float(part.percentiles(part.values[s]))
+
+    def _part(self, j, t):
+        part = self._fresh(j, t)
+        if part is None:
+            store = self.store
+            n_stu = len(store.students)
+            if j is TOTAL:
+                ids = store.semester_subjects[t]
+                present = store.mask[:n_stu, ids, t]
+                totals = np.where(present, store.scores[:n_stu, ids, t], 0).sum(axis=1, dtype=np.float64)
+                values = np.where(present.any(axis=1), totals, np.nan)
+            else:
+                values = np.where(store.mask[:n_stu, j, t], store.scores[:n_stu, j, t], np.nan)
+            part = self._parts[(j, t)] = RankPart(values)
+        return part
@@ -0,0 +1,168 @@
+"""学期PDF报告：用 platypus 排版，自动分页并在每页重复表头
+
+正文按需从生成器取出（LazyDocTemplate），学生名单按块生成小表格，排版时持有的 flowable 数量不随学生数增长。
+注意这不是逐页写盘：reportlab 在 save 时才写出整个文件，此前全部页面内容都保存在内存中，
+内存占用随页数线性增长（1 万名学生约 260 页，见 benchmarks/bench_report_memory.py）。
+"""
+from datetime import datetime
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from perf_trace import span
+from score_store import DEFAULT_STUDENT
+
+
+MARGIN = 50
+LOOKAHEAD = 4       # 排版队列中最多预取的 flowable 数
+ROSTER_ROWS = 60    # 名单每个表格块的行数（跨页时自动拆分并重复表头）
+HEADER_COLOR = colors.HexColor('#4C72B0')
+
+
+class LazyDocTemplate(SimpleDocTemplate):
+    """从可迭代对象按需取出 flowable 的文档模板
+
+    SimpleDocTemplate.build 需要完整列表；这里先放入少量元素，
+    每处理一个 flowable 前（filterFlowables 钩子）再从迭代器补足 LOOKAHEAD 个。
+    只限制 Python 端的 flowable 数量，已排好的页面仍留在内存中直到保存。
+    """
+
+    def build_from(self, flowables, **kwargs):
+        self._pending = iter(flowables)
+        self._queue = []
+        self._refill()
+        if self._queue:
+            self.build(self._queue, **kwargs)
+
+    def _refill(self):
+        while len(self._queue) < LOOKAHEAD:
+            item = next(self._pending, None)
+            if item is None:
+                break
+            self._queue.append(item)
+
+    def filterFlowables(self, flowables):
+        # 换页时模板内部也会用另一个列表调用此钩子，只补充正文队列
+        if flowables is self._queue:
+            self._refill()
+
+
+def write_report(engine, filepath, semester, student=DEFAULT_STUDENT, roster=None, chart=False):
+    """生成学期PDF报告
+
+    roster 为是否附上全体学生成绩名单，默认在有多名学生时为默认学生的报告附上；
+    chart 为是否在默认学生的报告中嵌入学期分析图（与界面导出共用同一图表成品）：
+    False 不嵌入，True 嵌入 PNG，'vector' 嵌入矢量图形（较慢，适合批量输出）。
+    """
+    from score_engine import load_chinese_font
+
+    with span('加载字体'):
+        font = load_chinese_font()
+    if roster is None:
+        roster = student == DEFAULT_STUDENT and len(engine.store.students) > 1
+
+    doc = LazyDocTemplate(filepath, pagesize=A4, leftMargin=MARGIN, rightMargin=MARGIN,
+                          topMargin=MARGIN, bottomMargin=MARGIN,
+                          title=f"{semester}成绩分析报告")
+
+    def footer(canvas, doc):
+        canvas.saveState()
+        canvas.setFont(font, 9)
+        canvas.drawCentredString(A4[0] / 2, MARGIN / 2, f"第 {doc.page} 页")
+        canvas.restoreState()
+
+    with span('报告排版', roster=roster):
+        doc.build_from(_story(engine, semester, student, roster, chart, font, doc.width),
+                       onFirstPage=footer, onLaterPages=footer)
+
+
+def _story(engine, semester, student, roster, chart, font, width):
+    """按顺序产出报告正文"""
+    store = engine.store
+    title = ParagraphStyle('title', fontName=font, fontSize=16, leading=22, spaceAfter=18)
+    body = ParagraphStyle('body', fontName=font, fontSize=12, leading=18, spaceAfter=8)
+    heading = ParagraphStyle('heading', fontName=font, fontSize=12, leading=18, spaceBefore=18, spaceAfter=8)
+
+    # 标题与基本信息
+    yield Paragraph(f"{semester}成绩分析报告", title)
+    yield Paragraph(f"年级：{store.get_grade(semester)}", body)
+    if student != DEFAULT_STUDENT:
+        yield Paragraph(f"学生：{student}", body)
+    rank = engine.student_rank(semester, student)
+    if rank and rank[1] > 1:
+        yield Paragraph(f"总分名次：{rank[0]}/{rank[1]}（百分位 {rank[2]:.1f}）", body)
+    yield Paragraph(f"生成时间：{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", body)
+    yield Spacer(1, 12)
+
+    # 数据表格（有上一学期时附上分数变化）
+    previous = store.timeline.previous(semester)
+    last_scores = dict(store.semester_items(previous, student)) if previous else {}
+    data = [["学科", "分数", "满分", "等级", "较上学期"]]
+    for subj, score, full, level in engine.semester_rows(semester, student):
+        change = f"{score - last_scores[subj]:+.1f}" if subj in last_scores else "-"
+        data.append([subj, str(score), str(full), level, change])
+    yield _table(data, [100, 60, 60, 60, 70], font, header_size=12)
+
+    # 学期分析图（学期分析只针对默认学生）
+    artifact = engine.semester_chart(semester) if chart and student == DEFAULT_STUDENT else None
+    if artifact is not None:
+        with span('图表嵌入', vector=chart == 'vector'):
+            figure = artifact.flowable(width, vector=chart == 'vector')
+        yield Spacer(1, 12)
+        yield figure
+
+    # 多名学生时附上全体统计（来自流式聚合，无需重新扫描成绩）
+    cohort = engine.cohort_model(semester)
+    if any(stats['count'] > 1 for stats in cohort.values()):
+        yield Paragraph("全体学生统计", heading)
+        data = [["学科", "人数", "平均分", "标准差", "中位数", "P90"]]
+        for subj, stats in cohort.items():
+            data.append([subj, str(stats['count'])] +
+                        [f"{stats[key]:.1f}" for key in ('mean', 'std', 'median', 'p90')])
+        yield _table(data, [100, 50, 60, 60, 60, 60], font)
+
+    if roster:
+        yield from _roster(store, semester, font, width, heading)
+
+
+def _roster(store, semester, font, width, heading):
+    """全体学生成绩名单：逐块读取成绩，每块生成一个表格"""
+    t = store.semester_index[semester]
+    subjects = [store.subjects[j] for j in store.semester_subjects[t]]
+    header = ["学生"] + subjects + ["平均分"]
+    name_width = 90
+    col_width = (width - name_width) / (len(subjects) + 1)
+    col_widths = [name_width] + [col_width] * (len(subjects) + 1)
+
+    first = True
+    for names, scores, present in store.semester_roster(semester):
+        if first:
+            yield Paragraph("学生成绩名单", heading)
+            first = False
+        for start in range(0, len(names), ROSTER_ROWS):
+            data = [header]
+            for i in range(start, min(start + ROSTER_ROWS, len(names))):
+                row_scores = scores[i][present[i]]
+                data.append([names[i]] +
+                            [f"{score:.1f}" if ok else "-" for score, ok in zip(scores[i], present[i])] +
+                            [f"{row_scores.mean():.1f}"])
+            yield _table(data, col_widths, font, font_size=9)
+
+
+def _table(data, col_widths, font, font_size=10, header_size=None):
+    """统一样式的表格；repeatRows=1 使跨页拆分后的每一页都带表头"""
+    table = Table(data, colWidths=col_widths, repeatRows=1)
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), HEADER_COLOR),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, -1), font),
+        ('FONTSIZE', (0, 0), (-1, -1), font_size),
+        ('FONTSIZE', (0, 0), (-1, 0), header_size or font_size),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12 if header_size else 6),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.HexColor('#F3F6FA'), colors.white]),
+        ('GRID', (0, 0), (-1, -1), 1 if header_size else 0.5, colors.grey)
+    ]))
+    return table
@@ -0,0 +1,101 @@
+"""学科时间序列索引：每个 (学生, 学科) 一条按学期顺序排列的成绩序列，随录入增量维护"""
+import bisect
+
+import numpy as np
+
+from semester_timeline import semester_key
+
+
+class SeriesIndex:
+    """ScoreStore 的附属索引
+
+    序列在首次查询时由分数矩阵构建（加载大文件后不必立即扫描），
+    之后 set/set_many 只把变化插入已构建的序列；趋势查询直接返回现成的数组。
+    学期顺序取自 store.timeline。
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._sorted_ids = None  # 按时间线顺序排列的学期下标数组（构建序列时使用）
+        self._sorted_version = None
+        self._series = {}  # (学生下标, 学科下标) -> [键列表, 学期名列表, 分数列表, 缓存的查询结果或 None]
+        self._used = None  # 出现过成绩的学科下标
+
+    def reset(self):
+        """数据整体替换后丢弃全部索引"""
+        self._sorted_ids = None
+        self._series = {}
+        self._used = None
+
+    # === 增量维护 ===
+    def set(self, s, j, t, score):
+        """写入一条成绩后更新索引"""
+        if self._used is not None:
+            self._used.add(j)
+        entry = self._series.get((s, j))
+        if entry is None:
+            return
+        keys, names, values = entry[0], entry[1], entry[2]
+        key = semester_key(self.store.semesters[t])
+        pos = bisect.bisect_left(keys, key)
+        if pos < len(keys) and keys[pos] == key:
+            values[pos] = score
+        else:
+            keys.insert(pos, key)
+            names.insert(pos, key[-1])
+            values.insert(pos, score)
+        entry[3] = None
+
+    def set_many(self, s, j, t, scores):
+        """批量写入后更新索引，只处理已构建的序列（s 为学生下标或与 j 等长的数组）"""
+        if self._used is not None:
+            self._used.update(np.unique(j).tolist())
+        if not self._series:
+            return
+        s = np.broadcast_to(s, np.shape(j))
+        for ss, jj, tt, score in zip(s.tolist(), j.tolist(), t.tolist(), np.asarray(scores).tolist()):
+            if (ss, jj) in self._series:
+                self.set(ss, jj, tt, score)
+
+    # === 查询 ===
+    def series(self, subject, student, first=None, last=None):
+        """返回 (有成绩的学期名列表, float32 分数数组)，学期按时间线排列
+
+        first/last 为学期名时只返回两者之间（含两端）的部分，用 bisect 截取。
+        """
+        store = self.store
+        if subject not in store.subject_index or student not in store.student_index:
+            return [], np.zeros(0, dtype=np.float32)
+        s, j = store.student_index[student], store.subject_index[subject]
+        entry = self._series.get((s, j))
+        if entry is None:
+            entry = self._series[(s, j)] = self._build(s, j)
+        if entry[3] is None:
+            # 返回副本，调用方保存的结果不会随后续录入改变
+            entry[3] = (list(entry[1]), np.array(entry[2], dtype=np.float32))
+        if first is None and last is None:
+            return entry[3]
+        start = 0 if first is None else bisect.bisect_left(entry[0], semester_key(first))
+        stop = len(entry[0]) if last is None else bisect.bisect_right(entry[0], semester_key(last))
+        return entry[3][0][start:stop], entry[3][1][start:stop]
+
+    def used_subjects(self):
+        """所有学期中出现过成绩的学科下标（升序）"""
+        if self._used is None:
+            store = self.store
+            n_stu, n_sub, n_sem = len(store.students), len(store.subjects), len(store.semesters)
+            present = store.mask[:n_stu, :n_sub, :n_sem].any(axis=(0, 2))
+            self._used = set(np.flatnonzero(present).tolist())
+        return sorted(self._used)
+
+    def _build(self, s, j):
+        """由分数矩阵构建一条序列：按时间线顺序取下标后一次性筛选"""
+        store = self.store
+        keys = store.timeline.keys()
+        if self._sorted_ids is None or self._sorted_version != store.timeline.version:
+            self._sorted_ids = np.array([store.semester_index[key[-1]] for key in keys], dtype=np.intp)
+            self._sorted_version = store.timeline.version
+        positions = np.flatnonzero(store.mask[s, j, self._sorted_ids])
+        picked = [keys[p] for p in positions.tolist()]
+        values = store.scores[s, j, self._sorted_ids[positions]].tolist()
+        return [picked, [key[-1] for key in picked], values, None]
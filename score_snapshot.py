@@ -0,0 +1,100 @@
+"""二进制快照：JSON 头（名称字典与列偏移）+ 定长 float32 分数列，通过 numpy.memmap 打开
+
+文件布局：
+    前缀   magic(8) + 版本(uint32) + 头长度(uint32) + 数据区偏移(uint64)
+    头     UTF-8 JSON：学期/学科/学生名称、年级、学期学科顺序、满分、自定义学科、列描述
+    数据区 按 64 字节对齐，依次存放 scores(float32) 与 mask(bool)，形状为 学生 × 学科 × 学期，
+           C 顺序，即每个 (学生, 学科) 的全部学期成绩是一段连续的列
+"""
+import json
+import os
+import struct
+
+import numpy as np
+
+from score_store import ScoreStore
+
+
+SNAPSHOT_EXT = '.gsnap'
+MAGIC = b'GRADESNP'
+VERSION = 1
+ALIGN = 64
+_PREFIX = struct.Struct('<8sIIQ')
+
+
+def is_snapshot(filepath):
+    return filepath.lower().endswith(SNAPSHOT_EXT)
+
+
+def snapshot_data(engine):
+    """在调用线程中复制出写快照所需的全部数据，之后可交给后台线程写出"""
+    store = engine.store
+    n_stu, n_sub, n_sem = len(store.students), len(store.subjects), len(store.semesters)
+    return {
+        'header': {
+            'semesters': list(store.semesters),
+            'grades': list(store.grades),
+            'subjects': list(store.subjects),
+            'students': list(store.students),
+            'semester_subjects': [[int(j) for j in ids] for ids in store.semester_subjects],
+            'full_marks': dict(engine.full_marks),
+            'custom_subjects': {grade: list(subjects) for grade, subjects in engine.custom_subjects.items()}
+        },
+        'scores': np.array(store.scores[:n_stu, :n_sub, :n_sem], dtype='<f4', order='C'),
+        'mask': np.array(store.mask[:n_stu, :n_sub, :n_sem], dtype=bool, order='C')
+    }
+
+
+def write_snapshot(data, filepath):
+    """写出快照文件（由 snapshot_data 生成的数据）"""
+    scores, mask = data['scores'], data['mask']
+    header = dict(data['header'])
+    header['shape'] = list(scores.shape)
+    header['columns'] = {
+        'scores': {'offset': 0, 'dtype': '<f4'},
+        'mask': {'offset': _align(scores.nbytes), 'dtype': '|b1'}
+    }
+    header_bytes = json.dumps(header, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    data_offset = _align(_PREFIX.size + len(header_bytes))
+
+    with open(filepath, 'wb') as f:
+        f.write(_PREFIX.pack(MAGIC, VERSION, len(header_bytes), data_offset))
+        f.write(header_bytes)
+        f.write(b'\0' * (data_offset - f.tell()))
+        f.write(scores.tobytes())
+        f.write(b'\0' * (data_offset + header['columns']['mask']['offset'] - f.tell()))
+        f.write(mask.tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def read_snapshot(filepath):
+    """打开快照，返回 (store, full_marks, custom_subjects)
+
+    分数列以写时复制方式映射：加载只解析文件头，分数页在首次访问时才读入，
+    之后对成绩的修改只发生在内存中，不会改动快照文件。
+    """
+    with open(filepath, 'rb') as f:
+        magic, version, header_len, data_offset = _PREFIX.unpack(f.read(_PREFIX.size))
+        if magic != MAGIC:
+            raise ValueError("文件格式不正确")
+        if version > VERSION:
+            raise ValueError(f"不支持的快照版本：{version}")
+        header = json.loads(f.read(header_len).decode('utf-8'))
+
+    shape = tuple(header['shape'])
+    columns = {}
+    for name, column in header['columns'].items():
+        if 0 in shape:
+            columns[name] = np.zeros(shape, dtype=column['dtype'])
+        else:
+            columns[name] = np.memmap(filepath, dtype=column['dtype'], mode='c',
+                                      offset=data_offset + column['offset'], shape=shape)
+
+    store = ScoreStore.from_arrays(header['semesters'], header['grades'], header['subjects'], header['students'],
+                                  header['semester_subjects'], columns['scores'], columns['mask'])
+    return store, header['full_marks'], header['custom_subjects']
+
+
+def _align(n):
+    return -(-n // ALIGN) * ALIGN
@@ -0,0 +1,229 @@
+"""SQLite 存储后端：规范化表结构 + 索引，WAL 模式，批量事务写入"""
+import sqlite3
+from contextlib import contextmanager
+
+import numpy as np
+
+from score_store import ScoreStore, DEFAULT_STUDENT
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS semester (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    grade TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS subject (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS student (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS score (
+    semester_id INTEGER NOT NULL REFERENCES semester(id),
+    subject_id INTEGER NOT NULL REFERENCES subject(id),
+    student_id INTEGER NOT NULL REFERENCES student(id),
+    score REAL NOT NULL,
+    seq INTEGER NOT NULL,
+    PRIMARY KEY (semester_id, subject_id, student_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_score_subject_semester ON score (subject_id, semester_id);
+CREATE INDEX IF NOT EXISTS idx_score_student_semester ON score (student_id, semester_id);
+CREATE TABLE IF NOT EXISTS full_mark (
+    subject TEXT PRIMARY KEY,
+    mark INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS custom_subject (
+    grade TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (grade, subject)
+);
+"""
+
+
+class SqliteBackend:
+    """成绩数据库；可作为引擎的变更记录目标（与 ScoreJournal 接口一致）"""
+
+    def __init__(self, path):
+        self.path = path
+        # 自动提交模式，事务由 batch() 显式控制
+        self.conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+        self._depth = 0
+        self._ids = {'semester': {}, 'subject': {}, 'student': {}}
+        row = self.conn.execute("SELECT COALESCE(MAX(seq), 0) FROM score").fetchone()
+        self._seq = row[0]
+
+    # === 事务 ===
+    @contextmanager
+    def batch(self):
+        """批量事务：块内全部写入一次提交，可嵌套"""
+        if self._depth == 0:
+            self.conn.execute("BEGIN")
+        self._depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._depth -= 1
+            if self._depth == 0:
+                self.conn.rollback()
+            raise
+        self._depth -= 1
+        if self._depth == 0:
+            self.conn.commit()
+
+    def _id(self, table, name, grade=None):
+        """名称 -> 主键（按需插入，带缓存）"""
+        cache = self._ids[table]
+        if name not in cache:
+            row = self.conn.execute(f"SELECT id FROM {table} WHERE name = ?", (name,)).fetchone()
+            if row is None:
+                if table == 'semester':
+                    cur = self.conn.execute("INSERT INTO semester (name, grade) VALUES (?, ?)", (name, grade))
+                else:
+                    cur = self.conn.execute(f"INSERT INTO {table} (name) VALUES (?)", (name,))
+                row = (cur.lastrowid,)
+            cache[name] = row[0]
+        return cache[name]
+
+    # === 写入 ===
+    def append(self, op, **fields):
+        """记录一条变更（与 ScoreJournal.append 相同的操作名）"""
+        if op == 'semester':
+            self._id('semester', fields['semester'], fields['grade'])
+        elif op == 'grade':
+            self.conn.execute("UPDATE semester SET grade = ? WHERE name = ?", (fields['grade'], fields['semester']))
+        elif op == 'score':
+            self.write_scores([(fields['semester'], fields['subject'], fields.get('student', DEFAULT_STUDENT),
+                                fields['score'])])
+        elif op == 'full_mark':
+            self.conn.execute("INSERT OR REPLACE INTO full_mark (subject, mark) VALUES (?, ?)",
+                              (fields['subject'], fields['mark']))
+        elif op == 'subject':
+            self.conn.execute(
+                "INSERT OR IGNORE INTO custom_subject (grade, subject, position) "
+                "SELECT ?, ?, COUNT(*) FROM custom_subject WHERE grade = ?",
+                (fields['grade'], fields['subject'], fields['grade']))
+
+    def append_many(self, op, entries):
+        """批量记录同一类变更（单个事务）"""
+        with self.batch():
+            if op == 'score':
+                self._write_scores((fields['semester'], fields['subject'], fields.get('student', DEFAULT_STUDENT),
+                                    fields['score']) for fields in entries)
+            else:
+                for fields in entries:
+                    self.append(op, **fields)
+
+    def write_scores(self, rows):
+        """批量写入 [(学期, 学科, 学生, 分数)]，已有成绩保留原录入顺序"""
+        with self.batch():
+            self._write_scores(rows)
+
+    def _write_scores(self, rows):
+        params = []
+        for semester, subject, student, score in rows:
+            self._seq += 1
+            params.append((self._id('semester', semester), self._id('subject', subject),
+                           self._id('student', student), float(score), self._seq))
+        self.conn.executemany(
+            "INSERT INTO score (semester_id, subject_id, student_id, score, seq) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (semester_id, subject_id, student_id) DO UPDATE SET score = excluded.score",
+            params)
+
+    def save_engine(self, engine):
+        """用引擎的完整状态覆盖数据库（单个事务）"""
+        store = engine.store
+        with self.batch():
+            for table in ('score', 'semester', 'subject', 'student', 'full_mark', 'custom_subject'):
+                self.conn.execute(f"DELETE FROM {table}")
+            self._ids = {'semester': {}, 'subject': {}, 'student': {}}
+            self.conn.executemany("INSERT INTO semester (id, name, grade) VALUES (?, ?, ?)",
+                                  [(t + 1, name, store.grades[t]) for t, name in enumerate(store.semesters)])
+            self.conn.executemany("INSERT INTO subject (id, name) VALUES (?, ?)",
+                                  [(j + 1, name) for j, name in enumerate(store.subjects)])
+            self.conn.executemany("INSERT INTO student (id, name) VALUES (?, ?)",
+                                  [(s + 1, name) for s, name in enumerate(store.students)])
+
+            # seq 按学期内的学科录入顺序编号，加载时据此还原顺序
+            n_stu, n_sub, n_sem = len(store.students), len(store.subjects), len(store.semesters)
+            order = np.zeros((n_sub, n_sem), dtype=np.int64)
+            for t, subject_ids in enumerate(store.semester_subjects):
+                order[subject_ids, t] = np.arange(len(subject_ids))
+            s, j, t = np.nonzero(store.mask[:n_stu, :n_sub, :n_sem])
+            seq = t.astype(np.int64) * n_sub + order[j, t]
+            self.conn.executemany(
+                "INSERT INTO score (semester_id, subject_id, student_id, score, seq) VALUES (?, ?, ?, ?, ?)",
+                zip((t + 1).tolist(), (j + 1).tolist(), (s + 1).tolist(),
+                    store.scores[s, j, t].astype(float).tolist(), seq.tolist()))
+            self._seq = int(seq.max()) if len(seq) else 0
+
+            self.conn.executemany("INSERT INTO full_mark (subject, mark) VALUES (?, ?)", engine.full_marks.items())
+            self.conn.executemany("INSERT INTO custom_subject (grade, subject, position) VALUES (?, ?, ?)",
+                                  [(grade, subject, k) for grade, subjects in engine.custom_subjects.items()
+                                   for k, subject in enumerate(subjects)])
+
+    # === 读取 ===
+    def load_store(self):
+        """一次查询构建列式存储"""
+        semesters = self.conn.execute("SELECT id, name, grade FROM semester ORDER BY id").fetchall()
+        subjects = self.conn.execute("SELECT id, name FROM subject ORDER BY id").fetchall()
+        students = self.conn.execute("SELECT id, name FROM student ORDER BY id").fetchall()
+        rows = self.conn.execute(
+            "SELECT semester_id, subject_id, student_id, score FROM score ORDER BY seq").fetchall()
+
+        def index_of(records):
+            lookup = np.zeros(max((r[0] for r in records), default=0) + 1, dtype=np.intp)
+            lookup[[r[0] for r in records]] = np.arange(len(records))
+            return lookup
+
+        columns = np.array(rows, dtype=np.float64).reshape(-1, 4)
+        return ScoreStore.from_columns(
+            [r[1] for r in semesters], [r[2] for r in semesters],
+            [r[1] for r in subjects], [r[1] for r in students],
+            index_of(semesters)[columns[:, 0].astype(np.intp)],
+            index_of(subjects)[columns[:, 1].astype(np.intp)],
+            index_of(students)[columns[:, 2].astype(np.intp)],
+            columns[:, 3])
+
+    def full_marks(self):
+        return dict(self.conn.execute("SELECT subject, mark FROM full_mark").fetchall())
+
+    def custom_subjects(self):
+        custom = {}
+        for grade, subject in self.conn.execute(
+                "SELECT grade, subject FROM custom_subject ORDER BY grade, position"):
+            custom.setdefault(grade, []).append(subject)
+        return custom
+
+    def subject_series(self, subject, student=DEFAULT_STUDENT):
+        """按学期顺序查询某学科成绩（走 (subject, semester) 索引）"""
+        return self.conn.execute(
+            "SELECT semester.name, score.score FROM score "
+            "JOIN semester ON semester.id = score.semester_id "
+            "WHERE score.subject_id = (SELECT id FROM subject WHERE name = ?) "
+            "AND score.student_id = (SELECT id FROM student WHERE name = ?) "
+            "ORDER BY score.semester_id", (subject, student)).fetchall()
+
+    def student_scores(self, student, semester):
+        """查询某学生某学期的全部成绩（走 (student, semester) 索引）"""
+        return self.conn.execute(
+            "SELECT subject.name, score.score FROM score "
+            "JOIN subject ON subject.id = score.subject_id "
+            "WHERE score.student_id = (SELECT id FROM student WHERE name = ?) "
+            "AND score.semester_id = (SELECT id FROM semester WHERE name = ?) "
+            "ORDER BY score.seq", (student, semester)).fetchall()
+
+    # === 与 ScoreJournal 一致的接口 ===
+    def compact(self, data=None, background=False):
+        """把 WAL 合并回主库文件"""
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self):
+        self.conn.close()
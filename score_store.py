@@ -0,0 +1,323 @@
+import numpy as np
+
+from score_series import SeriesIndex
+from score_aggregates import AggregateIndex
+from score_ranking import RankIndex
+from semester_timeline import SemesterTimeline
+
+
+DEFAULT_STUDENT = '默认学生'
+
+
+class ScoreStore:
+    """列式成绩存储（学生 × 学科 × 学期，float32 分数 + 缺失值掩码）"""
+
+    def __init__(self):
+        # 学期、学科、学生的名称字典（名称 <-> 下标）
+        self.semesters = []
+        self.semester_index = {}
+        self.subjects = []
+        self.subject_index = {}
+        self.students = []
+        self.student_index = {}
+
+        # 每个学期的年级与学科录入顺序（学科下标列表）
+        self.grades = []
+        self.semester_subjects = []
+
+        # 分数矩阵与掩码，按容量倍增扩展
+        self.scores = np.zeros((1, 8, 4), dtype=np.float32)
+        self.mask = np.zeros((1, 8, 4), dtype=bool)
+
+        # 学期时间线与按学科的时间序列索引（趋势分析、报告使用）
+        self.timeline = SemesterTimeline(self)
+        self.series = SeriesIndex(self)
+        # 学科 × 学期的流式统计（均值、方差、分位数）
+        self.aggregates = AggregateIndex(self)
+        # 学科与总分的班级名次（单条成绩写入时增量调整）
+        self.ranks = RankIndex(self)
+
+        self.add_student(DEFAULT_STUDENT)
+
+    # === 名称字典 ===
+    def __len__(self):
+        return len(self.semesters)
+
+    def __contains__(self, semester):
+        return semester in self.semester_index
+
+    def _grow(self, axis, needed):
+        """按需倍增矩阵容量"""
+        capacity = self.scores.shape[axis]
+        if needed <= capacity:
+            return
+        shape = list(self.scores.shape)
+        shape[axis] = max(needed, capacity * 2)
+        scores = np.zeros(shape, dtype=np.float32)
+        mask = np.zeros(shape, dtype=bool)
+        s, j, t = self.scores.shape
+        scores[:s, :j, :t] = self.scores
+        mask[:s, :j, :t] = self.mask
+        self.scores, self.mask = scores, mask
+
+    def add_semester(self, name, grade='七年级'):
+        """新增学期并返回下标"""
+        if name in self.semester_index:
+            return self.semester_index[name]
+        idx = len(self.semesters)
+        self._grow(2, idx + 1)
+        self.semesters.append(name)
+        self.semester_index[name] = idx
+        self.grades.append(grade)
+        self.semester_subjects.append([])
+        self.timeline.add(name)
+        return idx
+
+    def add_subject(self, name):
+        """登记学科并返回下标"""
+        if name in self.subject_index:
+            return self.subject_index[name]
+        idx = len(self.subjects)
+        self._grow(1, idx + 1)
+        self.subjects.append(name)
+        self.subject_index[name] = idx
+        return idx
+
+    def add_student(self, name):
+        """登记学生并返回下标"""
+        if name in self.student_index:
+            return self.student_index[name]
+        idx = len(self.students)
+        self._grow(0, idx + 1)
+        self.students.append(name)
+        self.student_index[name] = idx
+        return idx
+
+    def get_grade(self, semester):
+        return self.grades[self.semester_index[semester]]
+
+    def set_grade(self, semester, grade):
+        self.grades[self.semester_index[semester]] = grade
+
+    # === 读写成绩 ===
+    def set_score(self, semester, subject, score, student=DEFAULT_STUDENT):
+        """写入一条成绩（同学期同学科覆盖旧值）"""
+        t = self.semester_index[semester]
+        j = self.add_subject(subject)
+        s = self.add_student(student)
+        old = float(self.scores[s, j, t]) if self.mask[s, j, t] else None
+        self.scores[s, j, t] = score
+        self.mask[s, j, t] = True
+        if j not in self.semester_subjects[t]:
+            self.semester_subjects[t].append(j)
+        self.series.set(s, j, t, score)
+        self.aggregates.set(j, t, old, float(self.scores[s, j, t]))
+        self.ranks.set(s, j, t, old, float(self.scores[s, j, t]))
+
+    def set_scores(self, semesters, subjects, scores, student=DEFAULT_STUDENT):
+        """批量写入成绩列（学期与学科需为同长度数组，学期必须已存在）；重复的 (学生, 学期, 学科) 以最后一行为准
+
+        student 为单个学生名，或与成绩等长的学生名数组。
+        """
+        if not len(scores):
+            return
+        sem_names, sem_inv = np.unique(semesters, return_inverse=True)
+        t = np.array([self.semester_index[name] for name in sem_names.tolist()], dtype=np.intp)[sem_inv]
+        sub_names, sub_inv = np.unique(subjects, return_inverse=True)
+        j = np.array([self.add_subject(name) for name in sub_names.tolist()], dtype=np.intp)[sub_inv]
+        if isinstance(student, str):
+            s = np.full(len(t), self.add_student(student), dtype=np.intp)
+        else:
+            stu_names, stu_inv = np.unique(student, return_inverse=True)
+            s = np.array([self.add_student(name) for name in stu_names.tolist()], dtype=np.intp)[stu_inv]
+
+        keys = (s * len(self.subjects) + j) * len(self.semesters) + t
+        _, last = np.unique(keys[::-1], return_index=True)
+        last = len(keys) - 1 - last
+        sl, jl, tl, new = s[last], j[last], t[last], np.asarray(scores)[last]
+        old_present, old = self.mask[sl, jl, tl], self.scores[sl, jl, tl]
+        self.scores[sl, jl, tl] = new
+        self.mask[sl, jl, tl] = True
+        self.series.set_many(sl, jl, tl, new)
+        self.aggregates.set_many(jl, tl, old_present, old, self.scores[sl, jl, tl])
+        self.ranks.set_many(tl)
+
+        # 新出现的学科按首次出现的顺序追加到学期学科列表
+        _, first = np.unique(t * len(self.subjects) + j, return_index=True)
+        for row in np.sort(first):
+            if j[row] not in self.semester_subjects[t[row]]:
+                self.semester_subjects[t[row]].append(int(j[row]))
+
+    def has_scores(self, semester, student=DEFAULT_STUDENT):
+        t = self.semester_index[semester]
+        s = self.student_index[student]
+        return bool(self.mask[s, :len(self.subjects), t].any())
+
+    def semester_subject_names(self, semester):
+        """按录入顺序返回某学期录入过成绩的学科（任一学生），不做统计"""
+        return [self.subjects[j] for j in self.semester_subjects[self.semester_index[semester]]]
+
+    def semester_columns(self, semester, student=DEFAULT_STUDENT):
+        """按录入顺序返回某学期的 (学科下标数组, 分数数组)"""
+        t = self.semester_index[semester]
+        s = self.student_index[student]
+        ids = np.array([j for j in self.semester_subjects[t] if self.mask[s, j, t]], dtype=np.intp)
+        return ids, self.scores[s, ids, t]
+
+    def semester_scores(self, semester, student=DEFAULT_STUDENT):
+        """按录入顺序返回某学期的 (学科列表, 分数数组)"""
+        ids, scores = self.semester_columns(semester, student)
+        return [self.subjects[j] for j in ids], scores
+
+    def semester_items(self, semester, student=DEFAULT_STUDENT):
+        """按录入顺序返回某学期的 [(学科, 分数)]，分数为 Python float"""
+        subjects, scores = self.semester_scores(semester, student)
+        return [(subject, _to_float(score)) for subject, score in zip(subjects, scores)]
+
+    def semester_roster(self, semester, chunk=500):
+        """按学生分块产出某学期的 (学生名列表, 分数矩阵, 掩码矩阵)，列为该学期的学科录入顺序
+
+        只包含该学期有成绩的学生；每块最多 chunk 名，调用方无需一次持有整个名单。
+        """
+        t = self.semester_index[semester]
+        ids = np.asarray(self.semester_subjects[t], dtype=np.intp)
+        n_stu = len(self.students)
+        for start in range(0, n_stu, chunk):
+            stop = min(start + chunk, n_stu)
+            present = self.mask[start:stop, ids, t]
+            rows = np.flatnonzero(present.any(axis=1))
+            if len(rows):
+                yield ([self.students[start + r] for r in rows],
+                       self.scores[start:stop, ids, t][rows], present[rows])
+
+    def used_subjects(self):
+        """所有学期中出现过成绩的学科"""
+        return [self.subjects[j] for j in self.series.used_subjects()]
+
+    def ordered_semesters(self):
+        """按时间线顺序排列的学期名（增量维护，不再每次排序）"""
+        return self.timeline.names()
+
+    def subject_series(self, subject, student=DEFAULT_STUDENT, first=None, last=None):
+        """返回某学科按时间线顺序的 (有成绩的学期, 分数数组)，可限定 first～last 范围"""
+        return self.series.series(subject, student, first, last)
+
+    # === 兼容字典视图（仅用于保存/加载） ===
+    def to_dict(self):
+        """导出为旧版 dataset 字典结构；默认学生以外的成绩放在各学期的 'students' 中"""
+        s = self.student_index[DEFAULT_STUDENT]
+        dataset = {}
+        for t, name in enumerate(self.semesters):
+            ids = [j for j in self.semester_subjects[t] if self.mask[s, j, t]]
+            dataset[name] = {
+                'grade': self.grades[t],
+                'scores': {self.subjects[j]: _to_float(self.scores[s, j, t]) for j in ids},
+                'subjects': [self.subjects[j] for j in ids]
+            }
+            students = {}
+            subjects = [self.subjects[j] for j in self.semester_subjects[t]]
+            for names, scores, present in self.semester_roster(name):
+                for student, row, row_present in zip(names, scores, present.tolist()):
+                    if student != DEFAULT_STUDENT:
+                        students[student] = {subject: _to_float(score) for subject, score, ok in
+                                             zip(subjects, row, row_present) if ok}
+            if students:
+                dataset[name]['students'] = students
+        return dataset
+
+    @classmethod
+    def from_dict(cls, dataset):
+        """从旧版 dataset 字典结构构建
+
+        默认学生的成绩在各学期的 'scores' 中（旧版格式），其他学生在 'students' 中；
+        全部成绩先收集为列，每个单元格只写入一次，最后整体写入矩阵。
+        """
+        store = cls()
+        columns = ([], [], [], [])
+
+        def collect(s, t, subject, score):
+            j = store.add_subject(subject)
+            if j not in store.semester_subjects[t]:
+                store.semester_subjects[t].append(j)
+            for column, value in zip(columns, (s, j, t, score)):
+                column.append(value)
+
+        default = store.student_index[DEFAULT_STUDENT]
+        for name, data in dataset.items():
+            t = store.add_semester(name, data.get('grade', '七年级'))
+            if DEFAULT_STUDENT in data.get('students', {}):
+                continue  # 默认学生也有学生记录时以学生记录为准，不再读取旧版结构
+            scores = data.get('scores', {})
+            # 先按 subjects 顺序，再补齐只出现在 scores 中的学科
+            ordered = [subject for subject in data.get('subjects', []) if subject in scores] + list(scores)
+            for subject in dict.fromkeys(ordered):
+                collect(default, t, subject, scores[subject])
+
+        for name, data in dataset.items():
+            t = store.semester_index[name]
+            for student, scores in data.get('students', {}).items():
+                s = store.add_student(student)
+                for subject, score in scores.items():
+                    collect(s, t, subject, score)
+
+        if columns[0]:
+            s, j, t = (np.array(column, dtype=np.intp) for column in columns[:3])
+            store.scores[s, j, t] = columns[3]
+            store.mask[s, j, t] = True
+        return store
+
+    @classmethod
+    def from_columns(cls, semesters, grades, subjects, students, semester_ids, subject_ids, student_ids, scores):
+        """由名称字典与按录入顺序排列的成绩列批量构建（下标指向各名称列表）"""
+        store = cls()
+        semester_map = np.array([store.add_semester(name, grade) for name, grade in zip(semesters, grades)],
+                                dtype=np.intp)
+        subject_map = np.array([store.add_subject(name) for name in subjects], dtype=np.intp)
+        student_map = np.array([store.add_student(name) for name in students], dtype=np.intp)
+
+        semester_ids = semester_map[np.asarray(semester_ids, dtype=np.intp)]
+        subject_ids = subject_map[np.asarray(subject_ids, dtype=np.intp)]
+        student_ids = student_map[np.asarray(student_ids, dtype=np.intp)]
+        store.scores[student_ids, subject_ids, semester_ids] = scores
+        store.mask[student_ids, subject_ids, semester_ids] = True
+        store.series.reset()
+        store.aggregates.reset()
+        store.ranks.reset()
+
+        # 每个学期的学科顺序取该学科在本学期首次出现的位置
+        keys = semester_ids * len(store.subjects) + subject_ids
+        _, first = np.unique(keys, return_index=True)
+        for row in np.sort(first):
+            store.semester_subjects[semester_ids[row]].append(int(subject_ids[row]))
+        return store
+
+    @classmethod
+    def from_arrays(cls, semesters, grades, subjects, students, semester_subjects, scores, mask):
+        """直接采用已有的分数矩阵与掩码（如快照的内存映射），不复制数据"""
+        store = cls()
+        store.semesters = list(semesters)
+        store.semester_index = {name: t for t, name in enumerate(store.semesters)}
+        store.subjects = list(subjects)
+        store.subject_index = {name: j for j, name in enumerate(store.subjects)}
+        store.students = list(students)
+        store.student_index = {name: s for s, name in enumerate(store.students)}
+        store.grades = list(grades)
+        store.semester_subjects = [list(ids) for ids in semester_subjects]
+        store.scores, store.mask = scores, mask
+        store.add_student(DEFAULT_STUDENT)
+        store.timeline.reset()
+        store.series.reset()
+        store.aggregates.reset()
+        store.ranks.reset()
+        return store
+
+    def detach(self):
+        """把内存映射的矩阵复制到内存，释放对快照文件的占用（覆盖写同一文件前调用）"""
+        if isinstance(self.scores, np.memmap):
+            self.scores = np.array(self.scores)
+            self.mask = np.array(self.mask)
+
+
+def _to_float(value):
+    """float32 转回最短十进制表示，避免 85.3 变成 85.30000305"""
+    return float(str(value))
@@ -0,0 +1,138 @@
+"""学期时间线：把学期名解析为 (起始年份, 学期序号) 并保持有序，支持按位置与学年的范围查询"""
+import bisect
+import re
+
+
+CN_DIGITS = {'一': 1, '二': 2, '三': 3, '四': 4, '五': 5, '六': 6, '七': 7, '八': 8, '九': 9, '十': 10}
+
+# "2025-2026 第1学期"、"2025-2026学年 第二学期"、"2025 第3学期"
+_NUMBERED = re.compile(r'(\d{4})(?:\s*[-~—至]\s*\d{4})?\D*?第\s*(\d+|[一二三四五六七八九十]+)\s*学期')
+# "2025-2026 上学期"、"2025 下"
+_HALF = re.compile(r'(\d{4})(?:\s*[-~—至]\s*\d{4})?\s*(?:学年)?\s*([上下])')
+# "2025年秋季"、"2026春"：秋季属于当年开始的学年，春季属于上一年开始的学年
+_SEASON = re.compile(r'(\d{4})\s*年?\s*([春秋])')
+
+
+def parse_semester(name):
+    """解析学期名，返回 (起始年份, 学期序号)，无法识别时返回 None"""
+    match = _NUMBERED.search(name)
+    if match:
+        term = match.group(2)
+        return int(match.group(1)), int(term) if term.isdigit() else _cn_number(term)
+    match = _HALF.search(name)
+    if match:
+        return int(match.group(1)), 1 if match.group(2) == '上' else 2
+    match = _SEASON.search(name)
+    if match:
+        year = int(match.group(1))
+        return (year, 1) if match.group(2) == '秋' else (year - 1, 2)
+    return None
+
+
+def semester_key(name):
+    """排序键：可解析的学期按 (年份, 序号) 排在前面，其余按名称排在最后"""
+    parsed = parse_semester(name)
+    if parsed is None:
+        return 1, 0, 0, name
+    return 0, parsed[0], parsed[1], name
+
+
+class SemesterTimeline:
+    """有序学期时间线，随 add 增量维护（bisect 插入），查询不再排序
+
+    首次使用时由 store 的学期列表构建；version 在每次变化时递增，供依赖顺序的缓存判断是否失效。
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._keys = None
+        self._names = None  # 全部学期名的缓存
+        self.version = 0
+
+    def reset(self):
+        self._keys = None
+        self._names = None
+        self.version += 1
+
+    def add(self, name):
+        if self._keys is not None:
+            bisect.insort(self._keys, semester_key(name))
+            self._names = None
+            self.version += 1
+
+    def keys(self):
+        """排好序的排序键列表（键的最后一项为学期名）"""
+        if self._keys is None:
+            self._keys = sorted(semester_key(name) for name in self.store.semesters)
+        return self._keys
+
+    def __len__(self):
+        return len(self.store.semesters)
+
+    # === 查询 ===
+    def names(self, start=0, stop=None):
+        if start == 0 and stop is None:
+            if self._names is None:
+                self._names = [key[-1] for key in self.keys()]
+            return list(self._names)
+        return [key[-1] for key in self.keys()[start:stop]]
+
+    def position(self, name):
+        """学期在时间线中的位置"""
+        keys = self.keys()
+        pos = bisect.bisect_left(keys, semester_key(name))
+        if pos == len(keys) or keys[pos][-1] != name:
+            raise KeyError(name)
+        return pos
+
+    def last(self, n):
+        """最近 n 个学期"""
+        return self.names(max(0, len(self) - n))
+
+    def previous(self, name):
+        """上一个学期，没有时返回 None"""
+        pos = self.position(name)
+        return self.keys()[pos - 1][-1] if pos > 0 else None
+
+    def academic_year(self, year):
+        """某学年（起始年份为 year）的全部学期"""
+        keys = self.keys()
+        return [key[-1] for key in keys[bisect.bisect_left(keys, (0, year)):bisect.bisect_left(keys, (0, year + 1))]]
+
+    def between(self, first, last):
+        """first 与 last 之间（含两端）的学期"""
+        return self.names(self.position(first), self.position(last) + 1)
+
+    def academic_years(self):
+        """出现过的学年起始年份（升序）"""
+        years = []
+        for key in self.keys():
+            if key[0] == 0 and (not years or years[-1] != key[1]):
+                years.append(key[1])
+        return years
+
+    def select(self, spec):
+        """按范围描述选取学期：None/'all' 全部、('last', n)、('year', 起始年份)、('between', 首, 尾)"""
+        if spec is None or spec == 'all':
+            return self.names()
+        kind = spec[0]
+        if kind == 'last':
+            return self.last(spec[1])
+        if kind == 'year':
+            return self.academic_year(spec[1])
+        if kind == 'between':
+            return self.between(spec[1], spec[2])
+        raise ValueError(f"未知的学期范围：{spec}")
+
+
+def _cn_number(text):
+    """一 … 十九 形式的中文数字"""
+    if text == '十':
+        return 10
+    if text.startswith('十'):
+        return 10 + CN_DIGITS[text[1]]
+    if text.endswith('十'):
+        return CN_DIGITS[text[0]] * 10
+    if '十' in text:
+        return CN_DIGITS[text[0]] * 10 + CN_DIGITS[text[2]]
+    return CN_DIGITS[text]
@@ -0,0 +1,5 @@
+"""pytest 公共设置：各模块平铺在仓库根目录，测试前把根目录加入模块搜索路径"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,76 @@
+"""AnalysisCache 与 VersionCounters：按分区版本号精确失效"""
+from analysis_cache import AnalysisCache, VersionCounters
+from score_engine import ScoreEngine
+
+SEMESTER = "2024-2025 第1学期"
+OTHER = "2024-2025 第2学期"
+
+
+def make_engine():
+    engine = ScoreEngine()
+    for name in (SEMESTER, OTHER):
+        engine.add_semester(name, '七年级')
+        engine.add_score(name, '语文', 80.0)
+        engine.add_score(name, '数学', 90.0)
+    return engine
+
+
+def test_version_key_tracks_only_listed_partitions():
+    versions = VersionCounters()
+    key = versions.key(('semester', SEMESTER))
+    versions.bump(('semester', OTHER))
+    assert versions.key(('semester', SEMESTER)) == key
+    versions.bump(('semester', SEMESTER))
+    assert versions.key(('semester', SEMESTER)) != key
+    # reset 递增 epoch：计数归零后也不会与旧键重合
+    versions.reset()
+    assert versions.key(('semester', SEMESTER)) != key
+
+
+def test_lru_evicts_least_recently_used():
+    cache = AnalysisCache(maxsize=2)
+    cache.get(('a',), lambda: 1)
+    cache.get(('b',), lambda: 2)
+    cache.get(('a',), lambda: 0)
+    cache.get(('c',), lambda: 3)
+    assert list(cache.entries) == [('a',), ('c',)]
+    assert (cache.hits, cache.misses, cache.evictions) == (1, 3, 1)
+
+
+def test_edit_invalidates_only_that_semester():
+    engine = make_engine()
+    model, other = engine.semester_model(SEMESTER), engine.semester_model(OTHER)
+    assert engine.semester_model(SEMESTER) is model
+
+    engine.add_score(SEMESTER, '语文', 60.0)
+    assert engine.semester_model(OTHER) is other
+    updated = engine.semester_model(SEMESTER)
+    assert updated is not model
+    assert dict(zip(updated['subjects'], updated['scores']))['语文'] == 60.0
+
+
+def test_full_mark_change_invalidates_every_semester():
+    engine = make_engine()
+    rows = engine.semester_rows(SEMESTER)
+    other = engine.semester_rows(OTHER)
+    engine.set_full_mark('语文', 150)
+    assert engine.semester_rows(SEMESTER) is not rows
+    assert engine.semester_rows(OTHER) is not other
+    assert engine.semester_rows(SEMESTER)[0][2] == 150
+
+
+def test_trend_depends_on_its_subjects_only():
+    engine = make_engine()
+    trend = engine.trend_model(['数学'])
+    engine.add_score(SEMESTER, '语文', 70.0)
+    assert engine.trend_model(['数学']) is trend
+    engine.add_score(OTHER, '数学', 75.0)
+    assert engine.trend_model(['数学']) is not trend
+
+
+def test_load_dict_drops_every_cached_result():
+    engine = make_engine()
+    model = engine.semester_model(SEMESTER)
+    engine.load_dict(engine.to_dict())
+    assert not engine.cache.entries
+    assert engine.semester_model(SEMESTER) is not model
@@ -0,0 +1,113 @@
+"""图表成品：报告与导出共用同一次布局与渲染"""
+import time
+
+import pytest
+
+import chart_artifacts
+from export_worker import ExportQueue
+from score_engine import ScoreEngine
+
+
+SEMESTER = "2024-2025 第1学期"
+
+pytestmark = pytest.mark.filterwarnings("ignore:Glyph .* missing from font")  # 未安装中文字体时
+
+
+class PollingRoot:
+    """按顺序执行 after 回调的 Tk 根窗口替身"""
+
+    def __init__(self):
+        self.pending = []
+
+    def after(self, ms, callback):
+        self.pending.append(callback)
+
+    def run(self, timeout=60):
+        deadline = time.monotonic() + timeout
+        while self.pending and time.monotonic() < deadline:
+            time.sleep(0.05)
+            self.pending.pop(0)()
+        assert not self.pending, "导出任务超时"
+
+
+@pytest.fixture
+def engine():
+    engine = ScoreEngine()
+    engine.add_semester(SEMESTER, '七年级')
+    for score, subject in zip((88, 92.5, 71, 64), engine.grade_subjects['七年级']):
+        engine.add_score(SEMESTER, subject, float(score))
+    return engine
+
+
+@pytest.fixture
+def layouts(monkeypatch):
+    """记录界面进程中 render_chart（新建 Figure 并布局）的调用次数"""
+    calls = []
+    render = chart_artifacts.render_chart
+
+    def counting(kind, model):
+        calls.append(kind)
+        return render(kind, model)
+
+    monkeypatch.setattr(chart_artifacts, 'render_chart', counting)
+    return calls
+
+
+def export(artifact, filepath):
+    """经导出队列导出，返回工作进程是否重新渲染"""
+    root, done = PollingRoot(), []
+    queue = ExportQueue(root, on_done=lambda path, error: done.append(error))
+    try:
+        job_id = queue.submit(artifact, filepath)
+        future = queue.jobs[job_id][0]
+        root.run()
+    finally:
+        queue.shutdown()
+    assert done == [None]
+    return future.result() is not None
+
+
+def test_report_then_export_lays_out_once(engine, layouts, tmp_path):
+    try:
+        from score_engine import load_chinese_font
+        load_chinese_font()
+    except FileNotFoundError:
+        pytest.skip("未找到中文字体，无法生成报告")
+
+    engine.write_report(str(tmp_path / "report.pdf"), SEMESTER, chart=True)
+    assert layouts == ['semester']
+
+    artifact = engine.semester_chart(SEMESTER)
+    assert not export(artifact, str(tmp_path / "chart.png"))
+    assert layouts == ['semester']
+    assert (tmp_path / "chart.png").read_bytes() == artifact.cached('png')
+
+
+def test_report_image_and_export_share_png(engine, layouts, tmp_path):
+    artifact = engine.semester_chart(SEMESTER)
+    artifact.flowable(400)  # 报告嵌入的位图
+    assert not export(artifact, str(tmp_path / "chart.png"))
+    assert layouts == ['semester']
+    assert engine.semester_chart(SEMESTER) is artifact
+
+
+def test_prerendered_png_is_reused_by_report(engine, layouts):
+    artifact = engine.semester_chart(SEMESTER)
+    root, ready = PollingRoot(), []
+    queue = ExportQueue(root)
+    try:
+        queue.prerender(artifact, ready.append)
+        root.run()
+    finally:
+        queue.shutdown()
+    assert ready == [None] and artifact.cached('png') is not None
+
+    artifact.flowable(400)
+    assert layouts == []  # 布局只发生在工作进程中
+
+
+def test_edit_invalidates_artifact(engine):
+    artifact = engine.semester_chart(SEMESTER)
+    assert engine.semester_chart(SEMESTER) is artifact
+    engine.add_score(SEMESTER, engine.grade_subjects['七年级'][0], 50.0)
+    assert engine.semester_chart(SEMESTER) is not artifact
@@ -0,0 +1,61 @@
+"""图表复用：1000 次学期切换后 Figure 数量不变、内存保持平稳"""
+import gc
+import tracemalloc
+
+import pytest
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from score_charts import SemesterChart
+from score_engine import ScoreEngine
+
+
+SWITCHES = 1000
+DRAW_EVERY = 50  # 完整绘制较慢（约 0.1 秒），每隔若干次切换绘制一次，覆盖绘制期间的缓存
+GROWTH_LIMIT = 1024 * 1024  # 允许的内存增长（字节）
+
+
+def live_figures():
+    gc.collect()
+    return sum(isinstance(obj, Figure) for obj in gc.get_objects())
+
+
+def semester_models():
+    engine = ScoreEngine()
+    engine.store.add_semester("2024-2025 第1学期", '七年级')
+    engine.store.add_semester("2024-2025 第2学期", '八年级')
+    for score, subject in zip(range(60, 100, 5), engine.grade_subjects['七年级']):
+        engine.add_score("2024-2025 第1学期", subject, float(score))
+    for score, subject in zip(range(95, 40, -6), engine.grade_subjects['八年级']):
+        engine.add_score("2024-2025 第2学期", subject, float(score))
+    return [engine.semester_model(sem) for sem in engine.store.semesters]
+
+
+@pytest.mark.filterwarnings("ignore:Glyph .* missing from font")  # 未安装中文字体时
+def test_semester_switches_reuse_one_figure():
+    models = semester_models()
+    chart = SemesterChart()
+    canvas = FigureCanvasAgg(chart.figure)
+    # 预热：字体缓存、文本布局缓存等一次性开销
+    for i in range(10):
+        chart.update(models[i % 2])
+        canvas.draw()
+
+    figures_before = live_figures()
+    artists_before = len(chart.figure.findobj())
+    tracemalloc.start()
+    try:
+        gc.collect()
+        baseline = tracemalloc.get_traced_memory()[0]
+        for i in range(SWITCHES):
+            assert chart.update(models[i % 2]) is chart.figure
+            if i % DRAW_EVERY == 0:
+                canvas.draw()
+        gc.collect()
+        growth = tracemalloc.get_traced_memory()[0] - baseline
+    finally:
+        tracemalloc.stop()
+
+    assert live_figures() == figures_before
+    assert len(chart.figure.findobj()) == artists_before
+    assert growth < GROWTH_LIMIT, f"内存增长 {growth / 1024:.1f} KiB"
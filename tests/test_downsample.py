@@ -0,0 +1,61 @@
+"""LTTB 降采样：首尾点保留、每桶恰取一点、与逐点参考实现一致"""
+import numpy as np
+import pytest
+
+from downsample import lttb, lttb_indices
+
+
+def reference_lttb(x, y, threshold):
+    """按原始论文逐点实现的 LTTB，桶边界与 lttb_indices 相同"""
+    n = len(x)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    selected = [0]
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            nxt = range(edges[i + 1], edges[i + 2])
+            cx, cy = np.mean([x[k] for k in nxt]), np.mean([y[k] for k in nxt])
+        else:
+            cx, cy = x[n - 1], y[n - 1]
+        a = selected[-1]
+        best = max(range(start, end),
+                   key=lambda k: abs((x[a] - cx) * (y[k] - y[a]) - (x[a] - x[k]) * (cy - y[a])))
+        selected.append(best)
+    selected.append(n - 1)
+    return selected
+
+
+def test_short_series_kept_whole():
+    assert lttb_indices(range(5), range(5), 5).tolist() == [0, 1, 2, 3, 4]
+    assert lttb_indices(range(5), range(5), 2).tolist() == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.parametrize("n, threshold", [(10, 3), (101, 12), (1000, 50), (1003, 7)])
+def test_endpoints_and_one_point_per_bucket(n, threshold):
+    rng = np.random.default_rng(n)
+    x = np.arange(n, dtype=np.float64)
+    y = rng.normal(size=n)
+    keep = lttb_indices(x, y, threshold)
+    assert len(keep) == threshold
+    assert keep[0] == 0 and keep[-1] == n - 1
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.intp)
+    for i, idx in enumerate(keep[1:-1]):
+        assert edges[i] <= idx < edges[i + 1]
+    assert keep.tolist() == reference_lttb(x, y, threshold)
+
+
+def test_spike_is_selected_from_its_bucket():
+    x = np.arange(100, dtype=np.float64)
+    y = np.zeros(100)
+    y[37] = 10.0
+    y[71] = -10.0
+    keep = lttb_indices(x, y, 10).tolist()
+    assert 37 in keep and 71 in keep
+
+
+def test_lttb_returns_selected_points():
+    x = np.linspace(0, 1, 50)
+    y = np.sin(x * 10)
+    sx, sy = lttb(x, y, 8)
+    keep = lttb_indices(x, y, 8)
+    assert np.array_equal(sx, x[keep]) and np.array_equal(sy, y[keep])
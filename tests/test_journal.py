@@ -0,0 +1,97 @@
+"""变更日志：回放未保存的变更，压缩中断后从 .journal.old 恢复"""
+import os
+
+import pytest
+
+from score_engine import ScoreEngine
+
+
+SEMESTER = "2024-2025 第1学期"
+
+
+def reload(path):
+    engine = ScoreEngine()
+    engine.load(path)
+    engine.journal.close()
+    return engine
+
+
+def saved_engine(path):
+    """已保存一次快照、绑定了日志的引擎"""
+    engine = ScoreEngine()
+    engine.add_semester(SEMESTER, '七年级')
+    engine.add_score(SEMESTER, '语文', 88.0)
+    engine.save_json(path)
+    return engine
+
+
+def test_replay_restores_changes_after_snapshot(tmp_path):
+    path = str(tmp_path / "scores.json")
+    engine = saved_engine(path)
+    engine.add_semester("2024-2025 第2学期", '七年级')
+    engine.set_grade("2024-2025 第2学期", '八年级')
+    engine.add_score(SEMESTER, '语文', 91.5)
+    engine.add_score(SEMESTER, '数学', 75.0, student="学生001")
+    engine.set_full_mark('数学', 120)
+    engine.add_custom_subject('七年级', '书法')
+    engine.journal.close()
+
+    restored = reload(path)
+    assert restored.to_dict() == engine.to_dict()
+    assert restored.store.get_grade("2024-2025 第2学期") == '八年级'
+    assert '书法' in restored.subjects_for_grade('七年级')
+
+
+def test_torn_last_line_is_ignored(tmp_path):
+    path = str(tmp_path / "scores.json")
+    engine = saved_engine(path)
+    engine.add_score(SEMESTER, '数学', 66.0)
+    engine.journal.close()
+    with open(path + ".journal", 'a', encoding='utf-8') as f:
+        f.write('{"semester":"2024-2025 第1学期","subj')  # 写到一半时断电
+
+    restored = reload(path)
+    assert dict(restored.store.semester_items(SEMESTER)) == {'语文': 88.0, '数学': 66.0}
+
+
+def test_interrupted_compaction_recovers_from_old_journal(tmp_path):
+    path = str(tmp_path / "scores.json")
+    engine = saved_engine(path)
+    engine.add_score(SEMESTER, '数学', 70.0)
+
+    def crash(data, filepath):
+        raise OSError("磁盘已满")
+
+    engine.journal.dump = crash
+    with pytest.raises(OSError):
+        engine.save_json(path)
+    # 快照未被替换，轮换出的日志仍在；之后的变更写入新日志
+    assert os.path.exists(path + ".journal.old")
+    engine.add_score(SEMESTER, '英语', 95.0)
+    engine.journal.close()
+
+    restored = reload(path)
+    assert dict(restored.store.semester_items(SEMESTER)) == {'语文': 88.0, '数学': 70.0, '英语': 95.0}
+
+    # 再次压缩时把当前日志接到旧日志之后，一并由新快照取代
+    restored = ScoreEngine()
+    restored.load(path)
+    restored.add_score(SEMESTER, '物理', 60.0)
+    restored.save_json(path)
+    restored.journal.close()
+    assert not os.path.exists(path + ".journal.old")
+    assert os.path.getsize(path + ".journal") == 0
+    assert dict(reload(path).store.semester_items(SEMESTER)) == {'语文': 88.0, '数学': 70.0, '英语': 95.0,
+                                                                  '物理': 60.0}
+
+
+def test_background_compaction_keeps_concurrent_changes(tmp_path):
+    path = str(tmp_path / "scores.json")
+    engine = saved_engine(path)
+    engine.add_score(SEMESTER, '数学', 70.0)
+    engine.save_json(path, background=True)
+    engine.add_score(SEMESTER, '英语', 82.0)  # 压缩进行中的变更写入新日志
+    engine.journal.close()
+
+    assert not os.path.exists(path + ".journal.old")
+    assert dict(reload(path).store.semester_items(SEMESTER)) == {'语文': 88.0, '数学': 70.0, '英语': 82.0}
@@ -0,0 +1,92 @@
+"""班级排名：增量维护的名次与百分位应与重新构建的结果一致"""
+import numpy as np
+
+from score_ranking import RankIndex, RankPart
+from score_store import ScoreStore, DEFAULT_STUDENT
+
+
+SEMESTERS = ["2023-2024 第1学期", "2023-2024 第2学期"]
+SUBJECTS = ['语文', '数学', '英语']
+
+
+def make_store(n_students=40, seed=0):
+    rng = np.random.default_rng(seed)
+    students = [DEFAULT_STUDENT] + [f"学生{i:03d}" for i in range(1, n_students)]
+    s, j, t = np.meshgrid(np.arange(n_students), np.arange(len(SUBJECTS)), np.arange(len(SEMESTERS)), indexing='ij')
+    keep = rng.random(s.size) < 0.9  # 留出缺考
+    # 分数取 0.5 的倍数，制造大量同分
+    scores = (rng.integers(100, 200, s.size) / 2).astype(np.float32)
+    return ScoreStore.from_columns(SEMESTERS, ['八年级'] * len(SEMESTERS), SUBJECTS, students,
+                                   t.ravel()[keep], j.ravel()[keep], s.ravel()[keep], scores[keep])
+
+
+def assert_same(store, subject):
+    """store 中增量维护的排名与对同一份成绩重新构建的索引一致"""
+    for semester in SEMESTERS:
+        expected = RankIndex(store).ranking(semester, subject)
+        actual = store.ranks.ranking(semester, subject)
+        assert actual['students'] == expected['students']
+        np.testing.assert_array_equal(actual['ranks'], expected['ranks'])
+        np.testing.assert_array_equal(actual['scores'], expected['scores'])
+        np.testing.assert_allclose(actual['percentiles'], expected['percentiles'])
+
+
+def test_rank_part_competition_ranks():
+    part = RankPart([90, np.nan, 80, 90, 70])
+    assert part.ranks.tolist() == [1, 0, 3, 1, 4]
+    np.testing.assert_allclose(part.percentiles([90, 70]), [75.0, 12.5])
+
+
+def test_rank_part_update_matches_rebuild():
+    rng = np.random.default_rng(1)
+    values = rng.integers(0, 10, 30).astype(np.float64)
+    values[rng.random(30) < 0.2] = np.nan
+    part = RankPart(values)
+    for _ in range(300):
+        s = int(rng.integers(30))
+        new = np.nan if rng.random() < 0.1 else float(rng.integers(0, 10))
+        old = values[s]
+        values[s] = new
+        part.update(s, old, new)
+        fresh = RankPart(values)
+        np.testing.assert_array_equal(part.ranks, fresh.ranks)
+        np.testing.assert_array_equal(part.sorted, fresh.sorted)
+
+
+def test_incremental_updates_match_rebuild():
+    store = make_store()
+    rng = np.random.default_rng(2)
+    # 先查询一次，使各分区被构建，之后的写入走增量路径
+    for subject in SUBJECTS + [None]:
+        assert_same(store, subject)
+    for _ in range(200):
+        semester = SEMESTERS[rng.integers(len(SEMESTERS))]
+        subject = SUBJECTS[rng.integers(len(SUBJECTS))]
+        student = store.students[rng.integers(len(store.students))]
+        store.set_score(semester, subject, float(rng.integers(100, 200) / 2), student)
+    for subject in SUBJECTS + [None]:
+        assert_same(store, subject)
+
+
+def test_new_student_and_bulk_write_invalidate_parts():
+    store = make_store(n_students=10)
+    assert_same(store, None)
+    store.set_score(SEMESTERS[0], '数学', 100.0, "新同学")
+    assert_same(store, '数学')
+    assert store.ranks.rank_of(SEMESTERS[0], "新同学", '数学')[0] == 1
+
+    store.set_scores(np.array([SEMESTERS[1]] * 2), np.array(['语文', '英语']), np.array([0.0, 100.0]),
+                     np.array(["学生001", "学生002"]))
+    for subject in SUBJECTS + [None]:
+        assert_same(store, subject)
+
+
+def test_ranking_within_roster():
+    store = make_store(n_students=10)
+    roster = ["学生003", "学生001", "学生005"]
+    j, t = store.subject_index['语文'], store.semester_index[SEMESTERS[0]]
+    present = [name for name in roster if store.mask[store.student_index[name], j, t]]
+    result = store.ranks.ranking(SEMESTERS[0], '语文', students=roster)
+    assert sorted(result['students']) == sorted(present)
+    assert list(result['scores']) == sorted(result['scores'], reverse=True)
+    assert result['ranks'][0] == 1
@@ -0,0 +1,78 @@
+"""RedrawScheduler：同一轮内多次标记只刷新一次"""
+import pytest
+
+from ui_widgets import RedrawScheduler
+
+
+class FakeRoot:
+    """只记录 after_idle 回调的 Tk 根窗口替身"""
+
+    def __init__(self):
+        self.idle = {}
+        self._next = 0
+
+    def after_idle(self, callback):
+        self._next += 1
+        self.idle[self._next] = callback
+        return self._next
+
+    def after_cancel(self, handle):
+        self.idle.pop(handle, None)
+
+    def run_idle(self):
+        while self.idle:
+            self.idle.pop(min(self.idle))()
+
+
+def make_scheduler(*names):
+    root = FakeRoot()
+    scheduler = RedrawScheduler(root)
+    calls = []
+    for name in names:
+        scheduler.register(name, lambda name=name: calls.append(name))
+    return root, scheduler, calls
+
+
+def test_repeated_invalidation_coalesces_to_one_redraw_per_view():
+    root, scheduler, calls = make_scheduler('table', 'chart', 'subjects')
+    for _ in range(5):
+        scheduler.invalidate('table')
+        scheduler.invalidate('chart', 'table')
+    assert len(root.idle) == 1
+
+    root.run_idle()
+    assert calls == ['table', 'chart']
+    assert scheduler.last_pass == {'table': 1, 'chart': 1}
+    assert scheduler.passes == 1
+
+
+def test_explicit_flush_cancels_pending_idle_callback():
+    root, scheduler, calls = make_scheduler('table', 'chart')
+    scheduler.invalidate('chart')
+    scheduler.invalidate('chart')
+    scheduler.flush()
+    assert calls == ['chart'] and not root.idle
+
+    root.run_idle()
+    scheduler.flush()
+    assert calls == ['chart'] and scheduler.passes == 1
+
+
+def test_view_invalidated_during_flush():
+    root, scheduler, calls = make_scheduler('table', 'chart')
+    # 刷新 chart 时再标记 table（排在前面）与 chart 自身：留到下一轮，各刷新一次
+    scheduler.register('chart', lambda: (calls.append('chart'), scheduler.invalidate('table', 'chart')))
+    scheduler.invalidate('table', 'chart')
+    scheduler.flush()
+    assert calls == ['table', 'chart'] and len(root.idle) == 1
+
+    scheduler.register('chart', lambda: calls.append('chart'))
+    root.run_idle()
+    assert calls == ['table', 'chart', 'table', 'chart']
+    assert scheduler.counts == {'table': 2, 'chart': 2} and scheduler.passes == 2
+
+
+def test_unknown_view_is_rejected():
+    _, scheduler, _ = make_scheduler('table')
+    with pytest.raises(KeyError):
+        scheduler.invalidate('missing')
@@ -0,0 +1,60 @@
+"""等级判定：分数线上的小数成绩与非 100 满分"""
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from score_engine import ScoreEngine
+from score_levels import DEFAULT_STANDARD, LEVELS, LevelClassifier
+
+
+def expected_level(score, full_mark, standard=DEFAULT_STANDARD):
+    """按十进制精确计算的等级（录入的成绩与分数线都是有限小数）"""
+    score = Decimal(str(score))
+    for level in LEVELS[:3]:
+        if score >= Decimal(str(full_mark)) * standard[level] / 100:
+            return level
+    return LEVELS[3]
+
+
+@pytest.mark.parametrize('full_mark, score, level', [
+    (99, 79.2, '良好'),
+    (99, 79.1, '及格'),
+    (99, 89.1, '优秀'),
+    (99, 59.4, '及格'),
+    (99, 59.3, '不及格'),
+    (150, 135.0, '优秀'),
+    (120, 71.9, '不及格'),
+    (75, 67.5, '优秀'),
+])
+def test_boundary_scores(full_mark, score, level):
+    classifier = LevelClassifier({'数学': full_mark}, {}, ['数学'])
+    # 与 ScoreStore 一致，以 float32 传入
+    assert classifier.level_names(np.float32([score]), [0], '七年级') == [level]
+
+
+def test_decimal_scores_match_exact_arithmetic():
+    full_marks = {'语文': 99, '数学': 120, '英语': 150, '物理': 75, '化学': 100}
+    subjects = list(full_marks)
+    classifier = LevelClassifier(full_marks, {}, subjects)
+    rows = [(j, k / 10) for j, subject in enumerate(subjects) for k in range(full_marks[subject] * 10 + 1)]
+    ids, scores = np.array(rows).T
+    names = classifier.level_names(scores.astype(np.float32), ids.astype(np.intp), '七年级')
+    assert names == [expected_level(score, full_marks[subjects[int(j)]]) for j, score in rows]
+
+
+def test_grade_standard_and_full_mark_change():
+    standards = {'九年级': {'优秀': 75, '良好': 60, '及格': 50}}
+    classifier = LevelClassifier({'数学': 99}, standards, ['数学'])
+    assert classifier.level_names([74.25, 59.4, 49.5, 49.4], [0] * 4, '九年级') == ['优秀', '良好', '及格', '不及格']
+    classifier.full_marks['数学'] = 120
+    classifier.invalidate('数学')
+    assert classifier.count([90, 72, 60, 59.5], [0] * 4, '九年级') == {'优秀': 1, '良好': 1, '及格': 1, '不及格': 1}
+
+
+def test_engine_rows_use_exact_boundary():
+    engine = ScoreEngine()
+    engine.add_semester("2024-2025 第1学期", '七年级')
+    engine.set_full_mark('数学', 99)
+    engine.add_score("2024-2025 第1学期", '数学', 79.2)
+    assert engine.semester_rows("2024-2025 第1学期") == [('数学', 79.2, 99, '良好')]
@@ -0,0 +1,37 @@
+"""ScoreStore 与旧版 dataset 字典结构的互相转换"""
+from score_store import ScoreStore, DEFAULT_STUDENT
+
+
+SEMESTER = "2024-2025 第1学期"
+
+
+def test_legacy_dataset_keeps_subject_order():
+    dataset = {SEMESTER: {'grade': '七年级', 'scores': {'数学': 90, '语文': 80, '英语': 70},
+                          'subjects': ['语文', '数学', '物理']}}
+    store = ScoreStore.from_dict(dataset)
+    # 先按 subjects 顺序，再补齐只出现在 scores 中的学科；没有成绩的学科不登记
+    assert list(store.semester_items(SEMESTER)) == [('语文', 80.0), ('数学', 90.0), ('英语', 70.0)]
+    assert store.to_dict()[SEMESTER]['subjects'] == ['语文', '数学', '英语']
+
+
+def test_students_round_trip():
+    store = ScoreStore()
+    store.add_semester(SEMESTER, '八年级')
+    store.set_score(SEMESTER, '语文', 88.0)
+    store.set_score(SEMESTER, '语文', 75.5, "学生001")
+    store.set_score(SEMESTER, '数学', 92.0, "学生002")
+    # 排名对话框的学科列表：任一学生录入过的学科，按录入顺序
+    assert store.semester_subject_names(SEMESTER) == ['语文', '数学']
+    dataset = store.to_dict()
+    assert dataset[SEMESTER]['students'] == {"学生001": {'语文': 75.5}, "学生002": {'数学': 92.0}}
+
+    restored = ScoreStore.from_dict(dataset)
+    assert restored.to_dict() == dataset
+    assert restored.students == [DEFAULT_STUDENT, "学生001", "学生002"]
+    assert restored.ranks.rank_of(SEMESTER, "学生001", '语文') == (2, 2, 25.0)
+
+
+def test_student_record_for_default_student_replaces_legacy_scores():
+    dataset = {SEMESTER: {'grade': '七年级', 'scores': {'数学': 60}, 'subjects': ['数学'],
+                          'students': {DEFAULT_STUDENT: {'数学': 99}}}}
+    assert dict(ScoreStore.from_dict(dataset).semester_items(SEMESTER)) == {'数学': 99.0}
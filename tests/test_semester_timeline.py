@@ -0,0 +1,50 @@
+"""学期名解析与时间线排序"""
+import pytest
+
+from score_store import ScoreStore
+from semester_timeline import parse_semester, semester_key
+
+
+@pytest.mark.parametrize('name, expected', [
+    ("2024-2025 第1学期", (2024, 1)),
+    ("2024-2025学年 第二学期", (2024, 2)),
+    ("2024~2025 第 2 学期", (2024, 2)),
+    ("2024 第3学期", (2024, 3)),
+    ("2024-2025 第十二学期", (2024, 12)),
+    ("2024-2025 上学期", (2024, 1)),
+    ("2024-2025学年下", (2024, 2)),
+    ("2024 下", (2024, 2)),
+    ("2024年秋季", (2024, 1)),
+    ("2025春", (2024, 2)),
+    ("七年级 2023至2024 第一学期", (2023, 1)),
+])
+def test_parse_semester(name, expected):
+    assert parse_semester(name) == expected
+
+
+@pytest.mark.parametrize('name', ["期中考试", "第一学期", "", "24-25 上"])
+def test_unrecognised_names(name):
+    assert parse_semester(name) is None
+
+
+def test_unparsed_names_sort_last():
+    names = ["补考", "2025春", "2024-2025 第1学期", "2023-2024 下学期", "2024年秋季"]
+    assert sorted(names, key=semester_key) == ["2023-2024 下学期", "2024-2025 第1学期", "2024年秋季", "2025春", "补考"]
+
+
+def test_timeline_ranges():
+    store = ScoreStore()
+    for name in ["2025-2026 第1学期", "2023-2024 第2学期", "2024-2025 第1学期", "2023-2024 第1学期"]:
+        store.add_semester(name)
+    timeline = store.timeline
+    assert timeline.names() == ["2023-2024 第1学期", "2023-2024 第2学期", "2024-2025 第1学期", "2025-2026 第1学期"]
+    # 首次查询后的新增学期按顺序插入
+    store.add_semester("2024-2025 第2学期")
+    assert timeline.previous("2025-2026 第1学期") == "2024-2025 第2学期"
+    assert timeline.select(('last', 2)) == ["2024-2025 第2学期", "2025-2026 第1学期"]
+    assert timeline.select(('year', 2023)) == ["2023-2024 第1学期", "2023-2024 第2学期"]
+    assert timeline.select(('between', "2023-2024 第2学期", "2024-2025 第2学期")) == [
+        "2023-2024 第2学期", "2024-2025 第1学期", "2024-2025 第2学期"]
+    assert timeline.academic_years() == [2023, 2024, 2025]
+    with pytest.raises(ValueError):
+        timeline.select(('term', 1))
@@ -0,0 +1,62 @@
+"""SubjectIndex：后缀索引的前缀查找与可选的拼音匹配"""
+import builtins
+
+import pytest
+
+from ui_widgets import SubjectIndex
+
+SUBJECTS = ['语文', '数学', '英语', '物理', '化学', '生物', '道德与法治']
+
+
+def names(index, query):
+    return [index.subjects[idx] for idx in index.search(query)]
+
+
+def test_empty_query_returns_all_in_order():
+    index = SubjectIndex(SUBJECTS)
+    assert names(index, "") == SUBJECTS
+    assert names(index, "  ") == SUBJECTS
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("数", ['数学']),               # 名称前缀
+    ("学", ['数学', '化学']),        # 名称中间/末尾的字（后缀索引）
+    ("语", ['语文', '英语']),
+    ("与法", ['道德与法治']),
+    ("法治", ['道德与法治']),
+    ("历史", []),
+])
+def test_prefix_of_any_suffix_matches(query, expected):
+    assert names(SubjectIndex(SUBJECTS), query) == expected
+
+
+def test_range_does_not_leak_into_neighbouring_keys():
+    # “物理”与“物理化学”共享前缀：查“物理化”只能命中后者
+    index = SubjectIndex(['物理', '物理化学'])
+    assert names(index, "物理") == ['物理', '物理化学']
+    assert names(index, "物理化") == ['物理化学']
+
+
+def test_pinyin_full_initials_and_suffix():
+    pytest.importorskip("pypinyin")
+    index = SubjectIndex(SUBJECTS)
+    assert index.pinyin
+    assert names(index, "shuxue") == ['数学']
+    assert names(index, "sx") == ['数学']
+    assert names(index, "xue") == ['数学', '化学']
+    assert names(index, "Shu Xue") == ['数学']
+
+
+def test_without_pypinyin_only_hanzi_match(monkeypatch):
+    real_import = builtins.__import__
+
+    def no_pypinyin(name, *args, **kwargs):
+        if name == "pypinyin":
+            raise ImportError(name)
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "__import__", no_pypinyin)
+    index = SubjectIndex(SUBJECTS)
+    assert not index.pinyin
+    assert names(index, "shuxue") == []
+    assert names(index, "数学") == ['数学']
@@ -0,0 +1,320 @@
+"""界面辅助组件"""
+import tkinter as tk
+from bisect import bisect_left
+from collections import Counter
+from tkinter import ttk
+
+
+class RedrawScheduler:
+    """合并界面刷新：各视图先标记为待刷新，事件循环空闲时（after_idle）按注册顺序每个只刷新一次
+
+    一次用户操作中多处调用 invalidate 只会排一次刷新；刷新过程中被标记的、排在后面的视图在同一轮处理，
+    排在前面的视图留到下一轮。counts 累计各视图刷新次数，last_pass 为最近一轮的刷新次数（供测试与诊断）。
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.views = {}  # 视图名 -> 刷新函数（按注册顺序）
+        self.dirty = set()
+        self.pending = None  # after_idle 回调编号
+        self.flushing = False
+        self.counts = Counter()
+        self.last_pass = Counter()
+        self.passes = 0
+
+    def register(self, name, callback):
+        self.views[name] = callback
+
+    def invalidate(self, *names):
+        """标记视图待刷新，并在本轮事件循环空闲时统一刷新"""
+        for name in names:
+            if name not in self.views:
+                raise KeyError(f"未注册的视图：{name}")
+        self.dirty.update(names)
+        if self.pending is None and not self.flushing and self.dirty:
+            self.pending = self.root.after_idle(self.flush)
+
+    def flush(self):
+        """立即刷新全部待刷新视图（也可在需要同步结果时直接调用）"""
+        if self.pending is not None:
+            self.root.after_cancel(self.pending)
+            self.pending = None
+        if not self.dirty or self.flushing:
+            return
+        self.flushing = True
+        self.last_pass = Counter()
+        try:
+            for name, callback in self.views.items():
+                if name in self.dirty:
+                    self.dirty.discard(name)
+                    callback()
+                    self.last_pass[name] += 1
+        finally:
+            self.flushing = False
+            self.passes += 1
+            self.counts.update(self.last_pass)
+            if self.dirty:
+                self.pending = self.root.after_idle(self.flush)
+
+    def reset_counts(self):
+        self.counts = Counter()
+        self.last_pass = Counter()
+        self.passes = 0
+
+
+class IncrementalTable:
+    """增量更新的 Treeview：按行键比对，只插入/更新/删除有变化的行
+
+    行数超过 window_threshold 时进入窗口模式，只渲染可见的若干行，
+    滚动条由本类根据数据源行数自行维护。
+    """
+
+    def __init__(self, tree, scrollbar, window_threshold=1000):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.window_threshold = window_threshold
+        self.items = {}  # 行键 -> Treeview item id
+        self.values = {}  # 行键 -> (values, tags)，用于判断是否需要更新
+        self.order = []  # 当前渲染的行键顺序
+        self.rows = []
+        self.offset = 0
+        self.windowed = False
+
+        self.scrollbar.configure(command=self.yview)
+        self.tree.configure(yscrollcommand=self._tree_scrolled)
+        self.tree.bind("<MouseWheel>", self._on_wheel)
+        self.tree.bind("<Button-4>", self._on_wheel)
+        self.tree.bind("<Button-5>", self._on_wheel)
+
+    # === 数据源 ===
+    def set_rows(self, rows):
+        """设置完整行序列 [(行键, values, tags)]，只把差异应用到控件"""
+        self.rows = rows
+        self.windowed = len(rows) > self.window_threshold
+        self.refresh()
+
+    def refresh(self):
+        if self.windowed:
+            visible = self.visible_count()
+            self.offset = max(0, min(self.offset, len(self.rows) - visible))
+            self._render(self.rows[self.offset:self.offset + visible])
+            self._update_scrollbar()
+        else:
+            self.offset = 0
+            self._render(self.rows)
+
+    def visible_count(self):
+        return int(self.tree.cget("height"))
+
+    # === 差异渲染 ===
+    def _render(self, rows):
+        keys = [key for key, _, _ in rows]
+        wanted = set(keys)
+        stale = [key for key in self.order if key not in wanted]
+        if stale:
+            self.tree.delete(*[self.items.pop(key) for key in stale])
+            for key in stale:
+                del self.values[key]
+
+        for key, values, tags in rows:
+            state = (tuple(values), tuple(tags))
+            if key not in self.items:
+                self.items[key] = self.tree.insert("", "end", values=state[0], tags=state[1])
+            elif self.values[key] != state:
+                self.tree.item(self.items[key], values=state[0], tags=state[1])
+            self.values[key] = state
+
+        # 行顺序变化时才移动条目
+        current = [key for key in self.order if key in wanted]
+        current += [key for key in keys if key not in current]
+        if current != keys:
+            for index, key in enumerate(keys):
+                self.tree.move(self.items[key], "", index)
+        self.order = keys
+
+    # === 窗口模式滚动 ===
+    def _tree_scrolled(self, first, last):
+        if not self.windowed:
+            self.scrollbar.set(first, last)
+
+    def _update_scrollbar(self):
+        total = max(len(self.rows), 1)
+        first = self.offset / total
+        last = min(1.0, (self.offset + self.visible_count()) / total)
+        self.scrollbar.set(first, last)
+
+    def scroll_to(self, offset):
+        self.offset = offset
+        self.refresh()
+
+    def yview(self, *args):
+        """滚动条回调：窗口模式下移动数据窗口，否则交给 Treeview"""
+        if not self.windowed:
+            return self.tree.yview(*args)
+        visible = self.visible_count()
+        if args[0] == "moveto":
+            self.scroll_to(int(float(args[1]) * len(self.rows)))
+        elif args[0] == "scroll":
+            step = visible if args[2] == "pages" else 1
+            self.scroll_to(self.offset + int(args[1]) * step)
+
+    def _on_wheel(self, event):
+        if not self.windowed:
+            return None
+        if event.num == 4 or getattr(event, "delta", 0) > 0:
+            self.scroll_to(self.offset - 3)
+        else:
+            self.scroll_to(self.offset + 3)
+        return "break"
+
+
+class SubjectIndex:
+    """学科搜索索引：名称及其拼音的各个后缀预先排序，按前缀二分查找
+
+    名称的每个后缀都入索引，输入名称中间的字（如“文”）也能命中；
+    拼音搜索是可选功能：安装 pypinyin（pip install pypinyin）时额外索引全拼与首字母（如 shuxue、sx、xue），
+    否则只按汉字匹配，pinyin 属性为 False，界面据此提示。
+    """
+
+    def __init__(self, subjects):
+        self.subjects = list(subjects)
+        to_pinyin = _pinyin_keys()
+        self.pinyin = to_pinyin is not None
+        entries = set()
+        for idx, name in enumerate(self.subjects):
+            for key in _suffixes(name.lower()) + (to_pinyin(name) if self.pinyin else []):
+                entries.add((key, idx))
+        entries = sorted(entries)
+        self.keys = [key for key, _ in entries]
+        self.ids = [idx for _, idx in entries]
+
+    def search(self, query):
+        """返回匹配学科的下标（按原顺序），空查询返回全部"""
+        query = query.strip().lower().replace(" ", "")
+        if not query:
+            return list(range(len(self.subjects)))
+        lo = bisect_left(self.keys, query)
+        hi = bisect_left(self.keys, query + "\uffff")
+        return sorted(set(self.ids[lo:hi]))
+
+
+def _suffixes(text):
+    return [text[k:] for k in range(len(text))]
+
+
+def _pinyin_keys():
+    """拼音索引键生成函数；未安装 pypinyin 时返回 None"""
+    try:
+        from pypinyin import lazy_pinyin
+    except ImportError:
+        return None
+
+    def keys(name):
+        syllables = lazy_pinyin(name)
+        result = []
+        for k in range(len(syllables)):
+            result.append("".join(syllables[k:]).lower())
+            result.append("".join(syllable[:1] for syllable in syllables[k:]).lower())
+        return result
+    return keys
+
+
+class SubjectPicker:
+    """可搜索的学科多选列表
+
+    Listbox 只插入当前可见的若干行（与 IncrementalTable 的窗口模式相同），滚动条按筛选结果行数维护；
+    选择状态单独保存，筛选条件变化时不会丢失已选学科。
+    """
+
+    def __init__(self, parent, subjects, selected=(), height=12):
+        self.index = SubjectIndex(subjects)
+        self.height = height
+        names = set(self.index.subjects)
+        self.selected = {subject for subject in selected if subject in names}
+        self.matches = self.index.search("")
+        self.offset = 0
+
+        self.frame = ttk.Frame(parent)
+        self.query = tk.StringVar()
+        self.entry = ttk.Entry(self.frame, textvariable=self.query)
+        self.entry.grid(row=0, column=0, columnspan=2, sticky="ew", pady=(0, 5))
+        self.listbox = tk.Listbox(self.frame, height=height, selectmode=tk.MULTIPLE,
+                                  activestyle="none", exportselection=False)
+        self.listbox.grid(row=1, column=0, sticky="nsew")
+        self.scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self.yview)
+        self.scrollbar.grid(row=1, column=1, sticky="ns")
+        self.status = tk.StringVar()
+        ttk.Label(self.frame, textvariable=self.status).grid(row=2, column=0, columnspan=2, sticky="w")
+        self.frame.columnconfigure(0, weight=1)
+        self.frame.rowconfigure(1, weight=1)
+
+        self.query.trace_add("write", lambda *args: self.filter())
+        self.listbox.bind("<<ListboxSelect>>", self._on_select)
+        self.entry.bind("<Down>", lambda event: self.listbox.focus_set())
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.listbox.bind(sequence, self._on_wheel)
+        self.render()
+
+    # === 筛选与选择 ===
+    def filter(self):
+        self.matches = self.index.search(self.query.get())
+        self.offset = 0
+        self.render()
+
+    def chosen(self):
+        """已选学科（按原顺序）"""
+        return [subject for subject in self.index.subjects if subject in self.selected]
+
+    def select_matches(self, state=True):
+        """选中（或取消）当前筛选结果中的全部学科"""
+        for idx in self.matches:
+            if state:
+                self.selected.add(self.index.subjects[idx])
+            else:
+                self.selected.discard(self.index.subjects[idx])
+        self.render()
+
+    def _on_select(self, event=None):
+        visible = self.matches[self.offset:self.offset + self.height]
+        for row, idx in enumerate(visible):
+            if self.listbox.selection_includes(row):
+                self.selected.add(self.index.subjects[idx])
+            else:
+                self.selected.discard(self.index.subjects[idx])
+        self._update_status()
+
+    # === 窗口渲染 ===
+    def render(self):
+        self.offset = max(0, min(self.offset, len(self.matches) - self.height))
+        visible = self.matches[self.offset:self.offset + self.height]
+        self.listbox.delete(0, tk.END)
+        if visible:
+            self.listbox.insert(tk.END, *[self.index.subjects[idx] for idx in visible])
+        for row, idx in enumerate(visible):
+            if self.index.subjects[idx] in self.selected:
+                self.listbox.selection_set(row)
+        total = max(len(self.matches), 1)
+        self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self.height) / total))
+        self._update_status()
+
+    def _update_status(self):
+        hint = "" if self.index.pinyin else "（未安装 pypinyin，仅支持汉字搜索）"
+        self.status.set(f"匹配 {len(self.matches)} 项，已选 {len(self.selected)} 项{hint}")
+
+    def scroll_to(self, offset):
+        self.offset = offset
+        self.render()
+
+    def yview(self, *args):
+        if args[0] == "moveto":
+            self.scroll_to(int(float(args[1]) * len(self.matches)))
+        elif args[0] == "scroll":
+            step = self.height if args[2] == "pages" else 1
+            self.scroll_to(self.offset + int(args[1]) * step)
+
+    def _on_wheel(self, event):
+        if event.num == 4 or getattr(event, "delta", 0) > 0:
+            self.scroll_to(self.offset - 3)
+        else:
+            self.scroll_to(self.offset + 3)
+        return "break"